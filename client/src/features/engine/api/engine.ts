@@ -6,6 +6,11 @@ import type {
   ProcessStringRequest,
   SumArrayRequest,
   EngineCalculationResponse,
+  CalculationFeedParams,
+  CalculationSeriesParams,
+  CalculationSeriesResponse,
+  CalculationStatsParams,
+  CalculationStatsResponse,
 } from "../types/engineTypes";
 import { API_BASE_URL } from "../../../config/apiConfig";
 
@@ -97,3 +102,46 @@ export async function getCalculations(): Promise<EngineCalculationResponse[]> {
   }
   return response.json();
 }
+
+function toSearchParams(params: object): URLSearchParams {
+  return new URLSearchParams(
+    Object.entries(params)
+      .filter(([, value]) => value !== undefined)
+      .map(([key, value]) => [key, String(value)])
+  );
+}
+
+export async function getCalculationSeries(
+  params: CalculationSeriesParams = {}
+): Promise<CalculationSeriesResponse> {
+  const response = await fetch(
+    `${API_BASE_URL}/api/v1/engine/calculations/series?${toSearchParams(params)}`
+  );
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.detail[0].msg || "Failed to get calculation series");
+  }
+  return response.json();
+}
+
+export async function getCalculationStats(
+  params: CalculationStatsParams = {}
+): Promise<CalculationStatsResponse> {
+  const query = toSearchParams(params);
+  const response = await fetch(
+    `${API_BASE_URL}/api/v1/engine/calculations/stats?${query}`
+  );
+  if (!response.ok) {
+    const error = await response.json();
+    throw new Error(error.detail[0].msg || "Failed to get calculation stats");
+  }
+  return response.json();
+}
+
+export function openCalculationFeed(
+  params: CalculationFeedParams = {}
+): EventSource {
+  return new EventSource(
+    `${API_BASE_URL}/api/v1/engine/calculations/live?${toSearchParams(params)}`
+  );
+}
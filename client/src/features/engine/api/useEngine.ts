@@ -1,13 +1,43 @@
+import { useEffect } from "react";
+import { useQueryClient } from "@tanstack/react-query";
 import * as engineService from "./engine";
 import { useModifiedQuery } from "@/lib/tanstackQuery/useModifiedQuery";
 import { useModifiedMutation } from "@/lib/tanstackQuery/useModifiedMutation";
+import type {
+  CalculationFeedParams,
+  CalculationSeriesParams,
+  CalculationSeriesResponse,
+  CalculationStatsParams,
+  EngineCalculationResponse,
+} from "../types/engineTypes";
 
-type EngineQueryKey = "ENGINE" | "ENGINE_STATUS" | "ENGINE_CALCULATIONS";
+// Coalesces refetches of the stats while calculations stream in
+const FEED_REFRESH_DELAY = 5000;
+// Rows kept in the cached calculations list (the server's default page size)
+const CALCULATIONS_PAGE_SIZE = 100;
+// Points requested by default from /calculations/series (CALCULATIONS_SERIES_POINTS)
+const DEFAULT_SERIES_POINTS = 1000;
+
+type EngineQueryKey =
+  | "ENGINE"
+  | "ENGINE_STATUS"
+  | "ENGINE_CALCULATIONS"
+  | "ENGINE_CALCULATION_SERIES"
+  | "ENGINE_CALCULATION_STATS";
 
 export const engineKeys: Record<EngineQueryKey, EngineQueryKey[]> = {
   ENGINE: ["ENGINE"],
   ENGINE_STATUS: ["ENGINE", "ENGINE_STATUS"],
   ENGINE_CALCULATIONS: ["ENGINE", "ENGINE_CALCULATIONS"],
+  // Not nested under ENGINE_CALCULATIONS: the live feed appends new points
+  // instead of refetching the series
+  ENGINE_CALCULATION_SERIES: ["ENGINE", "ENGINE_CALCULATION_SERIES"],
+  // Nested under ENGINE_CALCULATIONS so new calculations invalidate them too
+  ENGINE_CALCULATION_STATS: [
+    "ENGINE",
+    "ENGINE_CALCULATIONS",
+    "ENGINE_CALCULATION_STATS",
+  ],
 };
 
 export function useEngineStatus() {
@@ -94,7 +124,6 @@ export function useCalculations() {
   return useModifiedQuery({
     queryKey: engineKeys.ENGINE_CALCULATIONS,
     queryFn: engineService.getCalculations,
-    refetchInterval: 30000,
     messages: {
       loading: "Refreshing calculations...",
       success: "Calculations refreshed",
@@ -102,3 +131,162 @@ export function useCalculations() {
     },
   });
 }
+
+export function useCalculationStats(params: CalculationStatsParams = {}) {
+  return useModifiedQuery({
+    queryKey: [...engineKeys.ENGINE_CALCULATION_STATS, JSON.stringify(params)],
+    queryFn: () => engineService.getCalculationStats(params),
+    messages: {
+      loading: "Refreshing calculation stats...",
+      success: "Calculation stats refreshed",
+      error: "Failed to refresh calculation stats",
+    },
+  });
+}
+
+/**
+ * Downsampled series of numeric results. With windowMs, only the last
+ * windowMs milliseconds are requested (created_after is computed on every
+ * fetch), so a refetch reads a bounded part of the history.
+ */
+export function useCalculationSeries(
+  params: CalculationSeriesParams = {},
+  windowMs?: number
+) {
+  return useModifiedQuery({
+    queryKey: [
+      ...engineKeys.ENGINE_CALCULATION_SERIES,
+      JSON.stringify(params),
+      windowMs ?? null,
+    ],
+    queryFn: () =>
+      engineService.getCalculationSeries(
+        windowMs === undefined
+          ? params
+          : {
+              ...params,
+              created_after: new Date(Date.now() - windowMs).toISOString(),
+            }
+      ),
+    messages: {
+      loading: "Refreshing calculation series...",
+      success: "Calculation series refreshed",
+      error: "Failed to refresh calculation series",
+    },
+  });
+}
+
+/**
+ * Adds a new calculation to every cached series it belongs to. Points older
+ * than the series window are dropped; once a series holds twice the points
+ * it asked for, it is refetched to be downsampled again.
+ */
+function appendToSeries(
+  queryClient: ReturnType<typeof useQueryClient>,
+  calculation: EngineCalculationResponse
+) {
+  const result = calculation.result?.trim() ?? "";
+  const value = Number(result);
+  if (!calculation.success || result === "" || !Number.isFinite(value)) {
+    return;
+  }
+  const point = {
+    id: calculation.id,
+    operation_type: calculation.operation_type,
+    created_at: calculation.created_at,
+    value,
+  };
+  const cached = queryClient.getQueriesData<CalculationSeriesResponse>({
+    queryKey: engineKeys.ENGINE_CALCULATION_SERIES,
+  });
+  for (const [queryKey, series] of cached) {
+    if (!series) continue;
+    const params: CalculationSeriesParams = JSON.parse(String(queryKey[2]));
+    const windowMs = queryKey[3] as number | null;
+    if (
+      (params.operation_type !== undefined &&
+        params.operation_type !== calculation.operation_type) ||
+      params.created_before !== undefined
+    ) {
+      continue;
+    }
+    if (series.points.length >= 2 * (params.points ?? DEFAULT_SERIES_POINTS)) {
+      queryClient.invalidateQueries({ queryKey, exact: true });
+      continue;
+    }
+    const oldest = windowMs === null ? -Infinity : Date.now() - windowMs;
+    queryClient.setQueryData<CalculationSeriesResponse>(queryKey, {
+      ...series,
+      rows: series.rows + 1,
+      points: [
+        ...series.points.filter(
+          (existing) => new Date(existing.created_at).getTime() >= oldest
+        ),
+        point,
+      ],
+    });
+  }
+}
+
+/**
+ * Keeps the calculation queries current from the server's live feed instead
+ * of polling: new rows are prepended to the cached list (up to a page) and
+ * appended to the cached series, and the stats are refetched at most every
+ * FEED_REFRESH_DELAY ms.
+ */
+export function useCalculationFeed(params: CalculationFeedParams = {}) {
+  const queryClient = useQueryClient();
+  const paramsKey = JSON.stringify(params);
+
+  useEffect(() => {
+    const feed = engineService.openCalculationFeed(JSON.parse(paramsKey));
+    let refreshTimer: ReturnType<typeof setTimeout> | undefined;
+
+    const scheduleRefresh = () => {
+      if (refreshTimer !== undefined) return;
+      refreshTimer = setTimeout(() => {
+        refreshTimer = undefined;
+        queryClient.invalidateQueries({
+          queryKey: engineKeys.ENGINE_CALCULATION_STATS,
+        });
+      }, FEED_REFRESH_DELAY);
+    };
+
+    feed.addEventListener("calculation", (event) => {
+      const calculation: EngineCalculationResponse = JSON.parse(
+        (event as MessageEvent).data
+      );
+      queryClient.setQueryData<EngineCalculationResponse[]>(
+        engineKeys.ENGINE_CALCULATIONS,
+        (calculations) =>
+          calculations &&
+          [calculation, ...calculations].slice(0, CALCULATIONS_PAGE_SIZE)
+      );
+      appendToSeries(queryClient, calculation);
+      scheduleRefresh();
+    });
+    // Rows were missed (slow client or reconnect): refetch everything once
+    const refetchAll = () => {
+      queryClient.invalidateQueries({
+        queryKey: engineKeys.ENGINE_CALCULATIONS,
+      });
+      queryClient.invalidateQueries({
+        queryKey: engineKeys.ENGINE_CALCULATION_SERIES,
+      });
+    };
+    let disconnected = false;
+    feed.addEventListener("dropped", refetchAll);
+    feed.addEventListener("error", () => {
+      disconnected = true;
+    });
+    feed.addEventListener("open", () => {
+      if (disconnected) refetchAll();
+      disconnected = false;
+    });
+
+    return () => {
+      clearTimeout(refreshTimer);
+      feed.close();
+    };
+  }, [queryClient, paramsKey]);
+}
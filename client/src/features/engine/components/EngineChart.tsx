@@ -8,9 +8,18 @@ import {
   AreaChart,
 } from "recharts";
 import { Card, CardContent, CardHeader, CardTitle } from "@/components/ui/card";
-import { useCalculations } from "@/features/engine/api/useEngine";
+import {
+  useCalculationFeed,
+  useCalculationSeries,
+  useCalculationStats,
+} from "@/features/engine/api/useEngine";
 import { useMemo } from "react";
 
+// Points requested from the server; the series is downsampled to fit
+const CHART_POINTS = 500;
+// Time range charted, so refetches read a bounded part of the history
+const CHART_WINDOW_MS = 24 * 60 * 60 * 1000;
+
 interface ChartProps {
   data?: Array<{ time: string; value: number }>;
   title?: string;
@@ -20,51 +29,53 @@ export function Chart({
   data,
   title = "Engine Calculations Chart",
 }: ChartProps) {
-  const { data: calculations, isLoading } = useCalculations();
+  const { data: series, isLoading } = useCalculationSeries(
+    { points: CHART_POINTS },
+    CHART_WINDOW_MS
+  );
+  const { data: stats } = useCalculationStats({ interval: "day" });
+  // Appends new calculations to the series and refreshes the stats
+  useCalculationFeed();
 
-  // Transform calculations data to chart format
+  // Totals over the whole history, aggregated by the server
+  const summary = useMemo(() => {
+    if (!stats || stats.operations.length === 0) {
+      return null;
+    }
+    const calls = stats.operations.reduce((sum, op) => sum + op.total.calls, 0);
+    const failures = stats.operations.reduce(
+      (sum, op) => sum + op.total.failures,
+      0
+    );
+    return {
+      calls,
+      successRate: calls > 0 ? ((calls - failures) / calls) * 100 : 0,
+    };
+  }, [stats]);
+
+  // Transform the downsampled series to chart format
   const chartData = useMemo(() => {
     // If explicit data is provided, use it
     if (data) {
       return data;
     }
 
-    // If calculations are available, transform them
-    if (calculations && calculations.length > 0) {
-      // Filter successful calculations and sort by created_at (oldest first for chronological chart)
-      const successfulCalculations = calculations
-        .filter((calc) => calc.success && calc.result !== null)
-        .sort(
-          (a, b) =>
-            new Date(a.created_at).getTime() - new Date(b.created_at).getTime()
-        );
-
-      return successfulCalculations.map((calc) => {
-        // Parse result to number (result is stored as string)
-        let value = 0;
-        if (calc.result) {
-          const parsed = parseFloat(calc.result);
-          value = isNaN(parsed) ? 0 : parsed;
-        }
+    // Points are successful numeric results, oldest first
+    return (series?.points ?? []).map((point) => {
+      // Format time from created_at
+      const date = new Date(point.created_at);
+      const timeLabel = `${date.getHours().toString().padStart(2, "0")}:${date
+        .getMinutes()
+        .toString()
+        .padStart(2, "0")}`;
 
-        // Format time from created_at
-        const date = new Date(calc.created_at);
-        const timeLabel = `${date.getHours().toString().padStart(2, "0")}:${date
-          .getMinutes()
-          .toString()
-          .padStart(2, "0")}`;
-
-        return {
-          time: timeLabel,
-          value: value,
-          operation: calc.operation_type,
-        };
-      });
-    }
-
-    // Return empty array if no data
-    return [];
-  }, [calculations, data]);
+      return {
+        time: timeLabel,
+        value: point.value,
+        operation: point.operation_type,
+      };
+    });
+  }, [series, data]);
 
   // Show loading state or empty state
   const hasData = chartData.length > 0;
@@ -81,6 +92,12 @@ export function Chart({
         <CardTitle className="text-2xl font-bold bg-gradient-to-r from-blue-400 to-purple-400 bg-clip-text text-transparent">
           {title}
         </CardTitle>
+        {summary && (
+          <div className="text-sm text-slate-400">
+            {summary.calls.toLocaleString()} calculations ·{" "}
+            {summary.successRate.toFixed(1)}% successful
+          </div>
+        )}
       </CardHeader>
 
       <CardContent className="flex-1 min-h-0 relative z-10">
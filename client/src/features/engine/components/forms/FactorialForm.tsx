@@ -43,13 +43,13 @@ export function FactorialForm() {
                   <>
                     <Input
                       type="number"
-                      placeholder="n (0-20)"
+                      placeholder="n (0-50000)"
                       {...field}
                       onChange={(e) =>
                         field.onChange(Number(e.target.value) || 0)
                       }
                       min="0"
-                      max="20"
+                      max="50000"
                       className="bg-gray-900/50 border-gray-700 text-gray-100 placeholder:text-gray-500 focus:border-emerald-500 focus:ring-emerald-500/20 transition-colors h-9 text-sm"
                     />
                     <FieldError
@@ -35,3 +35,63 @@ export interface EngineCalculationResponse {
   message: string | null;
   created_at: string;
 }
+
+export interface CalculationSeriesPoint {
+  id: number;
+  operation_type: string;
+  created_at: string;
+  value: number;
+}
+
+export interface CalculationSeriesResponse {
+  method: "lttb" | "minmax";
+  rows: number;
+  truncated: boolean;
+  points: CalculationSeriesPoint[];
+}
+
+export interface CalculationSeriesParams {
+  points?: number;
+  method?: "lttb" | "minmax";
+  operation_type?: string;
+  created_after?: string;
+  created_before?: string;
+}
+
+export interface CalculationFeedParams {
+  operation_type?: string;
+  success?: boolean;
+}
+
+export interface CalculationStatsSummary {
+  calls: number;
+  failures: number;
+  success_rate: number;
+  input_bytes: number;
+  result_count: number;
+  result_mean: number | null;
+  result_min: number | null;
+  result_max: number | null;
+}
+
+export interface CalculationStatsBucket extends CalculationStatsSummary {
+  bucket_start: string;
+}
+
+export interface CalculationStatsSeries {
+  operation_type: string;
+  total: CalculationStatsSummary;
+  buckets: CalculationStatsBucket[];
+}
+
+export interface CalculationStatsResponse {
+  interval: "hour" | "day";
+  operations: CalculationStatsSeries[];
+}
+
+export interface CalculationStatsParams {
+  interval?: "hour" | "day";
+  operation_type?: string;
+  created_after?: string;
+  created_before?: string;
+}
@@ -14,8 +14,8 @@ export const factorialSchema = z.object({
   n: z
     .number()
     .int("Must be an integer")
-    .min(0, "Must be between 0 and 20")
-    .max(20, "Must be between 0 and 20"),
+    .min(0, "Must be between 0 and 50000")
+    .max(50000, "Must be between 0 and 50000"),
 });
 
 export const processStringSchema = z.object({
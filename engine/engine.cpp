@@ -6,7 +6,350 @@
 
 #include "engine.h"
 #include <cstring>
+#include <cstdint>
+#include <cstdio>
 #include <algorithm>
+#include <cmath>
+#include <limits>
+#include <thread>
+#include <vector>
+
+namespace {
+
+// n! for 0 <= n <= 20 (21! overflows long long)
+constexpr int FACTORIAL_TABLE_MAX = 20;
+constexpr long long FACTORIAL_TABLE[FACTORIAL_TABLE_MAX + 1] = {
+    1LL,
+    1LL,
+    2LL,
+    6LL,
+    24LL,
+    120LL,
+    720LL,
+    5040LL,
+    40320LL,
+    362880LL,
+    3628800LL,
+    39916800LL,
+    479001600LL,
+    6227020800LL,
+    87178291200LL,
+    1307674368000LL,
+    20922789888000LL,
+    355687428096000LL,
+    6402373705728000LL,
+    121645100408832000LL,
+    2432902008176640000LL,
+};
+
+// Arbitrary-precision unsigned integer: little-endian limbs in base 10^9
+using BigInt = std::vector<uint32_t>;
+constexpr uint32_t BIG_BASE = 1000000000u;
+constexpr int BIG_BASE_DIGITS = 9;
+constexpr int PRODUCT_LEAF_SIZE = 16;
+
+constexpr size_t KARATSUBA_THRESHOLD = 48;
+
+void big_trim(BigInt& a) {
+    while (a.size() > 1 && a.back() == 0) {
+        a.pop_back();
+    }
+}
+
+BigInt big_multiply_schoolbook(const BigInt& a, const BigInt& b) {
+    std::vector<uint64_t> acc(a.size() + b.size(), 0);
+    for (size_t i = 0; i < a.size(); ++i) {
+        uint64_t carry = 0;
+        const uint64_t ai = a[i];
+        for (size_t j = 0; j < b.size(); ++j) {
+            uint64_t cur = acc[i + j] + ai * b[j] + carry;
+            acc[i + j] = cur % BIG_BASE;
+            carry = cur / BIG_BASE;
+        }
+        acc[i + b.size()] = carry;
+    }
+    
+    BigInt result(acc.begin(), acc.end());
+    big_trim(result);
+    return result;
+}
+
+// result += value * BIG_BASE^shift
+void big_add_shifted(BigInt& result, const BigInt& value, size_t shift) {
+    if (result.size() < value.size() + shift + 1) {
+        result.resize(value.size() + shift + 1, 0);
+    }
+    uint32_t carry = 0;
+    size_t i = 0;
+    for (; i < value.size(); ++i) {
+        uint32_t sum = result[i + shift] + value[i] + carry;
+        carry = sum >= BIG_BASE ? 1 : 0;
+        result[i + shift] = sum - carry * BIG_BASE;
+    }
+    for (size_t k = i + shift; carry != 0; ++k) {
+        if (k == result.size()) {
+            result.push_back(0);
+        }
+        uint32_t sum = result[k] + carry;
+        carry = sum >= BIG_BASE ? 1 : 0;
+        result[k] = sum - carry * BIG_BASE;
+    }
+}
+
+// a -= b, requires a >= b
+void big_subtract(BigInt& a, const BigInt& b) {
+    int64_t borrow = 0;
+    for (size_t i = 0; i < a.size(); ++i) {
+        int64_t diff = static_cast<int64_t>(a[i]) - (i < b.size() ? b[i] : 0) - borrow;
+        borrow = diff < 0 ? 1 : 0;
+        a[i] = static_cast<uint32_t>(diff + borrow * BIG_BASE);
+    }
+    big_trim(a);
+}
+
+BigInt big_slice(const BigInt& a, size_t begin, size_t end) {
+    begin = std::min(begin, a.size());
+    end = std::min(end, a.size());
+    BigInt result(a.begin() + begin, a.begin() + end);
+    if (result.empty()) {
+        result.push_back(0);
+    }
+    big_trim(result);
+    return result;
+}
+
+// Karatsuba multiplication, falling back to schoolbook for small operands
+BigInt big_multiply(const BigInt& a, const BigInt& b) {
+    if (std::min(a.size(), b.size()) < KARATSUBA_THRESHOLD) {
+        return big_multiply_schoolbook(a, b);
+    }
+    
+    size_t half = std::max(a.size(), b.size()) / 2;
+    BigInt a0 = big_slice(a, 0, half);
+    BigInt a1 = big_slice(a, half, a.size());
+    BigInt b0 = big_slice(b, 0, half);
+    BigInt b1 = big_slice(b, half, b.size());
+    
+    BigInt z0 = big_multiply(a0, b0);
+    BigInt z2 = big_multiply(a1, b1);
+    
+    // z1 = (a0 + a1)(b0 + b1) - z0 - z2
+    big_add_shifted(a0, a1, 0);
+    big_add_shifted(b0, b1, 0);
+    big_trim(a0);
+    big_trim(b0);
+    BigInt z1 = big_multiply(a0, b0);
+    big_subtract(z1, z0);
+    big_subtract(z1, z2);
+    
+    BigInt result = z0;
+    big_add_shifted(result, z1, half);
+    big_add_shifted(result, z2, 2 * half);
+    big_trim(result);
+    return result;
+}
+
+void big_multiply_small(BigInt& a, uint32_t factor) {
+    uint64_t carry = 0;
+    for (uint32_t& limb : a) {
+        uint64_t cur = static_cast<uint64_t>(limb) * factor + carry;
+        limb = static_cast<uint32_t>(cur % BIG_BASE);
+        carry = cur / BIG_BASE;
+    }
+    while (carry > 0) {
+        a.push_back(static_cast<uint32_t>(carry % BIG_BASE));
+        carry /= BIG_BASE;
+    }
+}
+
+// Product of lo * (lo + 1) * ... * hi by binary splitting, so the large
+// multiplications happen between operands of similar size
+BigInt range_product(uint32_t lo, uint32_t hi) {
+    if (hi - lo < PRODUCT_LEAF_SIZE) {
+        BigInt result{1};
+        for (uint32_t i = lo; i <= hi; ++i) {
+            big_multiply_small(result, i);
+        }
+        return result;
+    }
+    uint32_t mid = lo + (hi - lo) / 2;
+    return big_multiply(range_product(lo, mid), range_product(mid + 1, hi));
+}
+
+// Plain sum with 8 independent accumulators, so the loop vectorizes (SSE2/AVX)
+double sum_naive(const double* array, long long size) {
+    double acc[8] = {0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0};
+    long long i = 0;
+    for (; i + 8 <= size; i += 8) {
+        for (int k = 0; k < 8; ++k) {
+            acc[k] += array[i + k];
+        }
+    }
+    double sum = ((acc[0] + acc[1]) + (acc[2] + acc[3])) + ((acc[4] + acc[5]) + (acc[6] + acc[7]));
+    for (; i < size; ++i) {
+        sum += array[i];
+    }
+    return sum;
+}
+
+struct CompensatedSum {
+    double sum;
+    double compensation;
+};
+
+// Kahan-Babuska (Neumaier) step: keeps the rounding error of every addition
+void compensated_add(CompensatedSum& acc, double value) {
+    double t = acc.sum + value;
+    if (std::fabs(acc.sum) >= std::fabs(value)) {
+        acc.compensation += (acc.sum - t) + value;
+    } else {
+        acc.compensation += (value - t) + acc.sum;
+    }
+    acc.sum = t;
+}
+
+CompensatedSum sum_kahan(const double* array, long long size) {
+    CompensatedSum acc{0.0, 0.0};
+    for (long long i = 0; i < size; ++i) {
+        compensated_add(acc, array[i]);
+    }
+    return acc;
+}
+
+// Pairwise summation: O(log n) error growth at nearly the cost of a plain sum
+constexpr long long PAIRWISE_BLOCK = 256;
+
+double sum_pairwise(const double* array, long long size) {
+    if (size <= PAIRWISE_BLOCK) {
+        return sum_naive(array, size);
+    }
+    long long half = size / 2;
+    return sum_pairwise(array, half) + sum_pairwise(array + half, size - half);
+}
+
+CompensatedSum sum_block(const double* array, long long size, int method) {
+    switch (method) {
+        case ENGINE_SUM_KAHAN:
+            return sum_kahan(array, size);
+        case ENGINE_SUM_PAIRWISE:
+            return {sum_pairwise(array, size), 0.0};
+        default:
+            return {sum_naive(array, size), 0.0};
+    }
+}
+
+// Below this many elements per thread, thread start-up costs more than it saves
+constexpr long long MIN_ELEMENTS_PER_THREAD = 1LL << 16;
+
+// Byte-wise ASCII uppercasing, eight bytes per step (SWAR). Bytes >= 0x80
+// (UTF-8 sequences) are never changed. Works in place when input == output.
+constexpr uint64_t ONES = 0x0101010101010101ULL;
+constexpr uint64_t HIGH_BITS = 0x8080808080808080ULL;
+
+inline char to_upper_ascii(char c) {
+    return (c >= 'a' && c <= 'z') ? static_cast<char>(c - 'a' + 'A') : c;
+}
+
+void uppercase_ascii(const char* input, char* output, long long size) {
+    long long i = 0;
+    for (; i + 8 <= size; i += 8) {
+        uint64_t word;
+        std::memcpy(&word, input + i, 8);
+        // Per byte, the high bit of (b & 0x7F) + k is set iff (b & 0x7F) >= 0x80 - k;
+        // no byte can carry into its neighbour
+        uint64_t low7 = word & ~HIGH_BITS;
+        uint64_t at_least_a = low7 + ONES * (0x80 - 'a');
+        uint64_t above_z = low7 + ONES * (0x80 - 'z' - 1);
+        uint64_t is_lower = at_least_a & ~above_z & ~word & HIGH_BITS;
+        word ^= is_lower >> 2; // 0x80 >> 2 == 0x20, the ASCII case bit
+        std::memcpy(output + i, &word, 8);
+    }
+    for (; i < size; ++i) {
+        output[i] = to_upper_ascii(input[i]);
+    }
+}
+
+// Largest-Triangle-Three-Buckets (Steinarsson, 2013): the first and last points
+// are kept, the rest is split into threshold - 2 buckets of equal point count and
+// each bucket keeps the point forming the largest triangle with the previously
+// kept point and the average of the next bucket
+long long downsample_lttb(const double* x, const double* y, long long size, long long threshold,
+                          long long* output) {
+    long long count = 0;
+    output[count++] = 0;
+    const double bucket_size = static_cast<double>(size - 2) / static_cast<double>(threshold - 2);
+    long long selected = 0;
+    for (long long bucket = 0; bucket < threshold - 2; ++bucket) {
+        long long begin = static_cast<long long>(bucket * bucket_size) + 1;
+        long long end = std::min(static_cast<long long>((bucket + 1) * bucket_size) + 1, size - 1);
+        
+        // Average of the next bucket (the last point for the final bucket)
+        long long next_begin = end;
+        long long next_end = std::min(static_cast<long long>((bucket + 2) * bucket_size) + 1, size);
+        double average_x = 0.0;
+        double average_y = 0.0;
+        for (long long i = next_begin; i < next_end; ++i) {
+            average_x += x[i];
+            average_y += y[i];
+        }
+        const double next_count = static_cast<double>(std::max(1LL, next_end - next_begin));
+        average_x /= next_count;
+        average_y /= next_count;
+        
+        const double ax = x[selected];
+        const double ay = y[selected];
+        double max_area = -1.0;
+        long long best = begin;
+        for (long long i = begin; i < end; ++i) {
+            // Twice the triangle area; the factor does not change the maximum
+            double area = std::fabs((ax - average_x) * (y[i] - ay) - (ax - x[i]) * (average_y - ay));
+            if (area > max_area) {
+                max_area = area;
+                best = i;
+            }
+        }
+        output[count++] = best;
+        selected = best;
+    }
+    output[count++] = size - 1;
+    return count;
+}
+
+// The first and last points plus, for (threshold - 2) / 2 buckets of equal x width
+// over the points in between, the indices of the bucket minimum and maximum
+long long downsample_minmax(const double* x, const double* y, long long size, long long threshold,
+                            long long* output) {
+    long long count = 0;
+    output[count++] = 0;
+    const long long buckets = (threshold - 2) / 2;
+    const double width = (x[size - 1] - x[0]) / static_cast<double>(std::max(1LL, buckets));
+    long long i = 1;
+    for (long long bucket = 0; bucket < buckets && i < size - 1; ++bucket) {
+        const bool last_bucket = bucket == buckets - 1;
+        const double bucket_end = x[0] + width * static_cast<double>(bucket + 1);
+        if (!last_bucket && x[i] >= bucket_end) {
+            continue; // Empty bucket
+        }
+        long long low = i;
+        long long high = i;
+        for (; i < size - 1 && (last_bucket || x[i] < bucket_end); ++i) {
+            if (y[i] < y[low]) {
+                low = i;
+            }
+            if (y[i] > y[high]) {
+                high = i;
+            }
+        }
+        output[count++] = std::min(low, high);
+        if (low != high) {
+            output[count++] = std::max(low, high);
+        }
+    }
+    output[count++] = size - 1;
+    return count;
+}
+
+} // namespace
 
 extern "C" {
 
@@ -19,18 +362,40 @@ ENGINE_API int multiply(int a, int b) {
 }
 
 ENGINE_API long long factorial(int n) {
-    if (n < 0) {
-        return -1; // Error: negative number
+    if (n < 0 || n > FACTORIAL_TABLE_MAX) {
+        return -1; // Error: negative number or overflow
     }
-    if (n == 0 || n == 1) {
-        return 1;
+    return FACTORIAL_TABLE[n];
+}
+
+ENGINE_API int factorial_big(int n, char* output, int output_size) {
+    if (n < 0 || output == nullptr || output_size <= 0) {
+        return -1; // Error
     }
     
-    long long result = 1;
-    for (int i = 2; i <= n; ++i) {
-        result *= i;
+    BigInt value = n < 2 ? BigInt{1} : range_product(2, static_cast<uint32_t>(n));
+    
+    // Most significant limb without padding, the rest zero-padded to 9 digits
+    char head[BIG_BASE_DIGITS + 1];
+    int head_len = std::snprintf(head, sizeof(head), "%u", value.back());
+    long long total_len = head_len + static_cast<long long>(value.size() - 1) * BIG_BASE_DIGITS;
+    if (total_len + 1 > output_size) {
+        return -2; // Error: buffer too small
     }
-    return result;
+    
+    std::memcpy(output, head, head_len);
+    char* cursor = output + head_len;
+    for (size_t i = value.size() - 1; i-- > 0;) {
+        uint32_t limb = value[i];
+        for (int d = BIG_BASE_DIGITS - 1; d >= 0; --d) {
+            cursor[d] = static_cast<char>('0' + limb % 10);
+            limb /= 10;
+        }
+        cursor += BIG_BASE_DIGITS;
+    }
+    *cursor = '\0';
+    
+    return static_cast<int>(total_len);
 }
 
 ENGINE_API int process_string(const char* input, char* output, int output_size) {
@@ -42,28 +407,138 @@ ENGINE_API int process_string(const char* input, char* output, int output_size)
     int copy_len = std::min(input_len, output_size - 1);
     
     // Convert to uppercase and copy
-    for (int i = 0; i < copy_len; ++i) {
-        if (input[i] >= 'a' && input[i] <= 'z') {
-            output[i] = input[i] - 'a' + 'A';
-        } else {
-            output[i] = input[i];
-        }
-    }
+    uppercase_ascii(input, output, copy_len);
     output[copy_len] = '\0';
     
     return copy_len;
 }
 
-ENGINE_API double sum_array(double* array, int size) {
+ENGINE_API long long process_bytes(const char* input, char* output, long long size) {
+    if (input == nullptr || output == nullptr || size < 0) {
+        return -1; // Error
+    }
+    
+    uppercase_ascii(input, output, size);
+    
+    return size;
+}
+
+ENGINE_API double sum_array(const double* array, int size) {
+    if (array == nullptr || size <= 0) {
+        return 0.0;
+    }
+    
+    return sum_naive(array, size);
+}
+
+ENGINE_API double sum_array_ex(const double* array, long long size, int method, int threads) {
+    if (method != ENGINE_SUM_NAIVE && method != ENGINE_SUM_KAHAN && method != ENGINE_SUM_PAIRWISE) {
+        return std::numeric_limits<double>::quiet_NaN(); // Error: unknown method
+    }
     if (array == nullptr || size <= 0) {
         return 0.0;
     }
     
-    double sum = 0.0;
+    if (threads <= 0) {
+        threads = static_cast<int>(std::thread::hardware_concurrency());
+    }
+    long long max_threads = std::max(1LL, size / MIN_ELEMENTS_PER_THREAD);
+    threads = static_cast<int>(std::max(1LL, std::min<long long>(threads, max_threads)));
+    
+    if (threads == 1) {
+        CompensatedSum result = sum_block(array, size, method);
+        return result.sum + result.compensation;
+    }
+    
+    // Split into one contiguous chunk per thread; the calling thread takes chunk 0
+    std::vector<CompensatedSum> partials(threads);
+    std::vector<std::thread> workers;
+    workers.reserve(threads - 1);
+    long long chunk = size / threads;
+    for (int t = 1; t < threads; ++t) {
+        long long begin = t * chunk;
+        long long length = (t == threads - 1) ? size - begin : chunk;
+        try {
+            workers.emplace_back([&partials, array, begin, length, method, t]() {
+                partials[t] = sum_block(array + begin, length, method);
+            });
+        } catch (...) {
+            // Could not start a thread: sum this chunk here instead
+            partials[t] = sum_block(array + begin, length, method);
+        }
+    }
+    partials[0] = sum_block(array, chunk, method);
+    for (std::thread& worker : workers) {
+        worker.join();
+    }
+    
+    if (method == ENGINE_SUM_NAIVE) {
+        double sum = 0.0;
+        for (const CompensatedSum& partial : partials) {
+            sum += partial.sum;
+        }
+        return sum;
+    }
+    CompensatedSum total{0.0, 0.0};
+    for (const CompensatedSum& partial : partials) {
+        compensated_add(total, partial.sum);
+        compensated_add(total, partial.compensation);
+    }
+    return total.sum + total.compensation;
+}
+
+ENGINE_API int add_arrays(const int* a, const int* b, int* output, int size) {
+    if (a == nullptr || b == nullptr || output == nullptr || size < 0) {
+        return -1; // Error
+    }
+    
     for (int i = 0; i < size; ++i) {
-        sum += array[i];
+        output[i] = a[i] + b[i];
     }
-    return sum;
+    return size;
+}
+
+ENGINE_API int multiply_arrays(const int* a, const int* b, int* output, int size) {
+    if (a == nullptr || b == nullptr || output == nullptr || size < 0) {
+        return -1; // Error
+    }
+    
+    for (int i = 0; i < size; ++i) {
+        output[i] = a[i] * b[i];
+    }
+    return size;
+}
+
+ENGINE_API int factorial_many(const int* n, long long* output, int size) {
+    if (n == nullptr || output == nullptr || size < 0) {
+        return -1; // Error
+    }
+    
+    for (int i = 0; i < size; ++i) {
+        output[i] = factorial(n[i]);
+    }
+    return size;
+}
+
+ENGINE_API long long downsample(const double* x, const double* y, long long size, long long threshold,
+                                int method, long long* output_indices) {
+    if (x == nullptr || y == nullptr || output_indices == nullptr || size < 0 || threshold < 2) {
+        return -1; // Error
+    }
+    if (method != ENGINE_DOWNSAMPLE_LTTB && method != ENGINE_DOWNSAMPLE_MINMAX) {
+        return -1; // Error: unknown method
+    }
+    
+    if (size <= threshold) {
+        for (long long i = 0; i < size; ++i) {
+            output_indices[i] = i;
+        }
+        return size;
+    }
+    if (method == ENGINE_DOWNSAMPLE_LTTB) {
+        return downsample_lttb(x, y, size, threshold, output_indices);
+    }
+    return downsample_minmax(x, y, size, threshold, output_indices);
 }
 
 } // extern "C"
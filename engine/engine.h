@@ -56,10 +56,9 @@ ENGINE_API int multiply(int a, int b);
 
 /**
  * @brief Calculates the factorial of an integer
- * @param n Number for which factorial is calculated (n >= 0)
- * @return Factorial of n. Returns -1 on error (n < 0)
- * @note For n = 0 or n = 1 returns 1
- * @warning For large values of n, overflow may occur
+ * @param n Number for which factorial is calculated (0 <= n <= 20)
+ * @return Factorial of n. Returns -1 on error (n < 0 or n > 20, which would overflow)
+ * @note Served from a precomputed table in O(1). Use factorial_big() for n > 20
  * @example
  * @code
  * long long result = factorial(5);  // result = 120
@@ -67,6 +66,25 @@ ENGINE_API int multiply(int a, int b);
  */
 ENGINE_API long long factorial(int n);
 
+/**
+ * @brief Calculates the factorial of an integer with arbitrary precision
+ * @param n Number for which factorial is calculated (n >= 0)
+ * @param output Output buffer receiving the decimal digits (null-terminated)
+ * @param output_size Size of the output buffer (including null terminator)
+ * @return Number of digits written (without null terminator).
+ *         Returns -1 on error (n < 0, nullptr or output_size <= 0),
+ *         -2 if the buffer is too small
+ * @note Uses binary splitting of the product 2 * 3 * ... * n, so large
+ *       multiplications are between operands of similar size.
+ *       n! has floor(lgamma(n + 1) / ln(10)) + 1 digits.
+ * @example
+ * @code
+ * char output[64];
+ * int len = factorial_big(25, output, 64);  // output = "15511210043330985984000000", len = 26
+ * @endcode
+ */
+ENGINE_API int factorial_big(int n, char* output, int output_size);
+
 /**
  * @brief Processes a string by converting it to uppercase
  * @param input Pointer to input string (null-terminated)
@@ -83,6 +101,22 @@ ENGINE_API long long factorial(int n);
  */
 ENGINE_API int process_string(const char* input, char* output, int output_size);
 
+/**
+ * @brief Converts a byte buffer of known length to uppercase
+ * @param input Pointer to input bytes (need not be null-terminated, may contain null bytes)
+ * @param output Output buffer of at least size bytes, may be the same as input (in-place)
+ * @param size Number of bytes to process
+ * @return Number of bytes written (size). Returns -1 on error
+ * @note Only ASCII letters are changed and the output is not null-terminated, so
+ *       UTF-8 text can be processed in chunks split at any byte offset
+ * @example
+ * @code
+ * char buffer[] = {'a', 'b', '\0', 'c'};
+ * long long len = process_bytes(buffer, buffer, 4);  // buffer = {'A', 'B', '\0', 'C'}
+ * @endcode
+ */
+ENGINE_API long long process_bytes(const char* input, char* output, long long size);
+
 /**
  * @brief Calculates the sum of elements in a floating-point array
  * @param array Pointer to array of double values
@@ -95,7 +129,113 @@ ENGINE_API int process_string(const char* input, char* output, int output_size);
  * double sum = sum_array(arr, 3);  // sum = 7.5
  * @endcode
  */
-ENGINE_API double sum_array(double* array, int size);
+ENGINE_API double sum_array(const double* array, int size);
+
+/** @brief Plain summation (vectorized, fastest) */
+#define ENGINE_SUM_NAIVE 0
+/** @brief Kahan-Babuska (Neumaier) compensated summation (most accurate) */
+#define ENGINE_SUM_KAHAN 1
+/** @brief Pairwise summation (O(log n) error growth, close to naive speed) */
+#define ENGINE_SUM_PAIRWISE 2
+
+/**
+ * @brief Calculates the sum of a large floating-point array, optionally in parallel
+ * @param array Pointer to array of double values
+ * @param size Number of elements in the array
+ * @param method Summation method: ENGINE_SUM_NAIVE, ENGINE_SUM_KAHAN or ENGINE_SUM_PAIRWISE
+ * @param threads Number of threads to use; 0 uses all hardware threads
+ * @return Sum of all array elements. Returns 0.0 for nullptr or size <= 0,
+ *         NaN for an unknown method
+ * @note The array is split into one contiguous chunk per thread and the partial
+ *       sums are combined with compensated addition. Each thread gets at least
+ *       65536 elements, so small arrays always run on the calling thread.
+ * @example
+ * @code
+ * double sum = sum_array_ex(values, 100000000LL, ENGINE_SUM_PAIRWISE, 0);
+ * @endcode
+ */
+ENGINE_API double sum_array_ex(const double* array, long long size, int method, int threads);
+
+/**
+ * @brief Adds two integer arrays element by element
+ * @param a Pointer to first input array
+ * @param b Pointer to second input array
+ * @param output Output array receiving a[i] + b[i]
+ * @param size Number of elements in each array
+ * @return Number of processed elements. Returns -1 on error (nullptr or size < 0)
+ * @note Output may alias either input
+ * @example
+ * @code
+ * int a[] = {1, 2, 3};
+ * int b[] = {4, 5, 6};
+ * int out[3];
+ * add_arrays(a, b, out, 3);  // out = {5, 7, 9}
+ * @endcode
+ */
+ENGINE_API int add_arrays(const int* a, const int* b, int* output, int size);
+
+/**
+ * @brief Multiplies two integer arrays element by element
+ * @param a Pointer to first input array
+ * @param b Pointer to second input array
+ * @param output Output array receiving a[i] * b[i]
+ * @param size Number of elements in each array
+ * @return Number of processed elements. Returns -1 on error (nullptr or size < 0)
+ * @note Output may alias either input
+ * @example
+ * @code
+ * int a[] = {1, 2, 3};
+ * int b[] = {4, 5, 6};
+ * int out[3];
+ * multiply_arrays(a, b, out, 3);  // out = {4, 10, 18}
+ * @endcode
+ */
+ENGINE_API int multiply_arrays(const int* a, const int* b, int* output, int size);
+
+/**
+ * @brief Calculates the factorial of every element of an integer array
+ * @param n Pointer to input array
+ * @param output Output array receiving factorial(n[i])
+ * @param size Number of elements in the arrays
+ * @return Number of processed elements. Returns -1 on error (nullptr or size < 0)
+ * @note Elements with n[i] < 0 or n[i] > 20 produce -1, same as factorial()
+ * @example
+ * @code
+ * int n[] = {0, 5, 10};
+ * long long out[3];
+ * factorial_many(n, out, 3);  // out = {1, 120, 3628800}
+ * @endcode
+ */
+ENGINE_API int factorial_many(const int* n, long long* output, int size);
+
+/** @brief Largest-Triangle-Three-Buckets: keeps the visual shape of the series */
+#define ENGINE_DOWNSAMPLE_LTTB 0
+/** @brief Minimum and maximum of equal-width x buckets: keeps every extreme value */
+#define ENGINE_DOWNSAMPLE_MINMAX 1
+
+/**
+ * @brief Selects the points of an (x, y) series that best represent it in fewer points
+ * @param x Pointer to x values (e.g. timestamps), sorted in ascending order
+ * @param y Pointer to y values
+ * @param size Number of points
+ * @param threshold Maximum number of points to keep (at least 2)
+ * @param method ENGINE_DOWNSAMPLE_LTTB or ENGINE_DOWNSAMPLE_MINMAX
+ * @param output_indices Output array of at least threshold elements receiving the
+ *        indices of the kept points, in ascending order
+ * @return Number of indices written. Returns -1 on error (nullptr, size < 0,
+ *         threshold < 2 or unknown method)
+ * @note Series with at most threshold points are returned whole. Both methods
+ *       always keep the first and the last point. LTTB returns exactly threshold
+ *       points; MINMAX returns the minimum and maximum of threshold / 2 buckets
+ *       of equal x width, so empty buckets yield fewer points.
+ * @example
+ * @code
+ * long long kept[1000];
+ * long long count = downsample(t, v, 10000000LL, 1000, ENGINE_DOWNSAMPLE_LTTB, kept);
+ * @endcode
+ */
+ENGINE_API long long downsample(const double* x, const double* y, long long size, long long threshold,
+                                int method, long long* output_indices);
 
 /**
  * @}
@@ -0,0 +1,200 @@
+/**
+ * @file engine_bench.cpp
+ * @brief Native benchmarks of the Engine library functions
+ * @details Times every exported function without any Python or ctypes
+ *          overhead and prints one JSON object per measurement on stdout,
+ *          in the format read by server/benchmarks (suite "native").
+ *
+ * Usage: engine_bench [--max-elements N] [--max-bytes N] [--min-time SECONDS] [--repeat N]
+ */
+
+#include "engine.h"
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <cstring>
+#include <string>
+#include <vector>
+
+namespace {
+
+struct Options {
+    long long max_elements = 10000000LL;
+    long long max_bytes = 16LL << 20;
+    double min_time = 0.05;
+    int repeat = 5;
+};
+
+volatile double g_sink = 0.0;
+
+/**
+ * @brief Runs f until one sample lasts min_time, then prints repeat samples
+ *        as seconds per call
+ */
+template <typename F>
+void measure(const Options& options, const char* name, const std::string& params,
+             long long size, long long bytes, F&& f) {
+    using clock = std::chrono::steady_clock;
+    auto run = [&](long long loops) {
+        auto started = clock::now();
+        for (long long i = 0; i < loops; ++i) {
+            g_sink = g_sink + static_cast<double>(f());
+        }
+        return std::chrono::duration<double>(clock::now() - started).count();
+    };
+
+    run(1);  // Warm up caches and page in buffers
+    long long loops = 1;
+    for (;;) {
+        double elapsed = run(loops);
+        if (elapsed >= options.min_time) {
+            break;
+        }
+        double scale = elapsed > 0.0 ? options.min_time / elapsed : 10.0;
+        loops = static_cast<long long>(loops * std::min(std::max(scale * 1.2, 2.0), 10.0));
+    }
+
+    std::vector<double> samples;
+    for (int i = 0; i < options.repeat; ++i) {
+        samples.push_back(run(loops) / static_cast<double>(loops));
+    }
+    std::sort(samples.begin(), samples.end());
+
+    double mean = 0.0;
+    for (double s : samples) {
+        mean += s;
+    }
+    mean /= samples.size();
+    double variance = 0.0;
+    for (double s : samples) {
+        variance += (s - mean) * (s - mean);
+    }
+    double stdev = samples.size() > 1 ? std::sqrt(variance / (samples.size() - 1)) : 0.0;
+    size_t n = samples.size();
+    double median = n % 2 ? samples[n / 2] : (samples[n / 2 - 1] + samples[n / 2]) / 2.0;
+
+    std::printf(
+        "{\"suite\": \"native\", \"name\": \"%s\", \"params\": {%s}, \"size\": %lld, \"bytes\": %lld, "
+        "\"stats\": {\"samples\": %zu, \"loops\": %lld, \"min\": %.9g, \"median\": %.9g, "
+        "\"mean\": %.9g, \"max\": %.9g, \"stdev\": %.9g}}\n",
+        name, params.c_str(), size, bytes, n, loops,
+        samples.front(), median, mean, samples.back(), stdev);
+    std::fflush(stdout);
+}
+
+std::vector<long long> element_sizes(long long max_elements) {
+    std::vector<long long> sizes;
+    for (long long size = 10; size <= max_elements; size *= 10) {
+        sizes.push_back(size);
+    }
+    return sizes;
+}
+
+std::vector<long long> byte_sizes(long long max_bytes) {
+    std::vector<long long> sizes;
+    for (long long size : {16LL, 1LL << 10, 64LL << 10, 1LL << 20, 16LL << 20, 256LL << 20}) {
+        if (size <= max_bytes) {
+            sizes.push_back(size);
+        }
+    }
+    return sizes;
+}
+
+bool parse_options(int argc, char** argv, Options& options) {
+    for (int i = 1; i < argc; ++i) {
+        if (i + 1 >= argc) {
+            return false;
+        }
+        const char* value = argv[++i];
+        if (std::strcmp(argv[i - 1], "--max-elements") == 0) {
+            options.max_elements = std::atoll(value);
+        } else if (std::strcmp(argv[i - 1], "--max-bytes") == 0) {
+            options.max_bytes = std::atoll(value);
+        } else if (std::strcmp(argv[i - 1], "--min-time") == 0) {
+            options.min_time = std::atof(value);
+        } else if (std::strcmp(argv[i - 1], "--repeat") == 0) {
+            options.repeat = std::max(1, std::atoi(value));
+        } else {
+            return false;
+        }
+    }
+    return true;
+}
+
+}  // namespace
+
+int main(int argc, char** argv) {
+    Options options;
+    if (!parse_options(argc, argv, options)) {
+        std::fprintf(stderr,
+            "Usage: %s [--max-elements N] [--max-bytes N] [--min-time SECONDS] [--repeat N]\n",
+            argv[0]);
+        return 2;
+    }
+
+    measure(options, "add", "", 1, 0, [] { return add(123456, 654321); });
+    measure(options, "multiply", "", 1, 0, [] { return multiply(1234, 4321); });
+    measure(options, "factorial", "\"n\": 20", 1, 0, [] { return factorial(20); });
+
+    std::vector<char> digits(4096);
+    measure(options, "factorial_big", "\"n\": 1000", 1, 0, [&] {
+        return factorial_big(1000, digits.data(), static_cast<int>(digits.size()));
+    });
+
+    for (long long size : byte_sizes(options.max_bytes)) {
+        std::vector<char> input(size, 'a');
+        std::vector<char> output(size);
+        measure(options, "process_bytes", "", size, size, [&] {
+            return process_bytes(input.data(), output.data(), size);
+        });
+    }
+
+    const char* methods[] = {"naive", "kahan", "pairwise"};
+    for (long long size : element_sizes(options.max_elements)) {
+        std::vector<double> values(size);
+        for (long long i = 0; i < size; ++i) {
+            values[i] = static_cast<double>(i % 1000) * 0.5;
+        }
+        for (int method = 0; method < 3; ++method) {
+            std::string params = std::string("\"method\": \"") + methods[method] + "\", \"threads\": 1";
+            measure(options, "sum_array_ex", params, size, size * 8, [&] {
+                return sum_array_ex(values.data(), size, method, 1);
+            });
+        }
+        // Multi-threaded summation only splits arrays of at least 2 * 65536 elements
+        if (size >= 131072) {
+            measure(options, "sum_array_ex", "\"method\": \"naive\", \"threads\": 0", size, size * 8, [&] {
+                return sum_array_ex(values.data(), size, ENGINE_SUM_NAIVE, 0);
+            });
+        }
+
+        // Downsample (timestamp, value) columns to chart size
+        std::vector<double> timestamps(size);
+        for (long long i = 0; i < size; ++i) {
+            timestamps[i] = static_cast<double>(i);
+        }
+        std::vector<long long> kept(1000);
+        const char* downsample_methods[] = {"lttb", "minmax"};
+        for (int method = 0; method < 2; ++method) {
+            std::string params = std::string("\"method\": \"") + downsample_methods[method] + "\", \"points\": 1000";
+            measure(options, "downsample", params, size, size * 16, [&] {
+                return downsample(timestamps.data(), values.data(), size, 1000, method, kept.data());
+            });
+        }
+    }
+
+    for (long long size : element_sizes(std::min(options.max_elements, 10000000LL))) {
+        std::vector<int> a(size, 3), b(size, 4), out(size);
+        std::vector<int> n(size, 12);
+        std::vector<long long> factorials(size);
+        measure(options, "add_arrays", "", size, size * 4, [&] {
+            return add_arrays(a.data(), b.data(), out.data(), static_cast<int>(size));
+        });
+        measure(options, "factorial_many", "", size, size * 4, [&] {
+            return factorial_many(n.data(), factorials.data(), static_cast<int>(size));
+        });
+    }
+    return 0;
+}
@@ -2,14 +2,25 @@
 """
 Hot-reload script for C++ engine library.
 Monitors source files and automatically rebuilds the library when changes are detected.
+
+Changes are debounced: a burst of saves triggers a single build once the
+files have been quiet for DEBOUNCE_SECONDS, and changes made while a build is
+running trigger exactly one more build afterwards. Builds use all CPU cores,
+Ninja when it is installed and ccache when it is available (see
+CMakeLists.txt). Documentation is regenerated in the background after the
+library has been reloaded, or not at all with --no-docs.
 """
+import argparse
 import os
+import shutil
 import sys
 import subprocess
+import threading
 import time
 import urllib.request
 import urllib.error
 from pathlib import Path
+from typing import Callable, Set
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
 
@@ -20,14 +31,71 @@ BUILD_DIR = ENGINE_DIR / "build"
 # FastAPI server URL for auto-reload (set via environment variable or default)
 FASTAPI_URL = os.environ.get("FASTAPI_URL", "http://localhost:8000")
 
+# Quiet period after the last change before a build starts
+DEBOUNCE_SECONDS = float(os.environ.get("ENGINE_BUILD_DEBOUNCE", "0.3"))
+
+# Parallel build jobs (defaults to the number of CPU cores)
+BUILD_JOBS = int(os.environ.get("ENGINE_BUILD_JOBS", "0")) or os.cpu_count() or 1
+
+
+class DebouncedQueue:
+    """
+    Coalesces requests into runs of a single worker thread.
+
+    A run starts once no request has arrived for `delay` seconds and
+    receives every item requested since the previous run. Requests that
+    arrive during a run are kept and trigger one more run when it ends.
+    """
+    
+    def __init__(self, name: str, action: Callable[[Set], None], delay: float = 0.0):
+        self.action = action
+        self.delay = delay
+        self._condition = threading.Condition()
+        self._pending: Set = set()
+        self._requested = False
+        self._last_request = 0.0
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+    
+    def request(self, item=None):
+        """Schedule a run; item (if any) is passed to it with the others."""
+        with self._condition:
+            if item is not None:
+                self._pending.add(item)
+            self._requested = True
+            self._last_request = time.monotonic()
+            self._condition.notify()
+    
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._requested:
+                    self._condition.wait()
+                # Wait until requests have been quiet for the debounce delay
+                while True:
+                    remaining = self._last_request + self.delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                items = self._pending
+                self._pending = set()
+                self._requested = False
+            try:
+                self.action(items)
+            except Exception as e:
+                print(f"❌ {self._thread.name} error: {e}")
+
 
 class EngineBuildHandler(FileSystemEventHandler):
     """Handler for file system events that trigger rebuilds."""
     
-    def __init__(self):
-        self.last_build_time = 0
-        self.build_cooldown = 2  # Minimum seconds between builds
-        self.building = False
+    def __init__(self, generate_docs: bool = True):
+        if generate_docs and not shutil.which('doxygen'):
+            print("📚 Doxygen not found - documentation will not be generated")
+            generate_docs = False
+        self.generate_docs = generate_docs
+        self.build_queue = DebouncedQueue("build", self.rebuild_library, DEBOUNCE_SECONDS)
+        self.docs_queue = DebouncedQueue("docs", lambda _: self._generate_docs())
         
     def should_rebuild(self, file_path: Path) -> bool:
         """Check if the file change should trigger a rebuild."""
@@ -45,26 +113,27 @@ class EngineBuildHandler(FileSystemEventHandler):
         
         return True
     
+    def _queue_change(self, path):
+        if path is None:
+            return
+        file_path = Path(os.fsdecode(path))
+        if self.should_rebuild(file_path):
+            self.build_queue.request(file_path)
+    
     def on_modified(self, event):
         """Handle file modification events."""
-        if event.is_directory:
-            return
-        
-        file_path = Path(event.src_path)
-        
-        if not self.should_rebuild(file_path):
-            return
-        
-        # Cooldown to avoid multiple builds for the same change
-        current_time = time.time()
-        if current_time - self.last_build_time < self.build_cooldown:
-            return
-        
-        if self.building:
-            return
-        
-        self.last_build_time = current_time
-        self.rebuild_library(file_path)
+        if not event.is_directory:
+            self._queue_change(event.src_path)
+    
+    def on_created(self, event):
+        """Handle new files (and editors that save by writing a new file)."""
+        if not event.is_directory:
+            self._queue_change(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle renames (editors that save through a temporary file)."""
+        if not event.is_directory:
+            self._queue_change(getattr(event, "dest_path", None))
     
     def _is_dll_locked(self, dll_path: Path) -> bool:
         """Check if DLL is locked (Windows only)."""
@@ -156,11 +225,12 @@ class EngineBuildHandler(FileSystemEventHandler):
         
         return False
     
-    def rebuild_library(self, changed_file: Path):
+    def rebuild_library(self, changed_files: Set[Path]):
         """Rebuild the C++ library."""
-        self.building = True
+        started = time.monotonic()
+        names = ", ".join(sorted(path.name for path in changed_files)) or "(none)"
         print(f"\n{'='*60}")
-        print(f"🔍 Change detected in: {changed_file.name}")
+        print(f"🔍 Change detected in: {names}")
         print(f"{'='*60}\n")
         
         # Check if DLL is locked before building (Windows)
@@ -213,17 +283,18 @@ class EngineBuildHandler(FileSystemEventHandler):
             )
             
             if result.returncode == 0:
-                print("✅ Build successful!")
-                print(f"📦 Library rebuilt: {changed_file.name}")
-                
-                # Generate documentation
-                self._generate_docs()
+                print(f"✅ Build successful! ({time.monotonic() - started:.1f}s)")
+                print(f"📦 Library rebuilt: {names}")
                 
                 # Try to auto-reload via API if server is running
                 if self._try_auto_reload():
-                    print("🔄 Library automatically reloaded in FastAPI server!")
+                    print(f"🔄 Library automatically reloaded in FastAPI server! ({time.monotonic() - started:.1f}s after the build started)")
                 else:
                     print("\n💡 Tip: Restart the FastAPI server or call POST /api/v1/engine/reload to reload the library")
+                
+                # Documentation is not needed for the reload, so it never delays it
+                if self.generate_docs:
+                    self.docs_queue.request()
             else:
                 print("❌ Build failed!")
                 print(f"Exit code: {result.returncode}")
@@ -250,9 +321,16 @@ class EngineBuildHandler(FileSystemEventHandler):
         except Exception as e:
             print(f"❌ Build error: {e}")
         finally:
-            self.building = False
             print(f"{'='*60}\n")
     
+    def _configure_command(self) -> list:
+        """CMake configuration for a new build directory."""
+        cmake_cmd = ['cmake', '..']
+        # Ninja has much lower no-op and incremental build overhead than make/MSBuild
+        if shutil.which('ninja'):
+            cmake_cmd += ['-G', 'Ninja', '-DCMAKE_BUILD_TYPE=Release']
+        return cmake_cmd
+    
     def _build_windows(self) -> list:
         """Get Windows build commands."""
         # Create build directory if it doesn't exist
@@ -261,19 +339,14 @@ class EngineBuildHandler(FileSystemEventHandler):
         
         # Check if CMakeCache.txt exists in build directory
         cmake_cache = BUILD_DIR / "CMakeCache.txt"
+        build_cmd = ['cmake', '--build', '.', '--config', 'Release', '--parallel', str(BUILD_JOBS)]
         
         if not cmake_cache.exists():
             # First time setup - run CMake then build
-            return [
-                'cmake', '..'
-            ], [
-                'cmake', '--build', '.', '--config', 'Release'
-            ]
+            return self._configure_command(), build_cmd
         else:
             # Just build
-            return None, [
-                'cmake', '--build', '.', '--config', 'Release'
-            ]
+            return None, build_cmd
     
     def _build_unix(self) -> tuple:
         """Get Unix/Linux/Mac build commands."""
@@ -283,30 +356,36 @@ class EngineBuildHandler(FileSystemEventHandler):
         
         # Check if CMakeCache.txt exists in build directory
         cmake_cache = BUILD_DIR / "CMakeCache.txt"
+        build_cmd = ['cmake', '--build', '.', '--parallel', str(BUILD_JOBS)]
         
         if not cmake_cache.exists():
             # First time setup - run CMake then build
-            return [
-                'cmake', '..'
-            ], [
-                'make'
-            ]
+            return self._configure_command(), build_cmd
         else:
             # Just build
-            return None, [
-                'make'
-            ]
+            return None, build_cmd
 
 
 def main():
     """Main function to start the hot-reload watcher."""
+    parser = argparse.ArgumentParser(description="Rebuild and reload the engine library on source changes.")
+    parser.add_argument("--no-docs", action="store_true", help="do not regenerate documentation after builds")
+    parser.add_argument("--docs-only", action="store_true", help="generate documentation once and exit")
+    args = parser.parse_args()
+    
+    if args.docs_only:
+        EngineBuildHandler(generate_docs=False)._generate_docs()
+        return
+    
     print("🚀 Engine Hot-Reload Started")
     print(f"📁 Watching: {ENGINE_DIR}")
     print("👀 Monitoring for changes in .cpp, .h, .hpp, .c files...")
+    print(f"⚙️  Debounce: {DEBOUNCE_SECONDS}s, parallel jobs: {BUILD_JOBS}, "
+          f"docs: {'off' if args.no_docs else 'background'}")
     print("\nPress Ctrl+C to stop\n")
     
     # Create event handler
-    event_handler = EngineBuildHandler()
+    event_handler = EngineBuildHandler(generate_docs=not args.no_docs)
     
     # Create observer
     observer = Observer()
@@ -3,7 +3,7 @@ SQLAdmin configuration for database preview and management.
 """
 from sqladmin import Admin, ModelView
 from app.core.database import engine
-from app.models.database import EngineCalculation
+from app.models.database import EngineCalculation, EngineCalculationRollup
 
 
 class EngineCalculationAdmin(ModelView, model=EngineCalculation):
@@ -35,6 +35,31 @@ class EngineCalculationAdmin(ModelView, model=EngineCalculation):
     icon = "fa-solid fa-calculator"
 
 
+class EngineCalculationRollupAdmin(ModelView, model=EngineCalculationRollup):
+    """
+    Admin view for hourly rollups of compacted calculation history.
+    """
+    column_list = [
+        EngineCalculationRollup.operation_type,
+        EngineCalculationRollup.bucket_start,
+        EngineCalculationRollup.calls,
+        EngineCalculationRollup.failures,
+        EngineCalculationRollup.input_bytes,
+        EngineCalculationRollup.result_count,
+        EngineCalculationRollup.result_sum,
+        EngineCalculationRollup.result_min,
+        EngineCalculationRollup.result_max,
+    ]
+    column_searchable_list = [EngineCalculationRollup.operation_type]
+    column_sortable_list = [EngineCalculationRollup.bucket_start, EngineCalculationRollup.operation_type]
+    column_default_sort = (EngineCalculationRollup.bucket_start, True)
+    can_create = False
+    can_edit = False
+    name = "Calculation Rollup"
+    name_plural = "Calculation Rollups"
+    icon = "fa-solid fa-layer-group"
+
+
 def setup_admin(app):
     """
     Set up SQLAdmin with the FastAPI app.
@@ -48,6 +73,7 @@ def setup_admin(app):
     
     # Register models
     admin.add_view(EngineCalculationAdmin)
+    admin.add_view(EngineCalculationRollupAdmin)
     
     return admin
 
@@ -0,0 +1,85 @@
+"""
+Binary encoding for large numeric payloads.
+
+Layout (all fields little-endian):
+
+    offset  size  field
+    0       4     magic b"MLF8"
+    4       1     format version (1)
+    5       1     element type (1 = float64)
+    6       2     reserved (0)
+    8       8     element count (uint64)
+    16      8*n   float64 values
+"""
+import array
+import struct
+import sys
+from typing import Iterable, Optional
+from fastapi import Request
+
+BINARY_MEDIA_TYPE = "application/vnd.modelab.f64"
+
+MAGIC = b"MLF8"
+VERSION = 1
+DTYPE_FLOAT64 = 1
+HEADER = struct.Struct("<4sBBHQ")
+
+
+class BinaryPayloadError(ValueError):
+    """Raised when a binary payload is malformed."""
+
+
+def is_binary_media_type(content_type: Optional[str]) -> bool:
+    """Check whether a Content-Type or Accept header selects the binary encoding."""
+    if not content_type:
+        return False
+    return any(
+        part.split(";")[0].strip().lower() == BINARY_MEDIA_TYPE
+        for part in content_type.split(",")
+    )
+
+
+def decode_f64(buffer: bytearray) -> memoryview:
+    """
+    Decode a binary payload into a float64 view over the same memory.
+
+    The returned view is writable and can be passed to EngineWrapper without
+    copying. On big-endian hosts the values are byte-swapped in place.
+    """
+    if len(buffer) < HEADER.size:
+        raise BinaryPayloadError("Payload is shorter than the binary header")
+
+    magic, version, dtype, _, count = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise BinaryPayloadError("Invalid binary payload magic")
+    if version != VERSION:
+        raise BinaryPayloadError(f"Unsupported binary payload version: {version}")
+    if dtype != DTYPE_FLOAT64:
+        raise BinaryPayloadError(f"Unsupported binary element type: {dtype}")
+    if len(buffer) != HEADER.size + 8 * count:
+        raise BinaryPayloadError(
+            f"Payload size does not match element count {count}"
+        )
+
+    values = memoryview(buffer)[HEADER.size:].cast("d")
+    if sys.byteorder != "little":
+        swapped = array.array("d", values)
+        swapped.byteswap()
+        values[:] = swapped
+    return values
+
+
+def encode_f64(values: Iterable[float]) -> bytes:
+    """Encode float values as a binary payload."""
+    data = array.array("d", values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return HEADER.pack(MAGIC, VERSION, DTYPE_FLOAT64, 0, len(data)) + data.tobytes()
+
+
+async def read_f64_body(request: Request) -> memoryview:
+    """Read a binary request body into a single buffer and decode it."""
+    buffer = bytearray()
+    async for chunk in request.stream():
+        buffer += chunk
+    return decode_f64(buffer)
@@ -0,0 +1,231 @@
+"""
+Live feed of newly persisted engine calculations.
+
+GET /engine/calculations/live streams new engine_calculations rows to each
+subscriber as Server-Sent Events. One background task per process tails the
+table by id and fans every new row out to the subscribers whose filters
+match. N open dashboards therefore cost one query per poll, not N full list
+requests. Rows committed by this process wake the task right away. Rows
+written by other server processes are picked up within
+LIVE_FEED_POLL_INTERVAL seconds.
+
+Each subscriber has a buffer of at most LIVE_FEED_QUEUE_SIZE rows. Rows that
+arrive while the buffer is full are dropped for that subscriber only. The
+stream then reports how many were missed, so the client can refetch instead
+of slowing the feed down for everyone.
+"""
+import asyncio
+import logging
+from collections import deque
+from typing import Deque, List, Optional, Set, Tuple
+from sqlalchemy import func, select
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.database import EngineCalculation
+from app.models.schemas import EngineCalculationResponse
+
+logger = logging.getLogger(__name__)
+
+# (id, operation_type, success, JSON payload); encoded once, shared by all subscribers
+FeedEvent = Tuple[int, str, bool, str]
+
+
+class CalculationFeedUnavailableError(RuntimeError):
+    """Raised when the feed is stopped or LIVE_FEED_MAX_SUBSCRIBERS streams are open."""
+
+
+class Subscription:
+    """Buffer of feed events for one client, filtered by operation type and success."""
+
+    def __init__(self, operation_type: Optional[str], success: Optional[bool], max_queue: int):
+        self.operation_type = operation_type
+        self.success = success
+        self.max_queue = max_queue
+        self._queue: Deque[FeedEvent] = deque()
+        self._ready = asyncio.Event()
+        self._dropped = 0
+        self.closed = False
+
+    def matches(self, event: FeedEvent) -> bool:
+        _, operation_type, success, _ = event
+        if self.operation_type is not None and operation_type != self.operation_type:
+            return False
+        return self.success is None or success == self.success
+
+    def offer(self, event: FeedEvent) -> bool:
+        """Queue an event. Returns False if the buffer is full and the event was dropped."""
+        if len(self._queue) >= self.max_queue:
+            self._dropped += 1
+            return False
+        self._queue.append(event)
+        self._ready.set()
+        return True
+
+    def close(self):
+        self.closed = True
+        self._ready.set()
+
+    async def get(self, timeout: float) -> Tuple[List[FeedEvent], int]:
+        """
+        Wait up to timeout seconds for events.
+
+        Returns the queued events (oldest first) and the number of events
+        dropped after them, both empty/0 on timeout or once closed.
+        """
+        if not self._queue and not self._dropped and not self.closed:
+            try:
+                await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+        self._ready.clear()
+        events = list(self._queue)
+        self._queue.clear()
+        dropped, self._dropped = self._dropped, 0
+        return events, dropped
+
+
+class CalculationFeed:
+    """
+    Fans out new engine_calculations rows to live subscribers.
+
+    The tailing task only queries the database while at least one client is
+    subscribed; it starts from the newest row present when the first client
+    subscribes, so no history is replayed.
+    """
+
+    def __init__(self, poll_interval: float, batch_size: int, max_queue: int, max_subscribers: int):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.max_subscribers = max_subscribers
+        self._subscribers: Set[Subscription] = set()
+        self._last_id: Optional[int] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._polls = 0
+        self._published = 0
+        self._delivered = 0
+        self._dropped = 0
+        self._failed_polls = 0
+
+    def stats(self) -> dict:
+        """Return subscriber and fanout counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "subscribers": len(self._subscribers),
+            "max_subscribers": self.max_subscribers,
+            "polls": self._polls,
+            "published": self._published,
+            "delivered": self._delivered,
+            "dropped": self._dropped,
+            "failed_polls": self._failed_polls,
+        }
+
+    async def subscribe(self, operation_type: Optional[str] = None, success: Optional[bool] = None) -> Subscription:
+        """Register a client; it receives rows committed from now on."""
+        if self._task is None:
+            raise CalculationFeedUnavailableError("The live calculation feed is not running")
+        if len(self._subscribers) >= self.max_subscribers:
+            raise CalculationFeedUnavailableError(
+                f"The live calculation feed already has {self.max_subscribers} subscribers"
+            )
+        if self._last_id is None:
+            async with AsyncSessionLocal() as db:
+                last_id = await db.scalar(select(func.max(EngineCalculation.id))) or 0
+            # Another subscriber may have started the cursor while we waited
+            if self._last_id is None:
+                self._last_id = last_id
+        subscription = Subscription(operation_type, success, self.max_queue)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+        if not self._subscribers:
+            # Start from the newest row again when the next client arrives
+            self._last_id = None
+
+    def notify(self):
+        """Tell the feed that rows were committed (called after every history insert)."""
+        if self._wakeup is not None and self._subscribers:
+            self._wakeup.set()
+
+    def _publish(self, rows: List[EngineCalculation]):
+        for row in rows:
+            event = (
+                row.id,
+                row.operation_type,
+                bool(row.success),
+                EngineCalculationResponse.model_validate(row).model_dump_json(),
+            )
+            for subscription in self._subscribers:
+                if subscription.matches(event):
+                    if subscription.offer(event):
+                        self._delivered += 1
+                    else:
+                        self._dropped += 1
+        self._published += len(rows)
+
+    async def poll(self):
+        """Publish every row committed since the last poll, in id order."""
+        while self._subscribers and self._last_id is not None and not self._stopping:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.scalars(
+                    select(EngineCalculation)
+                    .where(EngineCalculation.id > self._last_id)
+                    .order_by(EngineCalculation.id)
+                    .limit(self.batch_size)
+                )).all()
+            self._polls += 1
+            if not rows or self._last_id is None:
+                return
+            self._last_id = rows[-1].id
+            self._publish(rows)
+            if len(rows) < self.batch_size:
+                return
+            # Let the streams send what they have before the next batch
+            await asyncio.sleep(0)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.poll()
+            except Exception:
+                self._failed_polls += 1
+                logger.exception("Live calculation feed poll failed")
+
+    def start(self):
+        """Start the tailing task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the tailing task and end every open stream."""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._wakeup = None
+        for subscription in self._subscribers:
+            subscription.close()
+        self._subscribers.clear()
+        self._last_id = None
+        self._stopping = False
+
+
+calculation_feed = CalculationFeed(
+    poll_interval=settings.LIVE_FEED_POLL_INTERVAL,
+    batch_size=settings.LIVE_FEED_BATCH_SIZE,
+    max_queue=settings.LIVE_FEED_QUEUE_SIZE,
+    max_subscribers=settings.LIVE_FEED_MAX_SUBSCRIBERS
+)
@@ -0,0 +1,311 @@
+"""
+Incrementally maintained statistics over calculation history.
+
+Every insert into engine_calculations also adds its rows to hourly
+aggregates in engine_calculation_stats, in the same transaction. Dashboards
+read those aggregates instead of scanning the history, so their cost
+depends on the time range, not on the number of rows. The aggregates are
+never compacted, so they also cover rows removed by history retention.
+
+The aggregates of history written before the table existed are built once
+at startup (backfill), which is recorded in modelab_metadata.
+"""
+import logging
+import math
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import case, func, insert, literal, or_, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.exc import IntegrityError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.database import AsyncSessionLocal
+from app.models.database import (
+    EngineCalculation,
+    EngineCalculationRollup,
+    EngineCalculationStats,
+    ModelabMetadata,
+)
+
+logger = logging.getLogger(__name__)
+
+# modelab_metadata key set once the existing history has been aggregated
+BACKFILL_KEY = "calculation_stats_backfill"
+# Rows read per round trip while backfilling
+BACKFILL_CHUNK_SIZE = 10_000
+# Buckets per upsert statement (keeps the bound parameters under SQLite's limit)
+UPSERT_CHUNK_SIZE = 1_000
+
+# Upsert-capable INSERT constructs; other databases use _apply_without_upsert
+_DIALECT_INSERTS = {
+    "sqlite": sqlite.insert,
+    "postgresql": postgresql.insert,
+    "mysql": mysql.insert,
+}
+
+BucketKey = Tuple[str, datetime]
+# (operation_type, created_at, success, result, input_bytes)
+AggregateRecord = Tuple[str, datetime, int, Optional[str], int]
+# Aggregate columns that _merge_values adds up
+_VALUE_COLUMNS = (
+    "calls", "failures", "input_bytes", "result_count", "result_sum", "result_min", "result_max",
+)
+
+
+@dataclass
+class Bucket:
+    """Aggregate of the rows of one operation type in one time bucket."""
+    calls: int = 0
+    failures: int = 0
+    input_bytes: int = 0
+    result_count: int = 0
+    result_sum: Optional[float] = None
+    result_min: Optional[float] = None
+    result_max: Optional[float] = None
+
+    def add_result(self, value: float):
+        self.result_count += 1
+        self.result_sum = value if self.result_sum is None else self.result_sum + value
+        self.result_min = value if self.result_min is None else min(self.result_min, value)
+        self.result_max = value if self.result_max is None else max(self.result_max, value)
+
+    def merge(self, other):
+        """Add another bucket, or a row of an hourly aggregate table."""
+        self.calls += other.calls
+        self.failures += other.failures
+        self.input_bytes += other.input_bytes
+        if not other.result_count:
+            return
+        self.result_count += other.result_count
+        self.result_sum = other.result_sum if self.result_sum is None else self.result_sum + other.result_sum
+        self.result_min = other.result_min if self.result_min is None else min(self.result_min, other.result_min)
+        self.result_max = other.result_max if self.result_max is None else max(self.result_max, other.result_max)
+
+
+def numeric_result(result: Optional[str]) -> Optional[float]:
+    """The result as a float, or None if it is missing or not a finite number."""
+    if result is None:
+        return None
+    try:
+        value = float(result)
+    except ValueError:
+        return None
+    return value if math.isfinite(value) else None
+
+
+def as_utc(value: datetime) -> datetime:
+    """value as an aware UTC datetime (naive values are UTC)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def hour_bucket(created_at: datetime) -> datetime:
+    """Start of the UTC hour containing created_at."""
+    return as_utc(created_at).replace(minute=0, second=0, microsecond=0)
+
+
+def aggregate(
+    records: Iterable[AggregateRecord],
+    buckets: Optional[Dict[BucketKey, Bucket]] = None
+) -> Dict[BucketKey, Bucket]:
+    """Add records to hourly buckets keyed by (operation_type, hour)."""
+    if buckets is None:
+        buckets = {}
+    for operation_type, created_at, success, result, input_bytes in records:
+        key = (operation_type, hour_bucket(created_at))
+        bucket = buckets.get(key)
+        if bucket is None:
+            bucket = buckets[key] = Bucket()
+        bucket.calls += 1
+        bucket.failures += 0 if success else 1
+        bucket.input_bytes += input_bytes or 0
+        value = numeric_result(result)
+        if value is not None:
+            bucket.add_result(value)
+    return buckets
+
+
+def row_records(rows: Iterable[dict]) -> Iterable[AggregateRecord]:
+    """Aggregate records of engine_calculations rows built by make_calculation_row."""
+    for row in rows:
+        yield row["operation_type"], row["created_at"], row["success"], row["result"], len(row["input_data"])
+
+
+def _merge_values(model, excluded) -> dict:
+    """SET clause adding the proposed row (excluded) to the stored one."""
+    return {
+        "calls": model.calls + excluded.calls,
+        "failures": model.failures + excluded.failures,
+        "input_bytes": model.input_bytes + excluded.input_bytes,
+        "result_count": model.result_count + excluded.result_count,
+        "result_sum": case(
+            (excluded.result_sum.is_(None), model.result_sum),
+            else_=func.coalesce(model.result_sum, 0.0) + excluded.result_sum
+        ),
+        "result_min": case(
+            (excluded.result_min.is_(None), model.result_min),
+            (or_(model.result_min.is_(None), model.result_min > excluded.result_min), excluded.result_min),
+            else_=model.result_min
+        ),
+        "result_max": case(
+            (excluded.result_max.is_(None), model.result_max),
+            (or_(model.result_max.is_(None), model.result_max < excluded.result_max), excluded.result_max),
+            else_=model.result_max
+        ),
+    }
+
+
+async def apply_buckets(db: AsyncSession, model, buckets: Dict[BucketKey, Bucket]):
+    """
+    Add hourly buckets to an aggregate table, without committing.
+
+    Buckets are written with INSERT ... ON CONFLICT DO UPDATE (ON DUPLICATE
+    KEY UPDATE on MySQL) on the (operation_type, bucket_start) unique key,
+    which adds to the stored row relative to its current value. Concurrent
+    writers creating the same bucket therefore never fail on the unique
+    constraint or lose each other's counts. Other databases get the same
+    result one bucket at a time (_apply_without_upsert).
+    """
+    if not buckets:
+        return
+    rows = [
+        {
+            "operation_type": operation_type,
+            "bucket_start": bucket_start,
+            "calls": bucket.calls,
+            "failures": bucket.failures,
+            "input_bytes": bucket.input_bytes,
+            "result_count": bucket.result_count,
+            "result_sum": bucket.result_sum,
+            "result_min": bucket.result_min,
+            "result_max": bucket.result_max,
+        }
+        for (operation_type, bucket_start), bucket in buckets.items()
+    ]
+    dialect = db.get_bind().dialect.name
+    if dialect not in _DIALECT_INSERTS:
+        await _apply_without_upsert(db, model, rows)
+        return
+    for start in range(0, len(rows), UPSERT_CHUNK_SIZE):
+        statement = _DIALECT_INSERTS[dialect](model).values(rows[start:start + UPSERT_CHUNK_SIZE])
+        if dialect == "mysql":
+            statement = statement.on_duplicate_key_update(_merge_values(model, statement.inserted))
+        else:
+            statement = statement.on_conflict_do_update(
+                index_elements=[model.operation_type, model.bucket_start],
+                set_=_merge_values(model, statement.excluded)
+            )
+        await db.execute(statement)
+
+
+async def _apply_without_upsert(db: AsyncSession, model, rows: List[dict]):
+    """
+    Add bucket rows with plain UPDATE and INSERT statements.
+
+    Each bucket is added to its stored row with a relative UPDATE, and
+    inserted if there is none yet. When a concurrent writer inserts the
+    same bucket first, the INSERT fails on the unique key inside its
+    savepoint and the bucket is added with UPDATE after all.
+    """
+    columns = model.__table__.c
+    for row in rows:
+        proposed = SimpleNamespace(**{name: literal(row[name], columns[name].type) for name in _VALUE_COLUMNS})
+        statement = (
+            update(model)
+            .where(model.operation_type == row["operation_type"], model.bucket_start == row["bucket_start"])
+            .values(_merge_values(model, proposed))
+            .execution_options(synchronize_session=False)
+        )
+        if (await db.execute(statement)).rowcount:
+            continue
+        try:
+            async with db.begin_nested():
+                await db.execute(insert(model).values(row))
+        except IntegrityError:
+            await db.execute(statement)
+
+
+async def record_calculations(db: AsyncSession, rows: List[dict]):
+    """Add new engine_calculations rows to the statistics, without committing."""
+    await apply_buckets(db, EngineCalculationStats, aggregate(row_records(rows)))
+
+
+async def backfill():
+    """
+    Aggregate the history written before engine_calculation_stats existed.
+
+    Runs once per database. The metadata key is inserted in the same
+    transaction as the aggregates, so a second server process starting at
+    the same time fails on the key and skips the backfill.
+    """
+    async with AsyncSessionLocal() as db:
+        if await db.get(ModelabMetadata, BACKFILL_KEY) is not None:
+            return
+        metadata = ModelabMetadata(key=BACKFILL_KEY)
+        db.add(metadata)
+        try:
+            await db.flush()
+        except (IntegrityError, OperationalError):
+            # Another process holds or has written the key
+            await db.rollback()
+            return
+
+        buckets: Dict[BucketKey, Bucket] = {}
+        result = await db.stream(
+            select(
+                EngineCalculation.operation_type,
+                EngineCalculation.created_at,
+                EngineCalculation.success,
+                EngineCalculation.result,
+                func.length(EngineCalculation.input_data)
+            ).execution_options(yield_per=BACKFILL_CHUNK_SIZE)
+        )
+        rows = 0
+        async for partition in result.partitions():
+            aggregate(partition, buckets)
+            rows += len(partition)
+
+        # Rows already removed by history compaction survive as rollups
+        for rollup in (await db.scalars(select(EngineCalculationRollup))).all():
+            key = (rollup.operation_type, hour_bucket(rollup.bucket_start))
+            buckets.setdefault(key, Bucket()).merge(rollup)
+
+        await apply_buckets(db, EngineCalculationStats, buckets)
+        metadata.value = f"{rows} rows"
+        await db.commit()
+    if rows:
+        logger.info("Built calculation statistics from %d history rows", rows)
+
+
+async def query_stats(
+    db: AsyncSession,
+    interval: str,
+    operation_type: Optional[str],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime]
+) -> Dict[str, Dict[datetime, Bucket]]:
+    """
+    Aggregates per operation type and hour or day, oldest bucket first.
+
+    Time filters select whole hours: the hour containing created_after is
+    included, the one containing created_before only if it starts before it.
+    """
+    query = select(EngineCalculationStats)
+    if operation_type is not None:
+        query = query.where(EngineCalculationStats.operation_type == operation_type)
+    if created_after is not None:
+        query = query.where(EngineCalculationStats.bucket_start >= hour_bucket(created_after))
+    if created_before is not None:
+        query = query.where(EngineCalculationStats.bucket_start < as_utc(created_before))
+    query = query.order_by(EngineCalculationStats.operation_type, EngineCalculationStats.bucket_start)
+
+    series: Dict[str, Dict[datetime, Bucket]] = {}
+    for row in (await db.scalars(query)).all():
+        bucket_start = hour_bucket(row.bucket_start)
+        if interval == "day":
+            bucket_start = bucket_start.replace(hour=0)
+        buckets = series.setdefault(row.operation_type, {})
+        buckets.setdefault(bucket_start, Bucket()).merge(row)
+    return series
@@ -1,22 +1,112 @@
 """
 Database configuration and session management.
+
+The API uses the async engine (AsyncSessionLocal / get_async_db), so
+database I/O does not block the event loop. The sync engine is kept for
+schema setup at startup and the SQLAdmin panel.
 """
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from app.core.config import settings
 
-# Database URL - using SQLite for simplicity
-SQLALCHEMY_DATABASE_URL = "sqlite:///./modelab.db"
+# Database URL - SQLite by default, configurable through DATABASE_URL
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+# Async driver used for each database when DATABASE_ASYNC_URL is not set
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "mysql": "mysql+aiomysql",
+}
+# Drivers that already support asyncio and are used as configured
+_ASYNC_CAPABLE_DRIVERS = {"aiosqlite", "asyncpg", "psycopg", "aiomysql", "asyncmy"}
+
+
+def _async_url(url: URL) -> URL:
+    """The async driver counterpart of the database URL."""
+    if settings.DATABASE_ASYNC_URL:
+        return make_url(settings.DATABASE_ASYNC_URL)
+    if url.get_driver_name() in _ASYNC_CAPABLE_DRIVERS:
+        return url
+    backend = url.get_backend_name()
+    if backend not in _ASYNC_DRIVERS:
+        raise ValueError(f"No async driver known for {backend} databases, set DATABASE_ASYNC_URL")
+    return url.set(drivername=_ASYNC_DRIVERS[backend])
+
+
+def _engine_options(url) -> dict:
+    """Connection arguments and pool sizing for the configured database."""
+    if url.get_backend_name() != "sqlite":
+        return {
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+            "pool_recycle": settings.DATABASE_POOL_RECYCLE,
+            "pool_pre_ping": True,
+        }
+
+    options = {
+        "connect_args": {
+            "check_same_thread": False,  # Sessions are used from executor threads
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    }
+    if url.database in (None, "", ":memory:"):
+        # Every new connection to :memory: opens an empty database, so all
+        # threads share a single connection
+        options["poolclass"] = StaticPool
+    else:
+        options.update({
+            "pool_size": settings.DATABASE_POOL_SIZE,
+            "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+            "pool_timeout": settings.DATABASE_POOL_TIMEOUT,
+        })
+    return options
+
+
+def _configure_sqlite_connection(dbapi_connection, connection_record):
+    """
+    Apply SQLite tuning to a new connection.
+
+    WAL lets readers run alongside the single writer, and with
+    synchronous=NORMAL commits no longer fsync (the WAL is synced at
+    checkpoints, so a power loss can only lose the last commits, never
+    corrupt the database). busy_timeout makes writers wait for the lock
+    instead of failing with "database is locked".
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+        cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # Negative cache_size is in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size={-int(settings.SQLITE_CACHE_SIZE_KB)}")
+        cursor.execute(f"PRAGMA mmap_size={int(settings.SQLITE_MMAP_SIZE)}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+    finally:
+        cursor.close()
+
+
+_url = make_url(SQLALCHEMY_DATABASE_URL)
+_async_database_url = _async_url(_url)
+
+# Create engines (sync for startup and admin, async for the API)
+engine = create_engine(_url, **_engine_options(_url))
+async_engine = create_async_engine(_async_database_url, **_engine_options(_async_database_url))
 
-# Create engine
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False}  # Needed for SQLite
-)
+if _url.get_backend_name() == "sqlite":
+    event.listen(engine, "connect", _configure_sqlite_connection)
+if _async_database_url.get_backend_name() == "sqlite":
+    event.listen(async_engine.sync_engine, "connect", _configure_sqlite_connection)
 
-# Create session factory
+# Create session factories
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects stay usable after commit, without lazy loads (not possible in async code)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 
 # Base class for models
 Base = declarative_base()
@@ -32,3 +122,12 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    Dependency function to get an async database session.
+
+    No connection is taken from the pool until the session is first used.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -0,0 +1,84 @@
+"""
+Bounded thread pools for running blocking work off the event loop.
+"""
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from app.core.config import settings
+
+
+class ExecutorSaturatedError(RuntimeError):
+    """Raised when an executor has no free worker and its queue is full."""
+
+
+class BoundedExecutor:
+    """
+    Thread pool with a hard limit on running plus queued tasks.
+
+    Tasks that would exceed ``max_workers + max_queue`` are rejected with
+    ``ExecutorSaturatedError`` instead of piling up behind slow calls.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix=name
+        )
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._rejected = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of running plus queued tasks."""
+        return self.max_workers + self.max_queue
+
+    def stats(self) -> dict:
+        """Return a snapshot of the executor load."""
+        with self._lock:
+            return {
+                "name": self.name,
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "in_flight": self._in_flight,
+                "rejected": self._rejected,
+            }
+
+    async def run(self, func, *args, **kwargs):
+        """Run func(*args, **kwargs) in the pool and await its result."""
+        with self._lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise ExecutorSaturatedError(f"The {self.name} executor is saturated")
+            self._in_flight += 1
+
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(context.run, func, *args, **kwargs)
+        except BaseException:
+            self._release()
+            raise
+        # Runs when the task finishes and also when it is cancelled while still
+        # queued (the caller was cancelled), in which case func never runs
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        with self._lock:
+            self._in_flight -= 1
+
+    def shutdown(self, wait: bool = True):
+        """Stop accepting work and optionally wait for running tasks."""
+        self._executor.shutdown(wait=wait)
+
+
+# Native engine calls (ctypes releases the GIL while C code runs)
+engine_executor = BoundedExecutor(
+    "engine",
+    max_workers=settings.ENGINE_EXECUTOR_MAX_WORKERS,
+    max_queue=settings.ENGINE_EXECUTOR_MAX_QUEUE
+)
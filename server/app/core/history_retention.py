@@ -0,0 +1,274 @@
+"""
+Retention and compaction for engine calculation history.
+
+A background task periodically removes engine_calculations rows that fall
+outside the retention policy (older than HISTORY_RETENTION_DAYS or beyond
+the newest HISTORY_MAX_ROWS_PER_OPERATION rows of their operation_type).
+Before deletion the rows are rolled up into hourly aggregates in
+engine_calculation_rollups, so long-term counts survive while the hot table
+stays small. Work is done in short transactions of
+HISTORY_COMPACTION_BATCH_SIZE rows, so inserts are never blocked for long.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.calculation_stats import aggregate, apply_buckets
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal, async_engine
+from app.core.history_writer import compact_input_data
+from app.models.database import EngineCalculation, EngineCalculationRollup
+
+logger = logging.getLogger(__name__)
+
+
+class HistoryCompactor:
+    """
+    Applies the history retention policy in the background.
+
+    Runs every interval seconds (never when interval is 0 or no retention
+    limit is configured) and on demand through compact(). Only one
+    compaction runs at a time per process.
+    """
+
+    def __init__(
+        self,
+        retention_days: float,
+        max_rows: int,
+        retention_days_by_operation: Dict[str, float],
+        max_rows_by_operation: Dict[str, int],
+        input_max_bytes: int,
+        batch_size: int,
+        interval: float
+    ):
+        self.retention_days = retention_days
+        self.max_rows = max_rows
+        self.retention_days_by_operation = retention_days_by_operation
+        self.max_rows_by_operation = max_rows_by_operation
+        self.input_max_bytes = input_max_bytes
+        self.batch_size = batch_size
+        self.interval = interval
+        self._lock: Optional[asyncio.Lock] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._runs = 0
+        self._rolled_up = 0
+        self._truncated = 0
+        self._failed_runs = 0
+        self._last_run_at: Optional[datetime] = None
+        self._last_duration: Optional[float] = None
+        # Rows up to this id have been checked for oversized input_data
+        self._truncated_through = 0
+
+    def stats(self) -> dict:
+        """Return compaction counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval": self.interval,
+            "runs": self._runs,
+            "rolled_up": self._rolled_up,
+            "truncated": self._truncated,
+            "failed_runs": self._failed_runs,
+            "last_run_at": self._last_run_at.isoformat() if self._last_run_at else None,
+            "last_duration": self._last_duration,
+        }
+
+    @property
+    def has_limits(self) -> bool:
+        """Whether any retention limit is configured (all limits default to 0)."""
+        return any((
+            self.retention_days > 0,
+            self.max_rows > 0,
+            any(days > 0 for days in self.retention_days_by_operation.values()),
+            any(rows > 0 for rows in self.max_rows_by_operation.values()),
+        ))
+
+    def policy(self, operation_type: str) -> Tuple[float, int]:
+        """(retention days, max rows) for an operation type, 0 meaning no limit."""
+        return (
+            self.retention_days_by_operation.get(operation_type, self.retention_days),
+            self.max_rows_by_operation.get(operation_type, self.max_rows),
+        )
+
+    async def compact(self, vacuum: bool = False) -> dict:
+        """
+        Apply the retention policy now and return what was done.
+
+        vacuum=True also runs VACUUM afterwards to return freed pages to the
+        file system. It rewrites the whole database and blocks writers while
+        it runs; without it SQLite reuses the freed pages for new rows.
+        """
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            started = time.perf_counter()
+            summary = {"rolled_up": 0, "truncated": 0, "vacuumed": False}
+            try:
+                async with AsyncSessionLocal() as db:
+                    operation_types = (await db.scalars(select(EngineCalculation.operation_type).distinct())).all()
+                for operation_type in operation_types:
+                    summary["rolled_up"] += await self._compact_operation(operation_type)
+                summary["truncated"] = await self._truncate_inputs()
+                if vacuum:
+                    async with async_engine.connect() as connection:
+                        connection = await connection.execution_options(isolation_level="AUTOCOMMIT")
+                        await connection.exec_driver_sql("VACUUM")
+                    summary["vacuumed"] = True
+            except Exception:
+                self._failed_runs += 1
+                raise
+            finally:
+                self._runs += 1
+                self._rolled_up += summary["rolled_up"]
+                self._truncated += summary["truncated"]
+                self._last_run_at = datetime.now(timezone.utc)
+                self._last_duration = time.perf_counter() - started
+            summary["duration"] = self._last_duration
+            return summary
+
+    async def _truncate_inputs(self) -> int:
+        """Shorten oversized input_data stored before HISTORY_INPUT_MAX_BYTES applied."""
+        if self.input_max_bytes <= 0:
+            return 0
+        truncated = 0
+        last_id = self._truncated_through
+        while not self._stopping:
+            async with AsyncSessionLocal() as db:
+                rows = (await db.execute(
+                    select(EngineCalculation.id, EngineCalculation.input_data)
+                    .where(
+                        EngineCalculation.id > last_id,
+                        func.length(EngineCalculation.input_data) > self.input_max_bytes
+                    )
+                    .order_by(EngineCalculation.id)
+                    .limit(self.batch_size)
+                )).all()
+                if not rows:
+                    self._truncated_through = await db.scalar(select(func.max(EngineCalculation.id))) or 0
+                    break
+                await db.execute(update(EngineCalculation), [
+                    {"id": row.id, "input_data": compact_input_data(row.input_data, self.input_max_bytes)}
+                    for row in rows
+                ])
+                await db.commit()
+            truncated += len(rows)
+            last_id = rows[-1].id
+        return truncated
+
+    async def _compact_operation(self, operation_type: str) -> int:
+        """Roll up and delete the rows of one operation type outside the policy."""
+        retention_days, max_rows = self.policy(operation_type)
+        conditions = []
+        if retention_days > 0:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=retention_days)
+            conditions.append(EngineCalculation.created_at < cutoff)
+        if max_rows > 0:
+            async with AsyncSessionLocal() as db:
+                oldest_kept_id = await db.scalar(
+                    select(EngineCalculation.id)
+                    .where(EngineCalculation.operation_type == operation_type)
+                    .order_by(EngineCalculation.id.desc())
+                    .offset(max_rows - 1)
+                    .limit(1)
+                )
+            if oldest_kept_id is not None:
+                conditions.append(EngineCalculation.id < oldest_kept_id)
+        if not conditions:
+            return 0
+
+        condition = (EngineCalculation.operation_type == operation_type) & or_(*conditions)
+        compacted = 0
+        while not self._stopping:
+            async with AsyncSessionLocal() as db:
+                batch = await self._compact_batch(db, condition)
+            compacted += batch
+            if batch < self.batch_size:
+                break
+            # Let queued inserts and requests through between batches
+            await asyncio.sleep(0)
+        return compacted
+
+    async def _compact_batch(self, db: AsyncSession, condition) -> int:
+        """Move the oldest batch_size matching rows into the rollup table, in one transaction."""
+        rows = (await db.execute(
+            select(
+                EngineCalculation.operation_type,
+                EngineCalculation.created_at,
+                EngineCalculation.success,
+                EngineCalculation.result,
+                func.length(EngineCalculation.input_data).label("input_bytes"),
+                EngineCalculation.id
+            )
+            .where(condition)
+            .order_by(EngineCalculation.id)
+            .limit(self.batch_size)
+        )).all()
+        if not rows:
+            return 0
+
+        # Ids only grow, so the selected rows are exactly the matching rows up to the last id
+        deleted = await db.execute(
+            delete(EngineCalculation)
+            .where(condition, EngineCalculation.id <= rows[-1].id)
+            .execution_options(synchronize_session=False)
+        )
+        if deleted.rowcount != len(rows):
+            # Another process compacted the same rows; counting them again would double the rollup
+            await db.rollback()
+            return 0
+
+        buckets = aggregate(
+            (row.operation_type, row.created_at, row.success, row.result, row.input_bytes) for row in rows
+        )
+        await apply_buckets(db, EngineCalculationRollup, buckets)
+        await db.commit()
+        return len(rows)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await self.compact()
+            except Exception:
+                logger.exception("History compaction failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self):
+        """
+        Start the background compaction task on the running event loop.
+
+        Without retention limits nothing is started, so upgrading never
+        rewrites or deletes existing history on its own.
+        """
+        if self.interval <= 0 or not self.has_limits or (self._task is not None and not self._task.done()):
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the compaction task after its current batch."""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._wakeup = None
+        self._stopping = False
+
+
+history_compactor = HistoryCompactor(
+    retention_days=settings.HISTORY_RETENTION_DAYS,
+    max_rows=settings.HISTORY_MAX_ROWS_PER_OPERATION,
+    retention_days_by_operation=settings.HISTORY_RETENTION_DAYS_BY_OPERATION,
+    max_rows_by_operation=settings.HISTORY_MAX_ROWS_BY_OPERATION,
+    input_max_bytes=settings.HISTORY_INPUT_MAX_BYTES,
+    batch_size=settings.HISTORY_COMPACTION_BATCH_SIZE,
+    interval=settings.HISTORY_COMPACTION_INTERVAL
+)
@@ -0,0 +1,191 @@
+"""
+Write-behind persistence for engine calculation history.
+
+Handlers submit rows to an in-memory buffer; a background task flushes them
+in bulk inserts when the buffer reaches HISTORY_FLUSH_SIZE rows or every
+HISTORY_FLUSH_INTERVAL seconds, so request latency does not include the
+database commit. Rows that do not fit in the buffer (a large batch, or a
+database falling behind) are inserted by the request itself instead.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+from datetime import datetime, timezone
+from typing import List, Optional
+from sqlalchemy import insert
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.core.calculation_feed import calculation_feed
+from app.core.calculation_stats import record_calculations
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models.database import EngineCalculation
+
+logger = logging.getLogger(__name__)
+
+# Characters of an oversized input_data or result kept as a preview
+INPUT_PREVIEW_LENGTH = 256
+
+
+def compact_input_data(input_data: str, max_bytes: int = settings.HISTORY_INPUT_MAX_BYTES) -> str:
+    """
+    Replace input_data longer than max_bytes by its size, SHA-256 and a preview.
+
+    The result is still a JSON object, and equal inputs keep equal hashes.
+    """
+    if max_bytes <= 0 or len(input_data) <= max_bytes:
+        return input_data
+    data = input_data.encode()
+    return json.dumps({
+        "truncated": True,
+        "bytes": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "preview": input_data[:INPUT_PREVIEW_LENGTH],
+    })
+
+
+def compact_result(result: Optional[str], max_bytes: int = settings.HISTORY_RESULT_MAX_BYTES) -> Optional[str]:
+    """
+    Replace a result longer than max_bytes (e.g. the digits of a big
+    factorial) by its size, SHA-256 and a preview, like compact_input_data.
+    """
+    if result is None:
+        return None
+    return compact_input_data(result, max_bytes)
+
+
+def make_calculation_row(
+    operation_type: str,
+    input_data: str,
+    result: Optional[str],
+    success: bool,
+    message: str
+) -> dict:
+    """Build an engine_calculations row, timestamped at creation time."""
+    return {
+        "operation_type": operation_type,
+        "input_data": compact_input_data(input_data),
+        "result": compact_result(result),
+        "success": 1 if success else 0,
+        "message": message,
+        "created_at": datetime.now(timezone.utc),
+    }
+
+
+async def insert_calculations(db: AsyncSession, rows: List[dict]):
+    """
+    Bulk insert calculation rows and update the statistics in a single
+    transaction, then wake the live feed.
+    """
+    if not rows:
+        return
+    await db.execute(insert(EngineCalculation), rows)
+    await record_calculations(db, rows)
+    await db.commit()
+    calculation_feed.notify()
+
+
+async def insert_with_new_session(rows: List[dict]):
+    """Bulk insert rows with a session of their own (outside any request)."""
+    async with AsyncSessionLocal() as db:
+        await insert_calculations(db, rows)
+
+
+class HistoryWriter:
+    """
+    Bounded write-behind buffer for EngineCalculation rows.
+
+    put_many() inserts rows that do not fit right away, so the caller waits
+    for the database instead of losing history.
+    """
+
+    def __init__(self, max_buffer: int, flush_size: int, flush_interval: float):
+        self.max_buffer = max_buffer
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._buffer: List[dict] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._submitted = 0
+        self._flushed = 0
+        self._written_inline = 0
+        self._failed = 0
+
+    def stats(self) -> dict:
+        """Return queue and throughput counters."""
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "queued": len(self._buffer),
+            "max_buffer": self.max_buffer,
+            "submitted": self._submitted,
+            "flushed": self._flushed,
+            "written_inline": self._written_inline,
+            "failed": self._failed,
+        }
+
+    async def put_many(self, rows: List[dict]):
+        """Queue rows, or insert them right away if the buffer cannot take all of them."""
+        if len(rows) <= self.max_buffer - len(self._buffer):
+            self._buffer.extend(rows)
+            self._submitted += len(rows)
+            if self._wakeup is not None and len(self._buffer) >= self.flush_size:
+                self._wakeup.set()
+            return
+        await insert_with_new_session(rows)
+        self._written_inline += len(rows)
+
+    async def flush(self):
+        """Write all buffered rows in chunks of flush_size."""
+        while self._buffer:
+            rows = self._buffer[:self.flush_size]
+            del self._buffer[:self.flush_size]
+            try:
+                await insert_with_new_session(rows)
+            except PoolTimeoutError:
+                # No free database connection: put the rows back and retry on the next tick
+                self._buffer[:0] = rows
+                return
+            except Exception:
+                self._failed += len(rows)
+                logger.exception("Failed to write %d history rows", len(rows))
+            else:
+                self._flushed += len(rows)
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    def start(self):
+        """Start the background flush task on the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Stop the flush task and write everything still buffered."""
+        self._stopping = True
+        if self._task is not None:
+            self._wakeup.set()
+            await self._task
+            self._task = None
+        self._wakeup = None
+        while self._buffer:
+            await self.flush()
+            if self._buffer:
+                await asyncio.sleep(0.05)
+
+
+history_writer = HistoryWriter(
+    max_buffer=settings.HISTORY_BUFFER_SIZE,
+    flush_size=settings.HISTORY_FLUSH_SIZE,
+    flush_interval=settings.HISTORY_FLUSH_INTERVAL
+)
@@ -0,0 +1,357 @@
+"""
+Lightweight Prometheus-style metrics.
+
+MetricsMiddleware starts a RequestTimer for every HTTP request and keeps it
+in a context variable (copied into executor threads). Engine route handlers
+are decorated with @operation(name), which labels the request and marks the
+end of the validate phase; the code below adds up the time spent in each
+phase of the request:
+
+    validate  request arrival until the handler starts (body read, JSON
+              decoding and model validation)
+    marshal   argument conversion for the native call (ctypes / arrays)
+    engine    time inside the native library
+    persist   queueing or committing the calculation history
+
+Phase times are summed per request and observed once when the response is
+complete, so a batch of many engine calls costs one histogram update per
+phase. Requests to routes without an operation are not recorded.
+
+render() produces the Prometheus text exposition format, including the
+counters reported by the executors, result cache, single-flight, history
+writer, live feed and engine reloads.
+"""
+import bisect
+import contextvars
+import functools
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.core.calculation_feed import calculation_feed
+from app.core.database import async_engine
+from app.core.executor import engine_executor
+from app.core.history_retention import history_compactor
+from app.core.history_writer import history_writer
+from app.core.process_backend import engine_process_pool
+from app.core.result_cache import result_cache
+from app.core.singleflight import engine_singleflight
+from app.engine_wrapper import get_reload_stats
+
+# Upper bounds in seconds; sized for microsecond native calls up to slow commits
+LATENCY_BUCKETS = (
+    0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monotonic counter with labels."""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    """Histogram with fixed buckets and labels."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+        # label values -> [per-bucket counts (last is +Inf), sum]
+        self._series: Dict[LabelValues, list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(values, list(series[0]), series[1]) for values, series in self._series.items()]
+        for values, counts, total in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labels, values)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(self.labels, values)} {cumulative}")
+        return lines
+
+
+requests_total = Counter(
+    "modelab_engine_requests_total",
+    "Engine API requests by operation and HTTP status.",
+    ("operation", "status")
+)
+request_errors_total = Counter(
+    "modelab_engine_request_errors_total",
+    "Engine API requests that ended with an HTTP error status (>= 400).",
+    ("operation",)
+)
+request_duration = Histogram(
+    "modelab_engine_request_duration_seconds",
+    "Engine API request latency, until the response body has been sent.",
+    ("operation",)
+)
+phase_duration = Histogram(
+    "modelab_engine_phase_duration_seconds",
+    "Time spent per request in each phase (validate, marshal, engine, persist).",
+    ("operation", "phase")
+)
+
+_METRICS = (requests_total, request_errors_total, request_duration, phase_duration)
+
+
+class RequestTimer:
+    """Per-request timing state shared between the middleware and handlers."""
+
+    __slots__ = ("started", "operation", "phases")
+
+    def __init__(self, started: float):
+        self.started = started
+        self.operation: Optional[str] = None
+        self.phases: Dict[str, float] = {}
+
+
+_current_request: contextvars.ContextVar[Optional[RequestTimer]] = contextvars.ContextVar(
+    "metrics_request", default=None
+)
+
+
+# Decorated route endpoints -> operation name, to label requests rejected
+# before the handler runs (e.g. 422 validation errors)
+_ROUTE_OPERATIONS: Dict[object, str] = {}
+
+
+def begin_operation(operation: str):
+    """Name the engine operation of the current request and record its validate phase."""
+    timer = _current_request.get()
+    if timer is None or timer.operation is not None:
+        return
+    timer.operation = operation
+    timer.phases["validate"] = time.perf_counter() - timer.started
+
+
+def observe_phase(phase: str, seconds: float):
+    """Add time spent in a phase to the current request."""
+    timer = _current_request.get()
+    if timer is not None and timer.operation is not None:
+        timer.phases[phase] = timer.phases.get(phase, 0.0) + seconds
+
+
+def operation(name: str):
+    """Decorator naming the engine operation of an async route handler."""
+    def decorate(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            begin_operation(name)
+            return await handler(*args, **kwargs)
+
+        _ROUTE_OPERATIONS[wrapper] = name
+        return wrapper
+
+    return decorate
+
+
+def is_recording() -> bool:
+    """Whether phase timings of the current call would be recorded."""
+    timer = _current_request.get()
+    return timer is not None and timer.operation is not None
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request (no per-request task)."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timer = RequestTimer(time.perf_counter())
+        token = _current_request.set(timer)
+        status_code = 500
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            _current_request.reset(token)
+            name = timer.operation or _ROUTE_OPERATIONS.get(getattr(scope.get("route"), "endpoint", None))
+            if name is not None:
+                elapsed = time.perf_counter() - timer.started
+                requests_total.inc(name, str(status_code))
+                if status_code >= 400:
+                    request_errors_total.inc(name)
+                request_duration.observe(elapsed, name)
+                for phase, seconds in timer.phases.items():
+                    phase_duration.observe(seconds, name, phase)
+
+
+def _gauge_lines(name: str, documentation: str, kind: str, samples: Iterable[Tuple[dict, float]]) -> List[str]:
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        if value is None:
+            continue
+        label_names = tuple(labels)
+        lines.append(f"{name}{_format_labels(label_names, tuple(labels[n] for n in label_names))} {_format_value(value)}")
+    return lines
+
+
+def _runtime_lines() -> List[str]:
+    """Counters kept by the engine, executors, cache and history writer."""
+    lines: List[str] = []
+    reload_stats = get_reload_stats()
+    lines += _gauge_lines(
+        "modelab_engine_library_version", "Version of the active engine library (1 = loaded at startup).",
+        "gauge", [({}, reload_stats["version"])]
+    )
+    lines += _gauge_lines(
+        "modelab_engine_library_info", "Fingerprint of the active engine library build.",
+        "gauge", [({"fingerprint": reload_stats["fingerprint"]}, 1)] if reload_stats["fingerprint"] else []
+    )
+    for key, documentation in (
+        ("reloads", "Successful engine library reloads."),
+        ("failures", "Failed engine library reloads."),
+        ("unloaded", "Replaced engine libraries unloaded after their last call."),
+    ):
+        lines += _gauge_lines(
+            f"modelab_engine_{key}_total", documentation, "counter", [({}, reload_stats[key])]
+        )
+
+    executors = [engine_executor.stats()]
+    lines += _gauge_lines(
+        "modelab_executor_in_flight", "Running plus queued tasks per executor.",
+        "gauge", [({"executor": s["name"]}, s["in_flight"]) for s in executors]
+    )
+    lines += _gauge_lines(
+        "modelab_executor_rejected_total", "Tasks rejected because the executor was saturated.",
+        "counter", [({"executor": s["name"]}, s["rejected"]) for s in executors]
+    )
+    pool = async_engine.pool
+    if hasattr(pool, "checkedout"):
+        lines += _gauge_lines(
+            "modelab_db_connections_in_use", "Database connections checked out of the async pool.",
+            "gauge", [({}, pool.checkedout())]
+        )
+
+    if result_cache is not None:
+        cache = result_cache.stats()
+        lines += _gauge_lines("modelab_result_cache_entries", "Entries in the in-process result cache.", "gauge", [({}, cache["entries"])])
+        lines += _gauge_lines("modelab_result_cache_bytes", "Memory held by the in-process result cache.", "gauge", [({}, cache["bytes"])])
+        for key in ("hits", "shared_hits", "misses", "evictions"):
+            lines += _gauge_lines(
+                f"modelab_result_cache_{key}_total", f"Result cache {key.replace('_', ' ')}.", "counter", [({}, cache[key])]
+            )
+
+    if engine_singleflight is not None:
+        singleflight = engine_singleflight.stats()
+        lines += _gauge_lines(
+            "modelab_singleflight_in_flight", "Distinct engine calls in flight that requests can join.",
+            "gauge", [({}, singleflight["in_flight"])]
+        )
+        lines += _gauge_lines(
+            "modelab_singleflight_coalesced_total", "Requests served by joining an identical engine call in flight.",
+            "counter", [({"operation": op}, n) for op, n in sorted(singleflight["coalesced_by_operation"].items())]
+        )
+
+    history = history_writer.stats()
+    lines += _gauge_lines("modelab_history_queued", "History rows waiting to be written.", "gauge", [({}, history["queued"])])
+    for key in ("flushed", "written_inline", "failed"):
+        lines += _gauge_lines(
+            f"modelab_history_{key}_total", f"History rows {key.replace('_', ' ')}.", "counter", [({}, history[key])]
+        )
+    compaction = history_compactor.stats()
+    for key in ("rolled_up", "truncated"):
+        lines += _gauge_lines(
+            f"modelab_history_{key}_total", f"History rows {key.replace('_', ' ')} by compaction.",
+            "counter", [({}, compaction[key])]
+        )
+    lines += _gauge_lines(
+        "modelab_history_compaction_failures_total", "Failed history compaction runs.",
+        "counter", [({}, compaction["failed_runs"])]
+    )
+
+    feed = calculation_feed.stats()
+    lines += _gauge_lines(
+        "modelab_live_feed_subscribers", "Open live calculation streams.", "gauge", [({}, feed["subscribers"])]
+    )
+    for key in ("delivered", "dropped"):
+        lines += _gauge_lines(
+            f"modelab_live_feed_{key}_total", f"Live feed rows {key} to subscribers.", "counter", [({}, feed[key])]
+        )
+
+    if engine_process_pool is not None:
+        pool = engine_process_pool.stats()
+        lines += _gauge_lines("modelab_engine_workers_idle", "Idle engine worker processes.", "gauge", [({}, pool["idle"])])
+        for key in ("crashes", "timeouts", "restarts"):
+            lines += _gauge_lines(
+                f"modelab_engine_worker_{key}_total", f"Engine worker process {key}.", "counter", [({}, pool[key])]
+            )
+    return lines
+
+
+def render() -> str:
+    """Render every metric in the Prometheus text exposition format."""
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines += metric.render()
+    lines += _runtime_lines()
+    return "\n".join(lines) + "\n"
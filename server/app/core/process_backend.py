@@ -0,0 +1,338 @@
+"""
+Process-pool backend for engine calls.
+
+With ENGINE_BACKEND=process every EngineWrapper call is sent to one of
+ENGINE_PROCESS_WORKERS worker processes, each with its own copy of the
+engine library. A native crash or a call exceeding ENGINE_CALL_TIMEOUT only
+costs that call: the worker is killed and replaced, and the other workers
+keep serving. CPU-heavy calls also no longer compete with request handling
+for the server process.
+
+Buffer arguments (array.array, memoryview, NumPy arrays) of at least
+ENGINE_SHM_MIN_BYTES are passed through shared memory instead of the pipe;
+buffers the engine writes to are copied back into the caller's object.
+"""
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import threading
+from multiprocessing import shared_memory
+from typing import Optional
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Positional arguments each wrapper method writes to (copied back to the caller)
+_OUTPUT_ARGUMENTS = {
+    "process_bytes": (0, 1),
+    "add_arrays": (2,),
+    "multiply_arrays": (2,),
+    "factorial_many": (1,),
+}
+
+
+class EngineWorkerError(RuntimeError):
+    """Raised when an engine worker process dies during a call."""
+
+
+class EngineCallTimeout(TimeoutError):
+    """Raised when an engine call exceeds ENGINE_CALL_TIMEOUT."""
+
+
+class _InlineBuffer:
+    """A small buffer argument sent through the pipe."""
+
+    def __init__(self, view: memoryview):
+        self.format = view.format
+        self.data = view.tobytes()
+
+    def open(self) -> memoryview:
+        return memoryview(bytearray(self.data)).cast("B").cast(self.format)
+
+
+class _SharedBuffer:
+    """A buffer argument placed in a shared memory block."""
+
+    def __init__(self, block: shared_memory.SharedMemory, view: memoryview):
+        self.name = block.name
+        self.format = view.format
+        self.nbytes = view.nbytes
+
+    def open(self):
+        block = shared_memory.SharedMemory(name=self.name)
+        return block, block.buf[:self.nbytes].cast("B").cast(self.format)
+
+
+class _ArgumentRef:
+    """Result that is one of the call's own buffer arguments (e.g. out)."""
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _buffer_view(value) -> Optional[memoryview]:
+    """Return a flat view of buffer-protocol arguments, None for other values."""
+    if isinstance(value, (bool, int, float, str, list, tuple, type(None))):
+        return None
+    try:
+        view = memoryview(value)
+    except TypeError:
+        return None
+    if view.ndim != 1 or not view.c_contiguous:
+        view = memoryview(view.tobytes()).cast("B").cast(view.format)
+    return view
+
+
+def _worker_main(connection):
+    """Worker process loop: load the engine, then serve calls until told to stop."""
+    # Ctrl+C is handled by the server, which stops the workers itself
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    from app.engine_wrapper import get_engine
+
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        method, args = request
+
+        blocks = []
+        opened = []
+        try:
+            for arg in args:
+                if isinstance(arg, _SharedBuffer):
+                    block, view = arg.open()
+                    blocks.append(block)
+                    opened.append(view)
+                elif isinstance(arg, _InlineBuffer):
+                    opened.append(arg.open())
+                else:
+                    opened.append(arg)
+            result = getattr(get_engine(), method)(*opened)
+            for index, value in enumerate(opened):
+                if result is value:
+                    result = _ArgumentRef(index)
+                    break
+            inline = [
+                opened[index].tobytes() if isinstance(args[index], _InlineBuffer) else None
+                for index in _OUTPUT_ARGUMENTS.get(method, ())
+                if index < len(args)
+            ]
+            reply = (True, result, inline)
+        except Exception as e:
+            reply = (False, f"{type(e).__name__}: {e}", None)
+        finally:
+            result = None
+            for view in opened:
+                if isinstance(view, memoryview):
+                    view.release()
+            opened = None
+            for block in blocks:
+                block.close()
+        connection.send(reply)
+
+
+class _Worker:
+    def __init__(self, context, generation: int):
+        self.generation = generation
+        self.connection, child_connection = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_connection,),
+            name="engine-worker",
+            daemon=True
+        )
+        self.process.start()
+        child_connection.close()
+
+    def stop(self, kill: bool = False):
+        if kill:
+            self.process.kill()
+        else:
+            try:
+                self.connection.send(None)
+            except (OSError, ValueError):
+                pass
+        self.process.join(timeout=5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.connection.close()
+
+
+class EngineProcessPool:
+    """
+    Fixed-size pool of engine worker processes.
+
+    call() blocks the calling thread (an engine executor thread) until a
+    worker is idle and has returned the result.
+    """
+
+    def __init__(self, workers: int, call_timeout: float, shm_min_bytes: int):
+        self.workers = workers
+        self.call_timeout = call_timeout
+        self.shm_min_bytes = shm_min_bytes
+        # spawn: forking a server process that runs threads is unsafe
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._started = False
+        self._calls = 0
+        self._crashes = 0
+        self._timeouts = 0
+        self._restarts = 0
+
+    def start(self):
+        """Start the worker processes."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+            generation = self._generation
+        for _ in range(self.workers):
+            self._idle.put(_Worker(self._context, generation))
+
+    def stop(self):
+        """Stop idle workers (call after the engine executor has drained)."""
+        with self._lock:
+            self._started = False
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            worker.stop()
+
+    def recycle(self):
+        """Replace every worker, e.g. so that they load a reloaded engine build."""
+        with self._lock:
+            self._generation += 1
+
+    def stats(self) -> dict:
+        """Return pool size and failure counters."""
+        with self._lock:
+            return {
+                "backend": "process",
+                "workers": self.workers,
+                "idle": self._idle.qsize(),
+                "calls": self._calls,
+                "crashes": self._crashes,
+                "timeouts": self._timeouts,
+                "restarts": self._restarts,
+            }
+
+    def _replace(self, worker: _Worker, kill: bool) -> _Worker:
+        worker.stop(kill=kill)
+        with self._lock:
+            self._restarts += 1
+            generation = self._generation
+        return _Worker(self._context, generation)
+
+    def _checkout(self) -> _Worker:
+        if not self._started:
+            raise RuntimeError("The engine process pool is not running")
+        worker = self._idle.get()
+        if worker.generation != self._generation or not worker.process.is_alive():
+            worker = self._replace(worker, kill=not worker.process.is_alive())
+        return worker
+
+    def _prepare(self, method: str, args: tuple):
+        """Convert buffer arguments into picklable inline or shared buffers."""
+        prepared = []
+        blocks = {}
+        try:
+            for index, arg in enumerate(args):
+                view = _buffer_view(arg)
+                if view is None:
+                    prepared.append(arg)
+                elif view.nbytes < self.shm_min_bytes:
+                    prepared.append(_InlineBuffer(view))
+                else:
+                    block = shared_memory.SharedMemory(create=True, size=view.nbytes)
+                    blocks[index] = block
+                    block.buf[:view.nbytes] = view.cast("B")
+                    prepared.append(_SharedBuffer(block, view))
+        except BaseException:
+            self._release(blocks)
+            raise
+        return prepared, blocks
+
+    @staticmethod
+    def _release(blocks: dict):
+        for block in blocks.values():
+            block.close()
+            block.unlink()
+
+    def _copy_back(self, method: str, args: tuple, blocks: dict, inline: list):
+        """Copy buffers written by the engine back into the caller's objects."""
+        indexes = [i for i in _OUTPUT_ARGUMENTS.get(method, ()) if i < len(args)]
+        for index, data in zip(indexes, inline):
+            try:
+                target = memoryview(args[index]).cast("B")
+            except TypeError:
+                continue  # Not a writable contiguous buffer
+            if target.readonly:
+                continue
+            if index in blocks:
+                target[:] = blocks[index].buf[:target.nbytes]
+            elif data is not None:
+                target[:] = data
+
+    def call(self, method: str, *args):
+        """Run EngineWrapper.<method>(*args) in a worker process."""
+        prepared, blocks = self._prepare(method, args)
+        try:
+            worker = self._checkout()
+            try:
+                worker.connection.send((method, prepared))
+                if not worker.connection.poll(self.call_timeout):
+                    with self._lock:
+                        self._timeouts += 1
+                    worker = self._replace(worker, kill=True)
+                    raise EngineCallTimeout(
+                        f"Engine call {method} exceeded {self.call_timeout}s"
+                    )
+                try:
+                    ok, result, inline = worker.connection.recv()
+                except (EOFError, OSError):
+                    worker.process.join(timeout=1)
+                    exitcode = worker.process.exitcode
+                    with self._lock:
+                        self._crashes += 1
+                    worker = self._replace(worker, kill=True)
+                    logger.error("Engine worker crashed during %s (exit code %s)", method, exitcode)
+                    raise EngineWorkerError(
+                        f"Engine worker crashed during {method} (exit code {exitcode})"
+                    )
+            finally:
+                self._idle.put(worker)
+
+            with self._lock:
+                self._calls += 1
+            if not ok:
+                raise RuntimeError(result)
+            self._copy_back(method, args, blocks, inline)
+            if isinstance(result, _ArgumentRef):
+                return args[result.index]
+            return result
+        finally:
+            self._release(blocks)
+
+
+def _create_process_pool() -> Optional[EngineProcessPool]:
+    if settings.ENGINE_BACKEND != "process":
+        return None
+    return EngineProcessPool(
+        workers=settings.ENGINE_PROCESS_WORKERS or os.cpu_count() or 1,
+        call_timeout=settings.ENGINE_CALL_TIMEOUT,
+        shm_min_bytes=settings.ENGINE_SHM_MIN_BYTES
+    )
+
+
+# None unless ENGINE_BACKEND is "process"
+engine_process_pool = _create_process_pool()
@@ -0,0 +1,286 @@
+"""
+Memoization of deterministic engine results.
+
+Keys combine the wrapper method name, a canonical hash of its arguments and
+the fingerprint of the loaded engine library, so results computed by an older
+library build are never returned after the library changes.
+"""
+import array
+import hashlib
+import json
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+from app.core.config import settings
+from app.engine_wrapper import get_engine_fingerprint
+
+_MISSING = object()
+
+
+def _argument_size(value) -> int:
+    """Approximate input size in bytes, used to skip caching huge inputs."""
+    if isinstance(value, (bool, int, float)):
+        return 8
+    if isinstance(value, str):
+        return len(value)
+    if isinstance(value, (list, tuple)):
+        return 8 * len(value)
+    return memoryview(value).nbytes
+
+
+def _hash_argument(digest, value):
+    if isinstance(value, (bool, int, float)):
+        digest.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        digest.update(b"str:%d:" % len(data))
+        digest.update(data)
+    else:
+        # Lists and float64 buffers hash identically so both share entries
+        if isinstance(value, (list, tuple)):
+            value = array.array("d", value)
+        view = memoryview(value)
+        digest.update(f"buf:{view.format}:{view.nbytes}:".encode())
+        digest.update(view if view.c_contiguous else view.tobytes())
+
+
+def make_cache_key(
+    method: str,
+    args: tuple,
+    max_input_bytes: int = settings.RESULT_CACHE_MAX_INPUT_BYTES
+) -> Optional[str]:
+    """
+    Build the cache key for an engine call.
+
+    Returns None when the call should not be cached (engine not loaded or
+    inputs larger than max_input_bytes, where hashing costs about as much as
+    recomputing).
+    """
+    fingerprint = get_engine_fingerprint()
+    if fingerprint is None:
+        return None
+    try:
+        if sum(_argument_size(arg) for arg in args) > max_input_bytes:
+            return None
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(f"{fingerprint}|{method}|".encode())
+        for arg in args:
+            _hash_argument(digest, arg)
+    except (TypeError, ValueError, OverflowError):
+        # Argument without a canonical form: do not cache
+        return None
+    return digest.hexdigest()
+
+
+def _entry_size(key: str, value) -> int:
+    """Memory held by a cache entry (results are scalars, str or bytes)."""
+    return sys.getsizeof(key) + sys.getsizeof(value)
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU bounded by entry count and total size, with per-entry TTL.
+
+    Entries larger than max_bytes on their own are not stored.
+    """
+
+    def __init__(self, max_entries: int, ttl: float, max_bytes: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        # key -> (expires_at, value, size)
+        self._entries: OrderedDict[str, Tuple[float, Any, int]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return _MISSING
+            expires_at, value, size = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.bytes -= size
+                return _MISSING
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value):
+        size = _entry_size(key, value)
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= previous[2]
+            if size > self.max_bytes:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl, value, size)
+            self.bytes += size
+            while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+
+class SQLiteCacheBackend:
+    """
+    Cache table in a local SQLite file shared by all workers on a host.
+
+    Values are stored as JSON, which covers every engine result type.
+    Every purge_every writes, expired entries are deleted and the table is
+    trimmed to max_entries, oldest entries first.
+    """
+
+    def __init__(self, path: str, ttl: float, max_entries: int, purge_every: int = 1_000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_every = purge_every
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=OFF")
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS engine_result_cache ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_engine_result_cache_expires_at ON engine_result_cache (expires_at)"
+        )
+        self.purge_expired()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value FROM engine_result_cache WHERE key = ? AND expires_at >= ?",
+                (key, time.time())
+            ).fetchone()
+        return _MISSING if row is None else json.loads(row[0])
+
+    def set(self, key: str, value):
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO engine_result_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, json.dumps(value), time.time() + self.ttl)
+            )
+            self._writes += 1
+            purge = self._writes % self.purge_every == 0
+        if purge:
+            self.purge_expired()
+
+    def clear(self):
+        with self._lock:
+            self._connection.execute("DELETE FROM engine_result_cache")
+
+    def purge_expired(self):
+        """Delete expired entries, then the oldest ones beyond max_entries."""
+        with self._lock:
+            self._connection.execute(
+                "DELETE FROM engine_result_cache WHERE expires_at < ?", (time.time(),)
+            )
+            # Every entry has the same TTL, so the earliest expiry is the oldest write
+            self._connection.execute(
+                "DELETE FROM engine_result_cache WHERE key IN ("
+                "SELECT key FROM engine_result_cache ORDER BY expires_at "
+                "LIMIT max((SELECT count(*) FROM engine_result_cache) - ?, 0))",
+                (self.max_entries,)
+            )
+
+
+class ResultCache:
+    """
+    Two-level result cache: in-process LRU, optionally backed by a shared store.
+    """
+
+    def __init__(self, memory: MemoryCacheBackend, shared: Optional[SQLiteCacheBackend] = None):
+        self.memory = memory
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, method: str, args: tuple, compute: Callable[[], Any]):
+        """Return the cached result for method(*args), computing it on a miss."""
+        key = make_cache_key(method, args)
+        if key is None:
+            return compute()
+
+        value = self.memory.get(key)
+        if value is not _MISSING:
+            with self._lock:
+                self.hits += 1
+            return value
+
+        if self.shared is not None:
+            value = self.shared.get(key)
+            if value is not _MISSING:
+                self.memory.set(key, value)
+                with self._lock:
+                    self.hits += 1
+                    self.shared_hits += 1
+                return value
+
+        with self._lock:
+            self.misses += 1
+        value = compute()
+        self.memory.set(key, value)
+        if self.shared is not None:
+            self.shared.set(key, value)
+        return value
+
+    def clear(self):
+        """Drop every cached result (e.g. after the engine library is reloaded)."""
+        self.memory.clear()
+        if self.shared is not None:
+            self.shared.clear()
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": len(self.memory),
+                "max_entries": self.memory.max_entries,
+                "bytes": self.memory.bytes,
+                "max_bytes": self.memory.max_bytes,
+                "shared": self.shared is not None,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.memory.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+def _create_result_cache() -> Optional[ResultCache]:
+    if not settings.RESULT_CACHE_ENABLED:
+        return None
+    shared = None
+    if settings.RESULT_CACHE_SHARED_PATH:
+        shared = SQLiteCacheBackend(
+            settings.RESULT_CACHE_SHARED_PATH, settings.RESULT_CACHE_TTL, settings.RESULT_CACHE_SHARED_MAX_ENTRIES
+        )
+    return ResultCache(
+        MemoryCacheBackend(
+            settings.RESULT_CACHE_MAX_ENTRIES, settings.RESULT_CACHE_TTL, settings.RESULT_CACHE_MAX_BYTES
+        ),
+        shared
+    )
+
+
+# None when RESULT_CACHE_ENABLED is false
+result_cache = _create_result_cache()
@@ -0,0 +1,97 @@
+"""
+Coalescing of concurrent identical engine calls (single-flight).
+
+When several requests ask for the same engine call while it is running,
+only the first one (the leader) submits it to the engine executor; the
+others await the leader's result instead of computing it again. The call
+runs as a task of its own, so a leader whose client disconnects does not
+cancel it for the requests waiting on it. Errors are shared the same way.
+
+Calls are identified by a key function. The default keys an engine call by
+wrapper method, canonical argument hash and engine build, like the result
+cache, so JSON and binary sum-array requests for the same numbers coalesce.
+Only calls in flight at the same time are shared; nothing is kept after the
+call completes (that is the result cache's job).
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from app.core.config import settings
+from app.core.result_cache import make_cache_key
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time and shares its outcome with every
+    concurrent caller of the same key.
+
+    key(method, args) returns the coalescing key of a call, or None to run
+    the call on its own. operations limits coalescing to those operation
+    types (empty = all).
+    """
+
+    def __init__(
+        self,
+        key: Callable[[str, tuple], Optional[str]],
+        operations: Iterable[str] = ()
+    ):
+        self.key = key
+        self.operations = frozenset(operations)
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._leaders = 0
+        self._coalesced = 0
+        self._coalesced_by_operation: Dict[str, int] = {}
+
+    def stats(self) -> dict:
+        """Return in-flight keys and coalescing counters."""
+        return {
+            "enabled": True,
+            "operations": sorted(self.operations),
+            "in_flight": len(self._in_flight),
+            "leaders": self._leaders,
+            "coalesced": self._coalesced,
+            "coalesced_by_operation": dict(self._coalesced_by_operation),
+        }
+
+    async def run(
+        self,
+        operation_type: str,
+        method: str,
+        args: tuple,
+        call: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Return call()'s result, sharing it with identical calls already in flight."""
+        key = None
+        if not self.operations or operation_type in self.operations:
+            key = self.key(method, args)
+        if key is None:
+            return await call()
+
+        future = self._in_flight.get(key)
+        if future is not None:
+            self._coalesced += 1
+            self._coalesced_by_operation[operation_type] = self._coalesced_by_operation.get(operation_type, 0) + 1
+            # shield: a follower leaving must not cancel the shared call
+            return await asyncio.shield(future)
+
+        future = asyncio.ensure_future(call())
+        self._in_flight[key] = future
+        self._leaders += 1
+        future.add_done_callback(lambda done: self._finish(key, done))
+        return await asyncio.shield(future)
+
+    def _finish(self, key: str, future: asyncio.Future):
+        if self._in_flight.get(key) is future:
+            del self._in_flight[key]
+        if not future.cancelled():
+            # Mark the exception as retrieved in case every caller has left
+            future.exception()
+
+
+def _engine_call_key(method: str, args: tuple) -> Optional[str]:
+    return make_cache_key(method, args, settings.SINGLEFLIGHT_MAX_INPUT_BYTES)
+
+
+# None when SINGLEFLIGHT_ENABLED is false
+engine_singleflight = (
+    SingleFlight(_engine_call_key, settings.SINGLEFLIGHT_OPERATIONS) if settings.SINGLEFLIGHT_ENABLED else None
+)
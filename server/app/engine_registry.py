@@ -0,0 +1,212 @@
+"""
+Declarative registry of engine functions and the operations built on them.
+
+Adding an engine function takes its declaration in engine.h, its
+implementation in engine.cpp and entries in this module:
+
+- NATIVE_FUNCTIONS declares the C signature of every exported function.
+  EngineWrapper sets the ctypes argtypes/restype from it and checks a
+  reloaded build for all of its symbols (REQUIRED_SYMBOLS). Functions
+  declared with params (scalar arguments only) also get a generated
+  EngineWrapper method; functions taking buffers are wrapped by hand.
+  vectorized_by names an array entry point computing the function
+  element-wise over int32 columns, which POST /engine/batch uses for
+  groups of such calls.
+- OPERATIONS declares the engine operations served over HTTP. Each gets a
+  generated Pydantic request model and a POST /engine/{name} route (unless
+  the router defines one by hand), and is accepted by POST /engine/batch.
+  Generated routes run through the same path as the hand-written ones:
+  engine executor, result cache, single-flight, metrics and history.
+"""
+import ctypes
+import inspect
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Type, Union
+from pydantic import BaseModel, create_model
+from app.core.config import settings
+
+# Summation methods accepted by sum_array (ENGINE_SUM_* in engine.h)
+SUM_METHODS = {
+    "naive": 0,
+    "kahan": 1,
+    "pairwise": 2,
+}
+
+# Engine downsample() methods (ENGINE_DOWNSAMPLE_* in engine.h)
+DOWNSAMPLE_METHODS = {
+    "lttb": 0,
+    "minmax": 1,
+}
+
+_char_p = ctypes.POINTER(ctypes.c_char)
+_int_p = ctypes.POINTER(ctypes.c_int)
+_longlong_p = ctypes.POINTER(ctypes.c_longlong)
+_double_p = ctypes.POINTER(ctypes.c_double)
+
+
+@dataclass(frozen=True)
+class NativeFunction:
+    """C signature of a function exported by the engine library."""
+    name: str
+    restype: Any
+    argtypes: Tuple[Any, ...]
+    # Argument names of a generated EngineWrapper method (empty = wrapped by hand)
+    params: Tuple[str, ...] = ()
+    doc: str = ""
+    # Array entry point computing this function element-wise (int32 in, same-order out)
+    vectorized_by: Optional[str] = None
+
+
+NATIVE_FUNCTIONS: Tuple[NativeFunction, ...] = (
+    NativeFunction(
+        "add", ctypes.c_int, (ctypes.c_int, ctypes.c_int),
+        params=("a", "b"), doc="Add two numbers.", vectorized_by="add_arrays"
+    ),
+    NativeFunction(
+        "multiply", ctypes.c_int, (ctypes.c_int, ctypes.c_int),
+        params=("a", "b"), doc="Multiply two numbers.", vectorized_by="multiply_arrays"
+    ),
+    NativeFunction(
+        "factorial", ctypes.c_int64, (ctypes.c_int,),
+        params=("n",), doc="Calculate factorial (0 <= n <= 20, returns -1 otherwise).",
+        vectorized_by="factorial_many"
+    ),
+    NativeFunction("factorial_big", ctypes.c_int, (ctypes.c_int, _char_p, ctypes.c_int)),
+    NativeFunction("process_string", ctypes.c_int, (ctypes.c_char_p, _char_p, ctypes.c_int)),
+    NativeFunction("process_bytes", ctypes.c_longlong, (ctypes.c_char_p, _char_p, ctypes.c_longlong)),
+    NativeFunction("sum_array", ctypes.c_double, (_double_p, ctypes.c_int)),
+    NativeFunction("sum_array_ex", ctypes.c_double, (_double_p, ctypes.c_longlong, ctypes.c_int, ctypes.c_int)),
+    NativeFunction("add_arrays", ctypes.c_int, (_int_p, _int_p, _int_p, ctypes.c_int)),
+    NativeFunction("multiply_arrays", ctypes.c_int, (_int_p, _int_p, _int_p, ctypes.c_int)),
+    NativeFunction("factorial_many", ctypes.c_int, (_int_p, _longlong_p, ctypes.c_int)),
+    NativeFunction(
+        "downsample", ctypes.c_longlong,
+        (_double_p, _double_p, ctypes.c_longlong, ctypes.c_longlong, ctypes.c_int, _longlong_p)
+    ),
+)
+
+# Functions every engine build must export; checked before a reloaded build is used
+REQUIRED_SYMBOLS = tuple(function.name for function in NATIVE_FUNCTIONS)
+
+# Scalar wrapper method -> array entry point, used to vectorize batches
+VECTORIZED_METHODS = {
+    function.name: function.vectorized_by for function in NATIVE_FUNCTIONS if function.vectorized_by
+}
+
+
+def wrapper_method(function: NativeFunction, call: Callable) -> Callable:
+    """
+    Build the EngineWrapper method of a function declared with params.
+
+    call(native_function, *args) performs the timed native call; ctypes
+    checks the arguments against the declared argtypes. Keyword arguments
+    are bound to the declared params, so engine.add(a=1, b=2) works as
+    with a hand-written method.
+    """
+    name = function.name
+    signature = inspect.Signature([
+        inspect.Parameter(param, inspect.Parameter.POSITIONAL_OR_KEYWORD) for param in ("self", *function.params)
+    ])
+
+    def method(self, *args, **kwargs):
+        if kwargs:
+            args = signature.bind(self, *args, **kwargs).args[1:]
+        return call(getattr(self.lib, name), *args)
+
+    method.__name__ = name
+    method.__qualname__ = f"EngineWrapper.{name}"
+    method.__doc__ = function.doc
+    # Shown by help() and the IDE instead of (self, *args, **kwargs)
+    method.__signature__ = signature
+    return method
+
+
+# Largest n whose factorial fits the engine's long long lookup table
+_FACTORIAL_TABLE_MAX = 20
+
+
+def factorial_error(request) -> Optional[str]:
+    """Return the validation error for a factorial argument, if any."""
+    if request.n < 0:
+        return "Factorial is not defined for negative numbers"
+    if request.n > settings.FACTORIAL_MAX_N:
+        return f"Factorial is limited to n <= {settings.FACTORIAL_MAX_N}"
+    return None
+
+
+def factorial_method(request) -> str:
+    """
+    Pick the wrapper method for n!: the O(1) table up to 20, arbitrary
+    precision (returned as a decimal string) above.
+    """
+    return "factorial" if request.n <= _FACTORIAL_TABLE_MAX else "factorial_big"
+
+
+@dataclass
+class Operation:
+    """An engine operation served over HTTP and recorded in the history as name."""
+    name: str
+    # EngineWrapper method, or a function choosing it from the request
+    method: Union[str, Callable[[BaseModel], str]]
+    # Request fields in EngineWrapper argument order: name -> type or (type, default)
+    params: Dict[str, Any]
+    message: Callable[[BaseModel], str]
+    description: str
+    # Validation beyond the field types; returns an error message or None
+    check: Optional[Callable[[BaseModel], Optional[str]]] = None
+    # False when the router defines POST /{name} by hand (e.g. for binary bodies)
+    generate_route: bool = True
+    # Name of the route handler, which is also its OpenAPI operationId
+    endpoint: Optional[str] = None
+    request: Type[BaseModel] = field(init=False, repr=False)
+
+    def __post_init__(self):
+        if self.endpoint is None:
+            self.endpoint = self.name.replace("-", "_")
+        model_name = "".join(part.capitalize() for part in self.name.split("-")) + "Request"
+        self.request = create_model(model_name, **{
+            param: spec if isinstance(spec, tuple) else (spec, ...) for param, spec in self.params.items()
+        })
+
+    def method_for(self, request: BaseModel) -> str:
+        return self.method if isinstance(self.method, str) else self.method(request)
+
+    def arguments(self, request: BaseModel) -> tuple:
+        return tuple(getattr(request, param) for param in self.params)
+
+
+_OPERATION_LIST = (
+    Operation(
+        "add", "add", {"a": int, "b": int},
+        message=lambda r: f"Successfully added {r.a} + {r.b}",
+        description="Add two numbers using C++ engine.",
+        endpoint="add_numbers"
+    ),
+    Operation(
+        "multiply", "multiply", {"a": int, "b": int},
+        message=lambda r: f"Successfully multiplied {r.a} * {r.b}",
+        description="Multiply two numbers using C++ engine.",
+        endpoint="multiply_numbers"
+    ),
+    Operation(
+        "factorial", factorial_method, {"n": int},
+        message=lambda r: f"Successfully calculated factorial of {r.n}",
+        description="Calculate factorial using C++ engine.",
+        check=factorial_error,
+        endpoint="calculate_factorial"
+    ),
+    Operation(
+        "process-string", "process_string", {"text": str},
+        message=lambda r: "Successfully processed string",
+        description="Process string (convert to uppercase) using C++ engine."
+    ),
+    Operation(
+        "sum-array", "sum_array",
+        {"numbers": List[float], "method": (Literal[tuple(SUM_METHODS)], "naive")},
+        message=lambda r: f"Successfully summed {len(r.numbers)} numbers",
+        description="Sum array of numbers using C++ engine.",
+        generate_route=False
+    ),
+)
+
+OPERATIONS: Dict[str, Operation] = {operation.name: operation for operation in _OPERATION_LIST}
@@ -1,10 +1,37 @@
 """
 Python wrapper for C++ engine library using ctypes.
 """
+import _ctypes
+import array
 import ctypes
+import itertools
+import logging
+import math
+import mmap
 import os
+import shutil
 import sys
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from pathlib import Path
+from typing import Iterator, Optional
+from app.core.config import settings
+from app.engine_registry import (
+    DOWNSAMPLE_METHODS,
+    NATIVE_FUNCTIONS,
+    REQUIRED_SYMBOLS,
+    SUM_METHODS,
+    wrapper_method,
+)
+
+logger = logging.getLogger(__name__)
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; array.array and lists still work
+    np = None
 
 # Determine the library path based on the OS
 def get_library_path():
@@ -86,104 +113,588 @@ def load_engine_library():
         raise OSError(f"Failed to load engine library at {lib_path_str}: {e}")
 
 
+# Buffer format characters accepted for each ctypes element type
+_SIGNED_INT_FORMATS = "bhilqn"
+_FLOAT_FORMATS = "fd"
+
+
+def _buffer_matches(view: memoryview, ctype) -> bool:
+    """Check that a buffer holds native, C-contiguous elements of ctype."""
+    fmt = view.format
+    if fmt[:1] in "@=":
+        fmt = fmt[1:]
+    elif fmt[:1] == "<" and sys.byteorder == "little":
+        fmt = fmt[1:]
+    if len(fmt) != 1 or not view.c_contiguous:
+        return False
+    kinds = _FLOAT_FORMATS if ctype in (ctypes.c_double, ctypes.c_float) else _SIGNED_INT_FORMATS
+    return fmt in kinds and view.itemsize == ctypes.sizeof(ctype)
+
+
+# Untyped byte containers whose contents may be reinterpreted as engine elements
+_RAW_BYTE_TYPES = (bytes, bytearray, mmap.mmap)
+
+
+def _is_raw_bytes(data) -> bool:
+    """
+    Whether data is an untyped byte buffer (or a memoryview of one).
+
+    Typed 1-byte buffers (array.array('b'/'B'), cast memoryviews) hold
+    numbers, not machine words, and are converted element by element.
+    """
+    if isinstance(data, memoryview):
+        if data.format not in ("B", "c"):
+            return False
+        data = data.obj
+    return isinstance(data, _RAW_BYTE_TYPES)
+
+
+# array/struct typecodes for the ctypes element types used by the engine
+_TYPECODES = {
+    ctypes.c_int: "i",
+    ctypes.c_longlong: "q",
+    ctypes.c_double: "d",
+}
+
+
+def _as_c_array(data, ctype):
+    """
+    Expose data as a pointer to contiguous ctype elements.
+
+    Zero-copy for NumPy arrays and any buffer-protocol object (array.array,
+    memoryview, bytearray, mmap, ...) holding native ctype elements; untyped
+    byte buffers (bytes, bytearray, mmap) are reinterpreted as ctype
+    elements, while typed 8-bit arrays are converted value by value. Read-only buffers are only
+    copied when NumPy is unavailable. Plain sequences are converted through
+    array.array. Returns (pointer, length, keepalive) where keepalive must
+    stay referenced until the native call returns.
+
+    ctypes arrays are returned as-is rather than through ctypes.cast: they
+    are accepted for POINTER(ctype) arguments, and cast() creates a reference
+    cycle that would keep the source buffer exported (e.g. a bytearray
+    locked against resizing) until the garbage collector runs.
+    """
+    pointer_type = ctypes.POINTER(ctype)
+    typecode = _TYPECODES[ctype]
+    
+    if np is not None and isinstance(data, np.ndarray):
+        arr = np.ascontiguousarray(data, dtype=np.dtype(ctype)).reshape(-1)
+        return arr.ctypes.data_as(pointer_type), arr.size, arr
+    
+    try:
+        view = memoryview(data)
+    except TypeError:
+        view = None
+    
+    if view is not None:
+        if (
+            _is_raw_bytes(data)
+            and view.c_contiguous
+            and view.nbytes % ctypes.sizeof(ctype) == 0
+        ):
+            # Raw bytes (e.g. an mmap of a binary file): reinterpret in place
+            view = view.cast("B").cast(typecode)
+        if _buffer_matches(view, ctype):
+            length = view.nbytes // ctypes.sizeof(ctype)
+            if not view.readonly:
+                c_array = (ctype * length).from_buffer(view)
+                return c_array, length, c_array
+            if np is not None:
+                arr = np.frombuffer(view, dtype=np.dtype(ctype))
+                return arr.ctypes.data_as(pointer_type), length, arr
+            c_array = (ctype * length).from_buffer_copy(view)
+            return c_array, length, c_array
+    
+    # array.array converts a list in C, much faster than ctype_array(*values)
+    converted = array.array(typecode, data)
+    c_array = (ctype * len(converted)).from_buffer(converted)
+    return c_array, len(converted), c_array
+
+
+def _as_output_pointer(out, ctype, length: int):
+    """
+    Expose a caller-provided output buffer as a pointer without copying.
+
+    Returns (pointer, keepalive). Raises ValueError unless out is a writable,
+    contiguous buffer of exactly length ctype elements.
+    """
+    try:
+        view = memoryview(out)
+    except TypeError:
+        view = None
+    if (
+        view is None
+        or view.readonly
+        or not _buffer_matches(view, ctype)
+        or view.nbytes != length * ctypes.sizeof(ctype)
+    ):
+        raise ValueError(
+            f"out must be a writable buffer of {length} {ctype.__name__} elements"
+        )
+    c_array = (ctype * length).from_buffer(view)
+    return c_array, c_array
+
+
+def _as_char_buffer(data):
+    """
+    Expose a bytes-like object as a char pointer for the engine.
+
+    bytes objects and writable buffers are passed without copying; other
+    read-only buffers are copied. Returns (pointer_or_bytes, length, keepalive).
+    """
+    if isinstance(data, bytes):
+        return data, len(data), data
+    view = memoryview(data).cast("B")
+    if view.readonly:
+        copy = bytes(view)
+        return copy, len(copy), copy
+    c_array = (ctypes.c_char * view.nbytes).from_buffer(view)
+    return c_array, view.nbytes, c_array
+
+
+def _new_output_array(like, ctype, typecode: str, length: int):
+    """Allocate an output array of the same flavour as the input (NumPy or array.array)."""
+    if np is not None and isinstance(like, np.ndarray):
+        return np.empty(length, dtype=np.dtype(ctype))
+    return array.array(typecode, bytes(length * ctypes.sizeof(ctype)))
+
+
+class _NativeClock(threading.local):
+    seconds = 0.0
+
+
+_native_clock = _NativeClock()
+
+
+def native_seconds() -> float:
+    """Total time the calling thread has spent inside engine library functions."""
+    return _native_clock.seconds
+
+
+def _native(function, *args):
+    """Call a library function, adding its duration to the thread's native clock."""
+    started = time.perf_counter()
+    try:
+        return function(*args)
+    finally:
+        _native_clock.seconds += time.perf_counter() - started
+
+
+class _ThreadLocalBufferPool:
+    """
+    One reusable output buffer per thread for string processing.
+
+    Each engine executor thread keeps its buffer (and the ctypes view over
+    it) between calls, so small requests do not allocate a new output
+    buffer every time. Buffers grow in powers of two; requests larger than
+    max_bytes get a one-off buffer that is not retained.
+    """
+
+    class _Local(threading.local):
+        buffer = bytearray()
+        entry = (buffer, (ctypes.c_char * 0).from_buffer(buffer))
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._local = self._Local()
+
+    def get(self, size: int):
+        """Return (bytearray, ctypes char array) of at least size bytes."""
+        entry = self._local.entry
+        if size <= len(entry[0]):
+            return entry
+        capacity = 1 << (max(size, 1) - 1).bit_length()
+        buffer = bytearray(max(capacity, 64))
+        entry = (buffer, (ctypes.c_char * len(buffer)).from_buffer(buffer))
+        if len(buffer) <= self.max_bytes:
+            self._local.entry = entry
+        return entry
+
+
+def _library_fingerprint(lib_path: str) -> str:
+    """Identify a library build by path, size and modification time."""
+    stat = os.stat(lib_path)
+    return f"{lib_path}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
 # Load the library
 try:
     _engine_lib = load_engine_library()
+    _engine_fingerprint = _library_fingerprint(_engine_lib._name)
+    _load_error = None
 except (FileNotFoundError, OSError) as e:
     _engine_lib = None
+    _engine_fingerprint = None
     _load_error = str(e)
 
 
+class EngineReloadError(RuntimeError):
+    """Raised when a new engine build cannot be loaded."""
+
+
 class EngineWrapper:
     """Wrapper class for C++ engine functions."""
     
-    def __init__(self):
-        if _engine_lib is None:
-            raise RuntimeError(f"Cannot initialize EngineWrapper: {_load_error}")
-        self.lib = _engine_lib
+    def __init__(self, lib: Optional[ctypes.CDLL] = None, version: int = 1):
+        if lib is None:
+            if _engine_lib is None:
+                raise RuntimeError(f"Cannot initialize EngineWrapper: {_load_error}")
+            lib = _engine_lib
+        self.lib = lib
+        self.version = version
+        # Calls in progress (see engine_lease); a retired wrapper is unloaded at zero
+        self._leases = 0
+        self._retired = False
+        self._output_pool = _ThreadLocalBufferPool(settings.PROCESS_STRING_POOL_MAX_BYTES)
         self._setup_functions()
     
     def _setup_functions(self):
-        """Setup function signatures for ctypes."""
-        # int add(int a, int b)
-        self.lib.add.argtypes = [ctypes.c_int, ctypes.c_int]
-        self.lib.add.restype = ctypes.c_int
-        
-        # int multiply(int a, int b)
-        self.lib.multiply.argtypes = [ctypes.c_int, ctypes.c_int]
-        self.lib.multiply.restype = ctypes.c_int
+        """Set the ctypes signature of every function in the registry (NATIVE_FUNCTIONS)."""
+        for function in NATIVE_FUNCTIONS:
+            native = getattr(self.lib, function.name)
+            native.argtypes = list(function.argtypes)
+            native.restype = function.restype
+    
+    def factorial_big(self, n: int) -> str:
+        """Calculate factorial with arbitrary precision, as a decimal string."""
+        if n < 0:
+            raise ValueError("Factorial is not defined for negative numbers")
         
-        # long long factorial(int n)
-        self.lib.factorial.argtypes = [ctypes.c_int]
-        self.lib.factorial.restype = ctypes.c_int64
+        # n! has floor(log10(n!)) + 1 digits; leave headroom for rounding
+        digits = int(math.lgamma(n + 1) / math.log(10)) + 1
+        output_size = digits + 16
+        output_buffer = ctypes.create_string_buffer(output_size)
         
-        # int process_string(const char* input, char* output, int output_size)
-        self.lib.process_string.argtypes = [
-            ctypes.c_char_p,
-            ctypes.POINTER(ctypes.c_char),
-            ctypes.c_int
-        ]
-        self.lib.process_string.restype = ctypes.c_int
+        length = _native(self.lib.factorial_big, n, output_buffer, output_size)
+        if length < 0:
+            raise RuntimeError("Factorial calculation failed")
         
-        # double sum_array(double* array, int size)
-        self.lib.sum_array.argtypes = [
-            ctypes.POINTER(ctypes.c_double),
-            ctypes.c_int
-        ]
-        self.lib.sum_array.restype = ctypes.c_double
-    
-    def add(self, a: int, b: int) -> int:
-        """Add two numbers."""
-        return self.lib.add(a, b)
-    
-    def multiply(self, a: int, b: int) -> int:
-        """Multiply two numbers."""
-        return self.lib.multiply(a, b)
-    
-    def factorial(self, n: int) -> int:
-        """Calculate factorial."""
-        return self.lib.factorial(n)
+        return output_buffer.raw[:length].decode('ascii')
     
     def process_string(self, input_str: str) -> str:
-        """Process string (convert to uppercase)."""
+        """
+        Process string (convert to uppercase).
+
+        The result is written to a per-thread output buffer that is reused
+        between calls instead of allocating a new one each time.
+        """
         input_bytes = input_str.encode('utf-8')
-        output_size = len(input_bytes) + 1
-        output_buffer = (ctypes.c_char * output_size)()
+        output_buffer, output_array = self._output_pool.get(len(input_bytes))
         
-        result = self.lib.process_string(
-            input_bytes,
-            output_buffer,
-            output_size
-        )
+        result = _native(self.lib.process_bytes, input_bytes, output_array, len(input_bytes))
         
         if result < 0:
             raise RuntimeError("String processing failed")
         
-        return output_buffer.value.decode('utf-8')
+        return output_buffer[:result].decode('utf-8')
+    
+    def process_bytes(self, data, out=None) -> int:
+        """
+        Uppercase the ASCII letters of a bytes-like object into out.
+
+        out must be a writable buffer (bytearray, memoryview, ...) of at least
+        len(data) bytes; without out, data itself is converted in place and
+        must be writable. Non-ASCII bytes are copied unchanged, so UTF-8 text
+        can be processed in chunks split at any offset. Returns the number of
+        bytes written.
+        """
+        if out is None:
+            out = data
+        input_arg, length, input_keep = _as_char_buffer(data)
+        view = memoryview(out).cast("B")
+        if view.readonly or view.nbytes < length:
+            raise ValueError(f"out must be a writable buffer of at least {length} bytes")
+        output_buffer = (ctypes.c_char * view.nbytes).from_buffer(view)
+        
+        result = _native(self.lib.process_bytes, input_arg, output_buffer, length)
+        if result < 0:
+            raise RuntimeError("String processing failed")
+        return result
     
-    def sum_array(self, numbers: list[float]) -> float:
-        """Sum array of numbers."""
-        if not numbers:
+    def sum_array(self, numbers, method: str = "naive", threads: Optional[int] = None) -> float:
+        """
+        Sum array of numbers.
+
+        Accepts a list of floats or any float64 buffer (NumPy array,
+        array('d'), memoryview, mmap); buffers are passed without copying.
+        method is "naive" (fastest), "kahan" (compensated, most accurate) or
+        "pairwise". threads=None runs arrays shorter than
+        SUM_PARALLEL_THRESHOLD on the calling thread and larger ones on up to
+        SUM_MAX_THREADS threads (0 = all cores).
+        """
+        if method not in SUM_METHODS:
+            raise ValueError(f"Unknown summation method: {method}")
+        
+        pointer, length, keepalive = _as_c_array(numbers, ctypes.c_double)
+        if length == 0:
             return 0.0
         
-        array_type = ctypes.c_double * len(numbers)
-        array = array_type(*numbers)
+        if threads is None:
+            threads = 1 if length < settings.SUM_PARALLEL_THRESHOLD else settings.SUM_MAX_THREADS
+        
+        return _native(self.lib.sum_array_ex, pointer, length, SUM_METHODS[method], threads)
+    
+    def _binary_int_op(self, function, a, b, out):
+        a_ptr, a_len, a_keep = _as_c_array(a, ctypes.c_int)
+        b_ptr, b_len, b_keep = _as_c_array(b, ctypes.c_int)
+        if a_len != b_len:
+            raise ValueError(f"Array lengths differ: {a_len} != {b_len}")
+        if out is None:
+            out = _new_output_array(a, ctypes.c_int, "i", a_len)
+        out_ptr, out_keep = _as_output_pointer(out, ctypes.c_int, a_len)
         
-        return self.lib.sum_array(array, len(numbers))
+        if _native(function, a_ptr, b_ptr, out_ptr, a_len) < 0:
+            raise RuntimeError("Array operation failed")
+        return out
+    
+    def add_arrays(self, a, b, out=None):
+        """
+        Add two int32 arrays element by element.
+
+        Accepts NumPy arrays, array.array('i') or any sequence of ints.
+        Returns out, or a new array of the same flavour as a.
+        """
+        return self._binary_int_op(self.lib.add_arrays, a, b, out)
+    
+    def multiply_arrays(self, a, b, out=None):
+        """
+        Multiply two int32 arrays element by element.
+
+        Accepts NumPy arrays, array.array('i') or any sequence of ints.
+        Returns out, or a new array of the same flavour as a.
+        """
+        return self._binary_int_op(self.lib.multiply_arrays, a, b, out)
+    
+    def factorial_many(self, n, out=None):
+        """
+        Calculate the factorial of every element of an int32 array.
+
+        Returns out, or a new int64 array of the same flavour as n.
+        Negative elements produce -1.
+        """
+        n_ptr, n_len, n_keep = _as_c_array(n, ctypes.c_int)
+        if out is None:
+            out = _new_output_array(n, ctypes.c_longlong, "q", n_len)
+        out_ptr, out_keep = _as_output_pointer(out, ctypes.c_longlong, n_len)
+        
+        if _native(self.lib.factorial_many, n_ptr, out_ptr, n_len) < 0:
+            raise RuntimeError("Array operation failed")
+        return out
+    
+    def downsample(self, x, y, threshold: int, method: str = "lttb"):
+        """
+        Select at most threshold points that represent the (x, y) series.
+
+        x must be sorted ascending. Accepts float64 buffers or sequences like
+        sum_array. Returns the indices of the kept points in ascending order,
+        as an int64 array of the same flavour as x. method is "lttb" (keeps
+        the visual shape) or "minmax" (keeps every bucket's extremes).
+        """
+        if method not in DOWNSAMPLE_METHODS:
+            raise ValueError(f"Unknown downsampling method: {method}")
+        if threshold < 2:
+            raise ValueError("threshold must be at least 2")
+        x_ptr, x_len, x_keep = _as_c_array(x, ctypes.c_double)
+        y_ptr, y_len, y_keep = _as_c_array(y, ctypes.c_double)
+        if x_len != y_len:
+            raise ValueError(f"Array lengths differ: {x_len} != {y_len}")
+        capacity = min(threshold, x_len)
+        out = _new_output_array(x, ctypes.c_longlong, "q", capacity)
+        out_ptr, out_keep = _as_output_pointer(out, ctypes.c_longlong, capacity)
+        
+        count = _native(self.lib.downsample, x_ptr, y_ptr, x_len, threshold, DOWNSAMPLE_METHODS[method], out_ptr)
+        if count < 0:
+            raise RuntimeError("Downsampling failed")
+        return out[:count] if count < capacity else out
+
+
+# add, multiply, factorial, ...: plain scalar calls generated from the registry
+for _function in NATIVE_FUNCTIONS:
+    if _function.params:
+        setattr(EngineWrapper, _function.name, wrapper_method(_function, _native))
 
 
 # Global instance (lazy initialization)
 _engine_instance = None
+_engine_lock = threading.Lock()
 
 
-def get_engine() -> EngineWrapper:
-    """Get or create the engine instance."""
+def _get_engine_locked() -> EngineWrapper:
     global _engine_instance
     if _engine_instance is None:
         _engine_instance = EngineWrapper()
     return _engine_instance
 
 
+def get_engine() -> EngineWrapper:
+    """
+    Get or create the engine instance.
+
+    The returned wrapper is unloaded once a reload replaces it and its last
+    lease ends; code that calls into the library should use engine_lease().
+    """
+    with _engine_lock:
+        return _get_engine_locked()
+
+
+@contextmanager
+def engine_lease() -> Iterator[EngineWrapper]:
+    """
+    Borrow the current engine for the duration of a call.
+
+    A reload swaps in a new engine for later leases; the replaced library
+    stays loaded until the last lease on it is released.
+    """
+    with _engine_lock:
+        engine = _get_engine_locked()
+        engine._leases += 1
+    try:
+        yield engine
+    finally:
+        with _engine_lock:
+            engine._leases -= 1
+            unload = engine._retired and engine._leases == 0
+        if unload:
+            _unload_engine(engine)
+
+
 def is_engine_available() -> bool:
     """Check if the engine library is available."""
     return _engine_lib is not None
+
+
+def get_engine_fingerprint():
+    """Fingerprint of the loaded library build, or None if it is not loaded."""
+    return _engine_fingerprint
+
+
+# Reloaded builds are loaded from private copies: the build output can then
+# be overwritten (or is not locked, on Windows) and every version gets its
+# own handle instead of the loader returning the already-open one.
+_RELOAD_DIR = Path(tempfile.gettempdir()) / f"modelab-engine-{os.getpid()}"
+_reload_lock = threading.Lock()
+# The library loaded at import is version 1
+_reload_versions = itertools.count(2)
+_reload_stats = {
+    "reloads": 0,
+    "failures": 0,
+    "unloaded": 0,
+    "last_reload_at": None,
+    "last_error": None,
+}
+
+
+def _free_library(lib: ctypes.CDLL):
+    if sys.platform == "win32":
+        _ctypes.FreeLibrary(lib._handle)
+    else:
+        _ctypes.dlclose(lib._handle)
+
+
+def _unload_engine(engine: EngineWrapper):
+    """Unload a retired engine whose last lease has ended."""
+    lib, engine.lib = engine.lib, None
+    try:
+        _free_library(lib)
+        copy_path = Path(lib._name)
+        if copy_path.parent == _RELOAD_DIR:
+            copy_path.unlink(missing_ok=True)
+    except OSError:
+        logger.exception("Failed to unload engine version %d", engine.version)
+        return
+    with _engine_lock:
+        _reload_stats["unloaded"] += 1
+    logger.info("Unloaded engine version %d", engine.version)
+
+
+def _load_versioned_library(lib_path: str, version: int) -> ctypes.CDLL:
+    """Load a private copy of lib_path and check that it exports REQUIRED_SYMBOLS."""
+    source = Path(lib_path)
+    _RELOAD_DIR.mkdir(parents=True, exist_ok=True)
+    copy_path = _RELOAD_DIR / f"{source.stem}.v{version}{source.suffix}"
+    shutil.copy2(source, copy_path)
+    try:
+        lib = ctypes.CDLL(str(copy_path))
+    except OSError as e:
+        copy_path.unlink(missing_ok=True)
+        raise EngineReloadError(f"Failed to load engine library at {lib_path}: {e}")
+    
+    missing = [name for name in REQUIRED_SYMBOLS if not hasattr(lib, name)]
+    if missing:
+        _free_library(lib)
+        copy_path.unlink(missing_ok=True)
+        raise EngineReloadError(
+            f"Engine library at {lib_path} does not export: {', '.join(missing)}"
+        )
+    if sys.platform != "win32":
+        # The mapping stays valid after unlinking, so no copies are left behind
+        copy_path.unlink()
+    return lib
+
+
+def reload_engine(force: bool = False) -> bool:
+    """
+    Load the current engine build and make it the active engine.
+
+    Does nothing (returns False) if the build has not changed since it was
+    loaded, unless force is set. Calls already running keep using the
+    previous library, which is unloaded when they finish. Raises
+    FileNotFoundError or EngineReloadError if the build is missing or
+    invalid; the active engine is then left unchanged.
+    """
+    global _engine_instance, _engine_lib, _engine_fingerprint, _load_error
+    
+    with _reload_lock:
+        try:
+            lib_path, checked_paths = get_library_path()
+            if lib_path is None:
+                raise FileNotFoundError(
+                    "Engine library not found. Checked paths:\n" +
+                    "\n".join(f"  - {p}" for p in checked_paths)
+                )
+            fingerprint = _library_fingerprint(lib_path)
+            if fingerprint == _engine_fingerprint and not force:
+                return False
+            
+            version = next(_reload_versions)
+            lib = _load_versioned_library(lib_path, version)
+            engine = EngineWrapper(lib, version)
+        except (OSError, EngineReloadError) as e:
+            with _engine_lock:
+                _reload_stats["failures"] += 1
+                _reload_stats["last_error"] = str(e)
+            raise
+        
+        with _engine_lock:
+            previous = _engine_instance
+            previous_lib = _engine_lib
+            _engine_instance = engine
+            _engine_lib = lib
+            _engine_fingerprint = fingerprint
+            _load_error = None
+            _reload_stats["reloads"] += 1
+            _reload_stats["last_reload_at"] = time.time()
+            _reload_stats["last_error"] = None
+            unload_now = False
+            if previous is not None:
+                previous._retired = True
+                unload_now = previous._leases == 0
+        
+        logger.info("Loaded engine version %d from %s", version, lib_path)
+        if unload_now:
+            _unload_engine(previous)
+        elif previous is None and previous_lib is not None:
+            # Loaded at import but never wrapped, so nothing can be using it
+            _free_library(previous_lib)
+        return True
+
+
+def get_reload_stats() -> dict:
+    """Return the active engine version and reload counters."""
+    with _engine_lock:
+        return {
+            "version": _engine_instance.version if _engine_instance is not None else None,
+            "fingerprint": _engine_fingerprint,
+            "in_flight": _engine_instance._leases if _engine_instance is not None else 0,
+            **_reload_stats,
+        }
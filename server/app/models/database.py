@@ -1,7 +1,8 @@
 """
 Database models using SQLAlchemy.
 """
-from sqlalchemy import Column, Integer, String, Float, DateTime, Text
+from datetime import datetime, timezone
+from sqlalchemy import BigInteger, Column, Integer, String, Float, DateTime, Text, Index, UniqueConstraint
 from sqlalchemy.sql import func
 from app.core.database import Base
 
@@ -18,5 +19,61 @@ class EngineCalculation(Base):
     result = Column(Text, nullable=True)  # Result as string (can be int, float, or string)
     success = Column(Integer, nullable=False, default=1)  # 1 for success, 0 for failure
     message = Column(String, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # Set in Python: CURRENT_TIMESTAMP has no fractional seconds on SQLite, and the
+    # (created_at, id) keyset cursor compares the stored text exactly
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
+    __table_args__ = (
+        # Keyset pagination over (created_at, id), newest first
+        Index("ix_engine_calculations_created_at_id", "created_at", "id"),
+    )
+
+
+class HourlyAggregateMixin:
+    """
+    Columns of an hourly aggregate of engine_calculations rows per operation type.
+    """
+    id = Column(Integer, primary_key=True)
+    operation_type = Column(String, nullable=False)
+    bucket_start = Column(DateTime(timezone=True), nullable=False)  # Start of the hour (UTC)
+    calls = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
+    input_bytes = Column(BigInteger, nullable=False, default=0)  # Total size of input_data
+    # Summary of the results that parse as finite numbers
+    result_count = Column(Integer, nullable=False, default=0)
+    result_sum = Column(Float, nullable=True)
+    result_min = Column(Float, nullable=True)
+    result_max = Column(Float, nullable=True)
+
+
+class EngineCalculationRollup(HourlyAggregateMixin, Base):
+    """
+    Hourly aggregates of engine_calculations rows removed by history compaction.
+    """
+    __tablename__ = "engine_calculation_rollups"
+
+    __table_args__ = (
+        UniqueConstraint("operation_type", "bucket_start", name="uq_engine_calculation_rollups_bucket"),
+    )
+
+
+class EngineCalculationStats(HourlyAggregateMixin, Base):
+    """
+    Hourly aggregates of every calculation ever recorded, updated on insert.
+    """
+    __tablename__ = "engine_calculation_stats"
+
+    __table_args__ = (
+        UniqueConstraint("operation_type", "bucket_start", name="uq_engine_calculation_stats_bucket"),
+    )
+
+
+class ModelabMetadata(Base):
+    """
+    Key/value state of the application database (e.g. completed one-off migrations).
+    """
+    __tablename__ = "modelab_metadata"
+
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
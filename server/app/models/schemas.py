@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import List, Literal, Optional
 from datetime import datetime
 
 
@@ -17,4 +17,44 @@ class EngineCalculationResponse(BaseModel):
         from_attributes = True
 
 
+# Downsampled series schemas
+class CalculationSeriesPoint(BaseModel):
+    id: int
+    operation_type: str
+    created_at: datetime
+    value: float
+
+
+class CalculationSeriesResponse(BaseModel):
+    method: Literal["lttb", "minmax"]
+    rows: int  # Numeric results in the range before downsampling
+    truncated: bool  # Only the newest CALCULATIONS_SERIES_MAX_ROWS rows of the range were read
+    points: List[CalculationSeriesPoint]
+
+
+# Calculation statistics schemas
+class CalculationStatsSummary(BaseModel):
+    calls: int
+    failures: int
+    success_rate: float
+    input_bytes: int
+    # Over results that are finite numbers
+    result_count: int
+    result_mean: Optional[float] = None
+    result_min: Optional[float] = None
+    result_max: Optional[float] = None
+
+
+class CalculationStatsBucket(CalculationStatsSummary):
+    bucket_start: datetime
+
+
+class CalculationStatsSeries(BaseModel):
+    operation_type: str
+    total: CalculationStatsSummary
+    buckets: List[CalculationStatsBucket]
+
 
+class CalculationStatsResponse(BaseModel):
+    interval: Literal["hour", "day"]
+    operations: List[CalculationStatsSeries]
@@ -1,47 +1,100 @@
 """
 FastAPI router for C++ engine integration.
 """
-from fastapi import APIRouter, HTTPException, status, Depends
-from pydantic import BaseModel
-from typing import List, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status, Depends
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import StreamingResponse
+from starlette.requests import ClientDisconnect
+from pydantic import BaseModel, ValidationError
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
+from datetime import datetime, timezone
+import array
+import base64
 import json
-from sqlalchemy.orm import Session
-from app.engine_wrapper import get_engine, is_engine_available
-from app.core.database import get_db
+import logging
+import time
+from sqlalchemy import and_, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.engine_wrapper import (
+    EngineReloadError,
+    engine_lease,
+    get_reload_stats,
+    is_engine_available,
+    native_seconds,
+    reload_engine,
+)
+from app.core import metrics
+from app.core.binary_codec import (
+    BINARY_MEDIA_TYPE,
+    BinaryPayloadError,
+    encode_f64,
+    is_binary_media_type,
+    read_f64_body,
+)
+from app.core.calculation_feed import CalculationFeedUnavailableError, Subscription, calculation_feed
+from app.core.calculation_stats import Bucket, as_utc, numeric_result, query_stats
+from app.core.config import settings
+from app.engine_registry import OPERATIONS, VECTORIZED_METHODS, Operation
+from app.core.database import AsyncSessionLocal, get_async_db
+from app.core.executor import engine_executor, ExecutorSaturatedError
+from app.core.process_backend import engine_process_pool
+from app.core.result_cache import result_cache
+from app.core.singleflight import engine_singleflight
+from app.core.history_retention import history_compactor
+from app.core.history_writer import (
+    history_writer,
+    insert_calculations,
+    insert_with_new_session,
+    make_calculation_row,
+)
 from app.models.database import EngineCalculation
-from app.models.schemas import EngineCalculationResponse
+from app.models.schemas import (
+    CalculationSeriesPoint,
+    CalculationSeriesResponse,
+    CalculationStatsBucket,
+    CalculationStatsResponse,
+    CalculationStatsSeries,
+    CalculationStatsSummary,
+    EngineCalculationResponse,
+)
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
 
 
-class AddRequest(BaseModel):
-    a: int
-    b: int
+# Request model of the hand-written /sum-array route (JSON bodies)
+SumArrayRequest = OPERATIONS["sum-array"].request
 
 
-class MultiplyRequest(BaseModel):
-    a: int
-    b: int
-
-
-class FactorialRequest(BaseModel):
-    n: int
+class EngineResponse(BaseModel):
+    result: Optional[float | int | str] = None
+    success: bool
+    message: str
 
 
-class ProcessStringRequest(BaseModel):
-    text: str
+class BatchOperation(BaseModel):
+    operation: Literal[tuple(OPERATIONS)]
+    params: Dict[str, Any]
 
 
-class SumArrayRequest(BaseModel):
-    numbers: List[float]
+class BatchRequest(BaseModel):
+    operations: List[BatchOperation]
 
 
-class EngineResponse(BaseModel):
+class BatchItemResult(BaseModel):
+    index: int
+    operation: str
     result: Optional[float | int | str] = None
     success: bool
     message: str
 
 
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+    succeeded: int
+    failed: int
+
+
 @router.get("/status", response_model=EngineResponse)
 async def engine_status():
     """Check if C++ engine is available."""
@@ -53,10 +106,197 @@ async def engine_status():
     )
 
 
+@router.post("/reload")
+async def reload_engine_library(force: bool = Query(False, description="Reload even if the build has not changed")):
+    """
+    Load the latest engine build and swap it in without interrupting requests.
+
+    The build is loaded from a private versioned copy and checked for every
+    required symbol before it replaces the active engine. Calls already in
+    progress finish on the previous library, which is unloaded afterwards.
+    Cached results are dropped when a new build is loaded.
+    """
+    if not settings.ENGINE_RELOAD_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Engine reload is disabled"
+        )
+    try:
+        reloaded = await engine_executor.run(reload_engine, force)
+    except FileNotFoundError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except EngineReloadError as e:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=str(e)
+        )
+    
+    if reloaded:
+        if engine_process_pool is not None:
+            # Workers load the new build when they are next used
+            engine_process_pool.recycle()
+        if result_cache is not None:
+            await engine_executor.run(result_cache.clear)
+    return {"reloaded": reloaded, **get_reload_stats()}
+
+
+@router.get("/reload/status")
+async def engine_reload_status():
+    """Report the active engine version and reload counters."""
+    return get_reload_stats()
+
+
+@router.get("/backend/status")
+async def engine_backend_status():
+    """Report where engine calls run and, for worker processes, crash/timeout counters."""
+    if engine_process_pool is None:
+        return {"backend": "thread"}
+    return engine_process_pool.stats()
+
+
+@router.get("/cache/status")
+async def result_cache_status():
+    """Report result cache hit/miss counters."""
+    if result_cache is None:
+        return {"enabled": False}
+    return result_cache.stats()
+
+
+@router.get("/singleflight/status")
+async def singleflight_status():
+    """Report engine calls in flight and requests coalesced into them."""
+    if engine_singleflight is None:
+        return {"enabled": False}
+    return engine_singleflight.stats()
+
+
+@router.get("/history/status")
+async def history_writer_status():
+    """Report write-behind history queue counters (queued, flushed, inline-written rows) and compaction runs."""
+    return {
+        "write_behind": settings.HISTORY_WRITE_BEHIND,
+        **history_writer.stats(),
+        "compaction": history_compactor.stats(),
+    }
+
+
+@router.post("/history/compact")
+async def compact_history(vacuum: bool = Query(False, description="Run VACUUM afterwards to shrink the database file")):
+    """
+    Apply the history retention policy now.
+
+    Rows outside the policy are rolled up into hourly aggregates and deleted,
+    and oversized input_data is truncated. Waits for a running compaction.
+    """
+    return await history_compactor.compact(vacuum=vacuum)
+
+
+def _encode_cursor(calculation: EngineCalculation) -> str:
+    """Encode the (created_at, id) position of a row as an opaque cursor."""
+    raw = f"{calculation.created_at.isoformat()}|{calculation.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        created_at, calculation_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(calculation_id)
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor"
+        )
+
+
+def _calculations_query(
+    cursor: Optional[str],
+    operation_type: Optional[str],
+    success: Optional[bool],
+    created_after: Optional[datetime],
+    created_before: Optional[datetime]
+):
+    """Build the newest-first keyset query over engine_calculations."""
+    query = select(EngineCalculation)
+    if operation_type is not None:
+        query = query.where(EngineCalculation.operation_type == operation_type)
+    if success is not None:
+        query = query.where(EngineCalculation.success == (1 if success else 0))
+    if created_after is not None:
+        query = query.where(EngineCalculation.created_at >= as_utc(created_after))
+    if created_before is not None:
+        query = query.where(EngineCalculation.created_at < as_utc(created_before))
+    if cursor is not None:
+        cursor_created_at, cursor_id = _decode_cursor(cursor)
+        query = query.where(
+            or_(
+                EngineCalculation.created_at < cursor_created_at,
+                and_(
+                    EngineCalculation.created_at == cursor_created_at,
+                    EngineCalculation.id < cursor_id
+                )
+            )
+        )
+    return query.order_by(EngineCalculation.created_at.desc(), EngineCalculation.id.desc())
+
+
+async def _stream_calculations(query) -> AsyncIterator[str]:
+    """Yield NDJSON lines from a server-side cursor with constant memory."""
+    async with AsyncSessionLocal() as db:
+        result = await db.stream_scalars(
+            query.execution_options(yield_per=settings.CALCULATIONS_STREAM_CHUNK_SIZE)
+        )
+        async for partition in result.partitions():
+            yield "".join(
+                EngineCalculationResponse.model_validate(calc).model_dump_json() + "\n"
+                for calc in partition
+            )
+
+
 @router.get("/calculations", response_model=List[EngineCalculationResponse])
-async def get_calculations(db: Session = Depends(get_db)):
-    """Get list of all engine calculations."""
-    calculations = db.query(EngineCalculation).order_by(EngineCalculation.created_at.desc()).all()
+async def get_calculations(
+    http_request: Request,
+    response: Response,
+    limit: Optional[int] = Query(None, ge=1, description="Page size (JSON) or maximum streamed rows (NDJSON)"),
+    cursor: Optional[str] = Query(None, description="Value of X-Next-Cursor from the previous page"),
+    operation_type: Optional[str] = None,
+    success: Optional[bool] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    output_format: Literal["json", "ndjson"] = Query("json", alias="format"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get engine calculations, newest first.
+
+    JSON responses are paginated with a keyset cursor on (created_at, id):
+    pass the X-Next-Cursor header of one page as cursor to get the next.
+    format=ndjson streams every matching row (or up to limit) instead.
+    """
+    query = _calculations_query(cursor, operation_type, success, created_after, created_before)
+    
+    if output_format == "ndjson":
+        if limit is not None:
+            query = query.limit(limit)
+        return StreamingResponse(_stream_calculations(query), media_type="application/x-ndjson")
+    
+    if limit is None:
+        limit = settings.CALCULATIONS_PAGE_SIZE
+    if limit > settings.CALCULATIONS_MAX_PAGE_SIZE:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"limit must not exceed {settings.CALCULATIONS_MAX_PAGE_SIZE}"
+        )
+    
+    calculations = (await db.scalars(query.limit(limit))).all()
+    
+    if len(calculations) == limit:
+        next_cursor = _encode_cursor(calculations[-1])
+        next_url = http_request.url.include_query_params(cursor=next_cursor)
+        response.headers["X-Next-Cursor"] = next_cursor
+        response.headers["Link"] = f'<{next_url}>; rel="next"'
     
     # Convert success integer (1/0) to boolean and create response objects
     return [
@@ -73,251 +313,646 @@ async def get_calculations(db: Session = Depends(get_db)):
     ]
 
 
-@router.post("/add", response_model=EngineResponse)
-async def add_numbers(request: AddRequest, db: Session = Depends(get_db)):
-    """Add two numbers using C++ engine."""
-    input_data = json.dumps({"a": request.a, "b": request.b})
-    try:
-        engine = get_engine()
-        result = engine.add(request.a, request.b)
-        response = EngineResponse(
-            result=result,
-            success=True,
-            message=f"Successfully added {request.a} + {request.b}"
-        )
-        
-        # Save to database
-        db_calculation = EngineCalculation(
-            operation_type="add",
-            input_data=input_data,
-            result=str(result),
-            success=1,
-            message=response.message
-        )
-        db.add(db_calculation)
-        db.commit()
-        
-        return response
-    except Exception as e:
-        # Save failed calculation to database
-        db_calculation = EngineCalculation(
-            operation_type="add",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message=f"Engine error: {str(e)}"
-        )
-        db.add(db_calculation)
-        db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Engine error: {str(e)}"
-        )
+def _stats_summary(bucket: Bucket) -> dict:
+    return {
+        "calls": bucket.calls,
+        "failures": bucket.failures,
+        "success_rate": (bucket.calls - bucket.failures) / bucket.calls if bucket.calls else 0.0,
+        "input_bytes": bucket.input_bytes,
+        "result_count": bucket.result_count,
+        "result_mean": bucket.result_sum / bucket.result_count if bucket.result_count else None,
+        "result_min": bucket.result_min,
+        "result_max": bucket.result_max,
+    }
 
 
-@router.post("/multiply", response_model=EngineResponse)
-async def multiply_numbers(request: MultiplyRequest, db: Session = Depends(get_db)):
-    """Multiply two numbers using C++ engine."""
-    input_data = json.dumps({"a": request.a, "b": request.b})
-    try:
-        engine = get_engine()
-        result = engine.multiply(request.a, request.b)
-        response = EngineResponse(
-            result=result,
-            success=True,
-            message=f"Successfully multiplied {request.a} * {request.b}"
-        )
-        
-        # Save to database
-        db_calculation = EngineCalculation(
-            operation_type="multiply",
-            input_data=input_data,
-            result=str(result),
-            success=1,
-            message=response.message
-        )
-        db.add(db_calculation)
-        db.commit()
-        
-        return response
-    except Exception as e:
-        # Save failed calculation to database
-        db_calculation = EngineCalculation(
-            operation_type="multiply",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message=f"Engine error: {str(e)}"
-        )
-        db.add(db_calculation)
-        db.commit()
-        
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Engine error: {str(e)}"
-        )
+@router.get("/calculations/stats", response_model=CalculationStatsResponse)
+async def get_calculation_stats(
+    interval: Literal["hour", "day"] = Query("hour", description="Bucket size (UTC)"),
+    operation_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get calculation counts, success rates and result summaries per operation type and time bucket.
 
+    Served from hourly aggregates maintained on insert, so the cost depends
+    on the time range and not on the size of the history. The aggregates
+    include rows already removed by history retention.
+    """
+    series = await query_stats(db, interval, operation_type, created_after, created_before)
+    operations = []
+    for name, buckets in series.items():
+        total = Bucket()
+        for bucket in buckets.values():
+            total.merge(bucket)
+        operations.append(CalculationStatsSeries(
+            operation_type=name,
+            total=CalculationStatsSummary(**_stats_summary(total)),
+            buckets=[
+                CalculationStatsBucket(bucket_start=bucket_start, **_stats_summary(bucket))
+                for bucket_start, bucket in buckets.items()
+            ]
+        ))
+    return CalculationStatsResponse(interval=interval, operations=operations)
 
-@router.post("/factorial", response_model=EngineResponse)
-async def calculate_factorial(request: FactorialRequest, db: Session = Depends(get_db)):
-    """Calculate factorial using C++ engine."""
-    input_data = json.dumps({"n": request.n})
-    
-    if request.n < 0:
-        # Save failed validation to database
-        db_calculation = EngineCalculation(
-            operation_type="factorial",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message="Factorial is not defined for negative numbers"
+
+async def _load_series(query, max_rows: int) -> tuple[array.array, array.array, array.array, bool]:
+    """
+    Read the newest max_rows (id, created_at, result) rows of a newest-first
+    query into id, timestamp and value columns, oldest first, skipping
+    non-numeric results. The last item tells whether older rows were left out.
+    """
+    ids = array.array("q")
+    timestamps = array.array("d")
+    values = array.array("d")
+    read = 0
+    async with AsyncSessionLocal() as db:
+        result = await db.stream(
+            query.limit(max_rows + 1).execution_options(yield_per=settings.CALCULATIONS_STREAM_CHUNK_SIZE)
         )
-        db.add(db_calculation)
-        db.commit()
-        
+        async for partition in result.partitions():
+            for calculation_id, created_at, text in partition:
+                read += 1
+                if read > max_rows:
+                    break
+                value = numeric_result(text)
+                if value is None:
+                    continue
+                ids.append(calculation_id)
+                timestamps.append(as_utc(created_at).timestamp())
+                values.append(value)
+    for column in (ids, timestamps, values):
+        column.reverse()
+    return ids, timestamps, values, read > max_rows
+
+
+@router.get("/calculations/series", response_model=CalculationSeriesResponse)
+@metrics.operation("calculations-series")
+async def get_calculation_series(
+    points: int = Query(settings.CALCULATIONS_SERIES_POINTS, ge=2, description="Maximum points returned"),
+    method: Literal["lttb", "minmax"] = Query("lttb", description="Downsampling method"),
+    operation_type: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get the numeric results of successful calculations over time, downsampled for charting.
+
+    The matching history is read as columns and reduced to at most points
+    points by the C++ engine: lttb keeps the visual shape of the series,
+    minmax keeps the minimum and maximum of each time bucket. Results that
+    are not finite numbers are skipped. At most CALCULATIONS_SERIES_MAX_ROWS
+    rows are read: a larger range is charted from its newest rows and the
+    response is marked truncated.
+    """
+    if points > settings.CALCULATIONS_SERIES_MAX_POINTS:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Factorial is not defined for negative numbers"
+            detail=f"points must not exceed {settings.CALCULATIONS_SERIES_MAX_POINTS}"
         )
-    
-    if request.n > 20:
-        # Save failed validation to database
-        db_calculation = EngineCalculation(
-            operation_type="factorial",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message="Factorial for numbers > 20 may cause overflow"
-        )
-        db.add(db_calculation)
-        db.commit()
-        
+    if not is_engine_available():
         raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Factorial for numbers > 20 may cause overflow"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Engine library not found. Please compile the C++ library first."
         )
     
+    query = (
+        select(EngineCalculation.id, EngineCalculation.created_at, EngineCalculation.result)
+        .where(EngineCalculation.success == 1, EngineCalculation.result.is_not(None))
+        .order_by(EngineCalculation.created_at.desc(), EngineCalculation.id.desc())
+    )
+    if operation_type is not None:
+        query = query.where(EngineCalculation.operation_type == operation_type)
+    if created_after is not None:
+        query = query.where(EngineCalculation.created_at >= as_utc(created_after))
+    if created_before is not None:
+        query = query.where(EngineCalculation.created_at < as_utc(created_before))
+    ids, timestamps, values, truncated = await _load_series(query, settings.CALCULATIONS_SERIES_MAX_ROWS)
+    
+    kept = await engine_executor.run(_call_engine_uncached, "downsample", timestamps, values, points, method)
+    kept_ids = [ids[index] for index in kept]
+    operation_types = dict((await db.execute(
+        select(EngineCalculation.id, EngineCalculation.operation_type).where(EngineCalculation.id.in_(kept_ids))
+    )).all()) if kept_ids else {}
+    return CalculationSeriesResponse(
+        method=method,
+        rows=len(ids),
+        truncated=truncated,
+        points=[
+            CalculationSeriesPoint(
+                id=ids[index],
+                operation_type=operation_types.get(ids[index], operation_type or ""),
+                created_at=datetime.fromtimestamp(timestamps[index], timezone.utc),
+                value=values[index]
+            )
+            for index in kept
+        ]
+    )
+
+
+async def _feed_events(http_request: Request, subscription: Subscription) -> AsyncIterator[str]:
+    """Yield Server-Sent Events for a feed subscription until the client leaves or the feed stops."""
     try:
-        engine = get_engine()
-        result = engine.factorial(request.n)
-        response = EngineResponse(
-            result=result,
-            success=True,
-            message=f"Successfully calculated factorial of {request.n}"
-        )
-        
-        # Save to database
-        db_calculation = EngineCalculation(
-            operation_type="factorial",
-            input_data=input_data,
-            result=str(result),
-            success=1,
-            message=response.message
+        while not subscription.closed:
+            events, dropped = await subscription.get(settings.LIVE_FEED_HEARTBEAT_INTERVAL)
+            if not events and not dropped:
+                if await http_request.is_disconnected():
+                    return
+                # Keeps proxies from closing an idle stream and detects gone clients
+                yield ": keep-alive\n\n"
+                continue
+            chunk = "".join(f"id: {event[0]}\nevent: calculation\ndata: {event[3]}\n\n" for event in events)
+            if dropped:
+                chunk += f'event: dropped\ndata: {{"dropped": {dropped}}}\n\n'
+            yield chunk
+    finally:
+        calculation_feed.unsubscribe(subscription)
+
+
+@router.get("/calculations/live/status")
+async def calculation_feed_status():
+    """Report live feed subscribers and fanout counters (rows published, delivered, dropped)."""
+    return calculation_feed.stats()
+
+
+@router.get("/calculations/live")
+async def get_calculations_live(
+    http_request: Request,
+    operation_type: Optional[str] = None,
+    success: Optional[bool] = None
+):
+    """
+    Stream newly persisted calculations as Server-Sent Events.
+
+    Each row committed after the request is sent as a `calculation` event
+    whose data is the row as returned by GET /calculations. A client that
+    falls more than LIVE_FEED_QUEUE_SIZE rows behind gets a `dropped` event
+    with the number of rows it missed and should refetch what it shows.
+    """
+    try:
+        subscription = await calculation_feed.subscribe(operation_type, success)
+    except CalculationFeedUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"}
         )
-        db.add(db_calculation)
-        db.commit()
-        
-        return response
+    return StreamingResponse(
+        _feed_events(http_request, subscription),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+def _call_engine_uncached(method: str, *args):
+    """
+    Invoke an EngineWrapper method in a worker process (ENGINE_BACKEND=process)
+    or in this process under a lease, so a concurrent reload cannot unload
+    the library while the call runs.
+
+    When the request is being timed, time inside the native library counts
+    as the engine phase and the rest of the wrapper call as marshal (with
+    the process backend the whole round trip counts as engine).
+    """
+    if not metrics.is_recording():
+        if engine_process_pool is not None:
+            return engine_process_pool.call(method, *args)
+        with engine_lease() as engine:
+            return getattr(engine, method)(*args)
+    
+    started = time.perf_counter()
+    if engine_process_pool is not None:
+        try:
+            return engine_process_pool.call(method, *args)
+        finally:
+            metrics.observe_phase("engine", time.perf_counter() - started)
+    native_before = native_seconds()
+    try:
+        with engine_lease() as engine:
+            return getattr(engine, method)(*args)
+    finally:
+        native = native_seconds() - native_before
+        metrics.observe_phase("engine", native)
+        metrics.observe_phase("marshal", time.perf_counter() - started - native)
+
+
+def _call_engine(method: str, *args):
+    """
+    Invoke an EngineWrapper method (runs inside the engine executor).
+
+    Engine functions are pure, so results are served from the result cache
+    when it is enabled.
+    """
+    if result_cache is None:
+        return _call_engine_uncached(method, *args)
+    return result_cache.get_or_compute(method, args, lambda: _call_engine_uncached(method, *args))
+
+
+async def _persist_calculations(db: Optional[AsyncSession], rows: List[dict]):
+    """
+    Persist calculation rows without blocking the event loop.
+
+    With HISTORY_WRITE_BEHIND the rows are queued for a later bulk insert
+    (or inserted right away when the buffer cannot take them); otherwise
+    they are committed before returning. Pass db=None from code that
+    outlives the request session (streaming bodies).
+    """
+    started = time.perf_counter()
+    try:
+        if settings.HISTORY_WRITE_BEHIND:
+            await history_writer.put_many(rows)
+        elif db is None:
+            await insert_with_new_session(rows)
+        else:
+            await insert_calculations(db, rows)
+    finally:
+        metrics.observe_phase("persist", time.perf_counter() - started)
+
+
+async def _record_calculation(
+    db: Optional[AsyncSession],
+    operation_type: str,
+    input_data: str,
+    result: Optional[str],
+    success: bool,
+    message: str
+):
+    """Persist a single calculation."""
+    await _persist_calculations(
+        db, [make_calculation_row(operation_type, input_data, result, success, message)]
+    )
+
+
+async def _execute(
+    db: AsyncSession,
+    operation_type: str,
+    input_data: str,
+    method: str,
+    args: tuple,
+    message: str
+) -> EngineResponse:
+    """
+    Run an engine method off the event loop and record the outcome.
+
+    Concurrent identical calls share one computation (see
+    core/singleflight.py); each request still records its own calculation.
+    Saturation of the engine executor propagates as ExecutorSaturatedError
+    (mapped to 503 in main.py) and is not recorded as a failed calculation.
+    """
+    try:
+        if engine_singleflight is None:
+            result = await engine_executor.run(_call_engine, method, *args)
+        else:
+            result = await engine_singleflight.run(
+                operation_type, method, args, lambda: engine_executor.run(_call_engine, method, *args)
+            )
+    except ExecutorSaturatedError:
+        raise
     except Exception as e:
         # Save failed calculation to database
-        db_calculation = EngineCalculation(
-            operation_type="factorial",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message=f"Engine error: {str(e)}"
+        await _record_calculation(
+            db, operation_type, input_data, None, False, f"Engine error: {str(e)}"
         )
-        db.add(db_calculation)
-        db.commit()
-        
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Engine error: {str(e)}"
         )
+    
+    response = EngineResponse(result=result, success=True, message=message)
+    
+    # Save to database
+    await _record_calculation(
+        db, operation_type, input_data, str(result), True, response.message
+    )
+    
+    return response
 
 
-@router.post("/process-string", response_model=EngineResponse)
-async def process_string(request: ProcessStringRequest, db: Session = Depends(get_db)):
-    """Process string (convert to uppercase) using C++ engine."""
-    input_data = json.dumps({"text": request.text})
-    try:
-        engine = get_engine()
-        result = engine.process_string(request.text)
-        response = EngineResponse(
-            result=result,
-            success=True,
-            message="Successfully processed string"
-        )
+def _add_operation_route(operation: Operation):
+    """Register POST /{operation.name} for a registry operation."""
+    request_model = operation.request
+
+    async def handler(request: request_model, db: AsyncSession = Depends(get_async_db)):
+        input_data = json.dumps(request.model_dump())
         
-        # Save to database
-        db_calculation = EngineCalculation(
-            operation_type="process-string",
+        error = operation.check(request) if operation.check is not None else None
+        if error is not None:
+            # Save failed validation to database
+            await _record_calculation(db, operation.name, input_data, None, False, error)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=error
+            )
+        
+        return await _execute(
+            db,
+            operation_type=operation.name,
             input_data=input_data,
-            result=str(result),
-            success=1,
-            message=response.message
+            method=operation.method_for(request),
+            args=operation.arguments(request),
+            message=operation.message(request)
         )
-        db.add(db_calculation)
-        db.commit()
-        
-        return response
+
+    handler.__name__ = operation.endpoint
+    handler.__qualname__ = operation.endpoint
+    handler.__doc__ = operation.description
+    router.post(f"/{operation.name}", response_model=EngineResponse)(metrics.operation(operation.name)(handler))
+
+
+# POST /add, /multiply, /factorial, /process-string, ... (see engine_registry.OPERATIONS)
+for _operation in OPERATIONS.values():
+    if _operation.generate_route:
+        _add_operation_route(_operation)
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse for bodies produced while the request body is still
+    being read.
+
+    StreamingResponse normally listens for the client disconnect on the
+    receive channel, which would compete with request.stream() for the
+    remaining body messages; here a disconnect surfaces as ClientDisconnect
+    from request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+
+async def _process_string_chunks(http_request: Request, chunk_size: int) -> AsyncIterator[bytes]:
+    """
+    Uppercase a request body chunk by chunk through one reusable buffer.
+
+    Memory use is bounded by chunk_size regardless of the body size. The
+    calculation is recorded once the body has been fully processed, without
+    a result (the output is not stored, and the byte count in the message
+    must not be charted or aggregated as a numeric result).
+    """
+    buffer = bytearray(chunk_size)
+    total = 0
+    success = False
+    message = "Client disconnected"
+    try:
+        async for chunk in http_request.stream():
+            view = memoryview(chunk)
+            for start in range(0, len(view), chunk_size):
+                piece = view[start:start + chunk_size]
+                length = await engine_executor.run(_call_engine_uncached, "process_bytes", piece, buffer)
+                total += length
+                # Copy out: the buffer is overwritten by the next chunk
+                yield bytes(buffer[:length])
+        success = True
+        message = f"Successfully processed {total} bytes"
+    except ClientDisconnect:
+        return
     except Exception as e:
-        # Save failed calculation to database
-        db_calculation = EngineCalculation(
-            operation_type="process-string",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message=f"Engine error: {str(e)}"
+        # Headers are already sent, so the error can only be logged and recorded
+        logger.exception("Streaming string processing failed after %d bytes", total)
+        message = f"Engine error: {str(e)}"
+        raise
+    finally:
+        await _record_calculation(
+            None,
+            "process-string",
+            json.dumps({"bytes": total, "streamed": True}),
+            None,
+            success,
+            message
         )
-        db.add(db_calculation)
-        db.commit()
-        
+
+
+@router.post(
+    "/process-string/stream",
+    response_class=_DuplexStreamingResponse,
+    responses={200: {"content": {"application/octet-stream": {}}}},
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "text/plain": {"schema": {"type": "string"}},
+                "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+            },
+        }
+    },
+)
+@metrics.operation("process-string-stream")
+async def process_string_stream(http_request: Request):
+    """
+    Process a raw text body (convert to uppercase) using C++ engine, streaming
+    the result back as it is produced.
+
+    The body is not held in memory: it is passed to the engine in chunks of
+    PROCESS_STRING_CHUNK_SIZE bytes. Only ASCII letters are changed, so UTF-8
+    text is processed correctly at any chunk boundary. The response keeps the
+    request Content-Type (application/octet-stream if none was sent).
+    """
+    if not is_engine_available():
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Engine error: {str(e)}"
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Engine library not found. Please compile the C++ library first."
         )
+    return _DuplexStreamingResponse(
+        _process_string_chunks(http_request, settings.PROCESS_STRING_CHUNK_SIZE),
+        media_type=http_request.headers.get("content-type", "application/octet-stream")
+    )
 
 
-@router.post("/sum-array", response_model=EngineResponse)
-async def sum_array(request: SumArrayRequest, db: Session = Depends(get_db)):
-    """Sum array of numbers using C++ engine."""
-    input_data = json.dumps({"numbers": request.numbers})
-    try:
-        engine = get_engine()
-        result = engine.sum_array(request.numbers)
-        response = EngineResponse(
-            result=result,
-            success=True,
-            message=f"Successfully summed {len(request.numbers)} numbers"
+@router.post(
+    "/sum-array",
+    response_model=EngineResponse,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": SumArrayRequest.model_json_schema()
+                },
+                BINARY_MEDIA_TYPE: {
+                    "schema": {"type": "string", "format": "binary"}
+                },
+            },
+        },
+        "responses": {
+            "200": {
+                "content": {BINARY_MEDIA_TYPE: {"schema": {"type": "string", "format": "binary"}}}
+            }
+        },
+    },
+)
+@metrics.operation("sum-array")
+async def sum_array(
+    http_request: Request,
+    method: Literal["naive", "kahan", "pairwise"] = Query(
+        "naive", description="Summation method for binary payloads (JSON bodies use the method field)"
+    ),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Sum array of numbers using C++ engine.
+
+    Accepts a JSON body or a binary float64 payload (Content-Type
+    application/vnd.modelab.f64). Binary payloads are passed to the engine
+    without materializing Python floats. Send the same media type in Accept
+    to receive the result in binary form.
+    """
+    # The body is read and decoded here rather than before the handler
+    parse_started = time.perf_counter()
+    if is_binary_media_type(http_request.headers.get("content-type")):
+        try:
+            numbers = await read_f64_body(http_request)
+        except BinaryPayloadError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+        input_data = json.dumps(
+            {"count": len(numbers), "encoding": BINARY_MEDIA_TYPE, "method": method}
         )
-        
-        # Save to database
-        db_calculation = EngineCalculation(
-            operation_type="sum-array",
-            input_data=input_data,
-            result=str(result),
-            success=1,
-            message=response.message
+    else:
+        try:
+            request = SumArrayRequest.model_validate_json(await http_request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**err, "loc": ("body", *err["loc"])} for err in e.errors(include_url=False)]
+            )
+        numbers = request.numbers
+        method = request.method
+        input_data = json.dumps({"numbers": numbers, "method": method})
+    metrics.observe_phase("validate", time.perf_counter() - parse_started)
+    
+    response = await _execute(
+        db,
+        operation_type="sum-array",
+        input_data=input_data,
+        method="sum_array",
+        args=(numbers, method),
+        message=f"Successfully summed {len(numbers)} numbers"
+    )
+    
+    if is_binary_media_type(http_request.headers.get("accept")):
+        return Response(content=encode_f64([response.result]), media_type=BINARY_MEDIA_TYPE)
+    return response
+
+
+_INT32_MIN = -2**31
+_INT32_MAX = 2**31 - 1
+
+
+def _run_batch(operations: List[BatchOperation]) -> tuple[List[dict], List[dict]]:
+    """
+    Execute batch operations inside the engine executor.
+
+    Calls of a wrapper method with an array entry point in the engine
+    (VECTORIZED_METHODS) and int32 arguments are grouped and run with one
+    native call per operation and method; the rest run in a tight scalar
+    loop. An arbitrary-precision factorial fails if it would take the sum of
+    their n above BATCH_MAX_BIG_FACTORIAL_N, so one batch cannot hold an
+    executor worker for minutes. Returns per-item results and the matching history
+    rows, in input order.
+    """
+    items = [None] * len(operations)
+    rows = [None] * len(operations)
+    vector_groups: Dict[tuple, list] = {}
+    big_factorial_n = 0
+    
+    def finish(index, operation_type, input_data, result, success, message):
+        items[index] = {
+            "index": index,
+            "operation": operation_type,
+            "result": result,
+            "success": success,
+            "message": message,
+        }
+        rows[index] = make_calculation_row(
+            operation_type, input_data, str(result) if success else None, success, message
         )
-        db.add(db_calculation)
-        db.commit()
+    
+    for index, operation in enumerate(operations):
+        spec = OPERATIONS[operation.operation]
+        try:
+            request = spec.request.model_validate(operation.params)
+        except ValidationError as e:
+            details = "; ".join(
+                f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+            finish(
+                index, operation.operation, json.dumps(operation.params),
+                None, False, f"Invalid parameters: {details}"
+            )
+            continue
         
-        return response
-    except Exception as e:
-        # Save failed calculation to database
-        db_calculation = EngineCalculation(
-            operation_type="sum-array",
-            input_data=input_data,
-            result=None,
-            success=0,
-            message=f"Engine error: {str(e)}"
-        )
-        db.add(db_calculation)
-        db.commit()
+        input_data = json.dumps(request.model_dump())
+        error = spec.check(request) if spec.check is not None else None
+        if error is not None:
+            finish(index, operation.operation, input_data, None, False, error)
+            continue
+        
+        method = spec.method_for(request)
+        args = spec.arguments(request)
+        if method == "factorial_big":
+            if big_factorial_n + request.n > settings.BATCH_MAX_BIG_FACTORIAL_N:
+                finish(
+                    index, operation.operation, input_data, None, False,
+                    f"Batch exceeds the limit of {settings.BATCH_MAX_BIG_FACTORIAL_N} "
+                    f"for the sum of n over factorials above 20"
+                )
+                continue
+            big_factorial_n += request.n
+        if method in VECTORIZED_METHODS and all(
+            isinstance(value, int) and _INT32_MIN <= value <= _INT32_MAX for value in args
+        ):
+            vector_groups.setdefault((operation.operation, method), []).append((index, request, input_data))
+            continue
         
+        try:
+            result = _call_engine(method, *args)
+        except Exception as e:
+            finish(index, operation.operation, input_data, None, False, f"Engine error: {str(e)}")
+        else:
+            finish(index, operation.operation, input_data, result, True, spec.message(request))
+    
+    for (operation_type, method), group in vector_groups.items():
+        spec = OPERATIONS[operation_type]
+        columns = zip(*(spec.arguments(request) for _, request, _ in group))
+        try:
+            results = _call_engine_uncached(
+                VECTORIZED_METHODS[method],
+                *(array.array("i", column) for column in columns)
+            )
+        except Exception as e:
+            for index, _, input_data in group:
+                finish(index, operation_type, input_data, None, False, f"Engine error: {str(e)}")
+        else:
+            for (index, request, input_data), result in zip(group, results):
+                finish(index, operation_type, input_data, result, True, spec.message(request))
+    
+    return items, rows
+
+
+@router.post("/batch", response_model=BatchResponse)
+@metrics.operation("batch")
+async def run_batch(request: BatchRequest, db: AsyncSession = Depends(get_async_db)):
+    """Run many heterogeneous engine operations in a single request."""
+    if len(request.operations) > settings.BATCH_MAX_OPERATIONS:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Engine error: {str(e)}"
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds the limit of {settings.BATCH_MAX_OPERATIONS} operations"
         )
+    
+    items, rows = await engine_executor.run(_run_batch, request.operations)
+    
+    # Save all history rows with a single bulk insert
+    await _persist_calculations(db, rows)
+    
+    succeeded = sum(1 for item in items if item["success"])
+    return BatchResponse(
+        results=items,
+        succeeded=succeeded,
+        failed=len(items) - succeeded
+    )
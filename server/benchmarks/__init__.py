@@ -0,0 +1,6 @@
+"""
+Benchmark suite for the engine, its Python wrapper and the HTTP API.
+
+Run with ``python -m benchmarks`` from the server directory and compare two
+runs with ``python -m benchmarks.compare``.
+"""
@@ -0,0 +1,78 @@
+"""
+Run the benchmark suites and save the results as JSON.
+
+    cd server
+    python -m benchmarks                        # wrapper + http, default profile
+    python -m benchmarks --suite native --suite wrapper --profile quick
+    python -m benchmarks --profile full -o results/full.json
+    python -m benchmarks.compare baseline.json results/latest.json
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+from benchmarks.harness import PROFILES, RESULTS_DIR, SERVER_DIR, environment, format_result, write_results
+
+SUITES = ("native", "wrapper", "http")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the engine, its Python wrapper and the HTTP API.")
+    parser.add_argument(
+        "--suite", action="append", choices=SUITES,
+        help="suite to run (repeatable); default: wrapper and http, plus native when engine_bench is built"
+    )
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="default", help="input sizes and timing effort")
+    parser.add_argument("--max-elements", type=int, help="override the largest array length")
+    parser.add_argument("--max-bytes", type=int, help="override the largest string/buffer size")
+    parser.add_argument(
+        "--cache", action="store_true",
+        help="keep the result cache enabled in the http suite (disabled by default so the engine runs every time)"
+    )
+    parser.add_argument(
+        "-o", "--output", type=Path, help="result file (default: benchmarks/results/<time>-<commit>.json)"
+    )
+    args = parser.parse_args()
+
+    profile = dict(PROFILES[args.profile])
+    if args.max_elements is not None:
+        profile["max_elements"] = args.max_elements
+    if args.max_bytes is not None:
+        profile["max_bytes"] = args.max_bytes
+
+    # Settings are read once on import, so configure the app before loading it
+    sys.path.insert(0, str(SERVER_DIR))
+    if not args.cache:
+        os.environ["RESULT_CACHE_ENABLED"] = "false"
+
+    from app.core.config import settings
+    from app.engine_wrapper import get_engine_fingerprint
+    from benchmarks import endpoints, native, wrapper
+
+    suites = args.suite or [*(["native"] if native.find_engine_bench() else []), "wrapper", "http"]
+    runners = {"native": native.run, "wrapper": wrapper.run, "http": endpoints.run}
+
+    output = args.output
+    if output is None:
+        commit = (environment()["commit"] or "unknown")[:10]
+        output = RESULTS_DIR / f"{datetime.now():%Y%m%d-%H%M%S}-{commit}.json"
+    output = output.resolve()
+
+    results = []
+    for suite in suites:
+        print(f"== {suite} ({args.profile})", flush=True)
+        for result in runners[suite](profile):
+            results.append(result)
+            print(format_result(result), flush=True)
+
+    write_results(output, args.profile, suites, results, {
+        "engine_fingerprint": get_engine_fingerprint(),
+        "engine_backend": settings.ENGINE_BACKEND,
+        "result_cache": args.cache,
+    })
+    print(f"\nSaved {len(results)} results to {output}")
+
+
+if __name__ == "__main__":
+    main()
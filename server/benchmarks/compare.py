@@ -0,0 +1,88 @@
+"""
+Compare two benchmark result files.
+
+    python -m benchmarks.compare baseline.json current.json [--threshold 10]
+
+Prints the change of every measurement present in both files and exits with
+status 1 when any of them is slower than the baseline by more than
+--threshold percent, so the command can gate a CI job.
+"""
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+from benchmarks.harness import format_seconds, load_results, result_id
+
+# Environment fields that make timings incomparable when they differ
+_ENVIRONMENT_KEYS = (
+    "machine", "processor", "cpu_count", "python", "implementation", "engine_backend", "result_cache"
+)
+
+
+def compare(baseline: dict, current: dict, metric: str, suites: Optional[List[str]] = None) -> List[dict]:
+    """Pair measurements by result_id and compute the relative change of metric."""
+    base_results: Dict[str, dict] = {result_id(r): r for r in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        if suites and result["suite"] not in suites:
+            continue
+        key = result_id(result)
+        base = base_results.get(key)
+        if base is None or metric not in base["stats"] or metric not in result["stats"]:
+            continue
+        before = base["stats"][metric]
+        after = result["stats"][metric]
+        rows.append({
+            "id": key,
+            "before": before,
+            "after": after,
+            "change": (after - before) / before * 100 if before else 0.0,
+        })
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent slowdown reported as a regression")
+    parser.add_argument("--metric", default="median", help="statistic to compare (median, min, mean, p95, p99)")
+    parser.add_argument("--suite", action="append", help="only compare this suite (repeatable)")
+    parser.add_argument("--all", action="store_true", help="list unchanged measurements too")
+    args = parser.parse_args()
+
+    baseline = load_results(args.baseline)
+    current = load_results(args.current)
+
+    for key in _ENVIRONMENT_KEYS:
+        before = baseline["environment"].get(key)
+        after = current["environment"].get(key)
+        if before != after:
+            print(f"warning: {key} differs ({before!r} -> {after!r}), timings may not be comparable")
+    if baseline["profile"] != current["profile"]:
+        print(f"warning: profiles differ ({baseline['profile']} -> {current['profile']})")
+
+    rows = compare(baseline, current, args.metric, args.suite)
+    regressions = [row for row in rows if row["change"] > args.threshold]
+    improvements = [row for row in rows if row["change"] < -args.threshold]
+
+    print(f"{baseline['environment'].get('commit') or '?'} -> {current['environment'].get('commit') or '?'}"
+          f" ({len(rows)} measurements, {args.metric}, threshold {args.threshold:g}%)\n")
+    for row in sorted(rows, key=lambda row: -row["change"]):
+        if not args.all and abs(row["change"]) <= args.threshold:
+            continue
+        marker = ""
+        if row["change"] > args.threshold:
+            marker = "SLOWER"
+        elif row["change"] < -args.threshold:
+            marker = "faster"
+        print(f"{row['id']:<64} {format_seconds(row['before']):>10} -> {format_seconds(row['after']):>10}"
+              f" {row['change']:+7.1f}%  {marker}")
+
+    print(f"\n{len(regressions)} slower, {len(improvements)} faster, "
+          f"{len(rows) - len(regressions) - len(improvements)} within {args.threshold:g}%")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Endpoint suite: end-to-end latency and throughput of the engine API.
+
+Requests go through the full FastAPI application (middleware, validation,
+executors, history persistence) with an in-process ASGI client, so results
+exclude the network and the HTTP server. The application runs in a
+temporary directory, so its history database is a throwaway file and not
+the development modelab.db.
+"""
+import asyncio
+import json
+import os
+import tempfile
+import time
+from contextlib import AsyncExitStack
+from typing import Callable, Iterator, List, Tuple
+import httpx
+from benchmarks.harness import make_result, percentile, summarize
+
+# Concurrent clients per scenario
+CONCURRENCY_LEVELS = (1, 16)
+
+Body = Tuple[bytes, dict]
+JSON_HEADERS = {"content-type": "application/json"}
+
+
+def _json(payload) -> Body:
+    return json.dumps(payload).encode(), JSON_HEADERS
+
+
+def _scenarios() -> List[Tuple[str, str, str, Callable[[int], Body], float, int]]:
+    """(name, method, path, body for request i, share of http_requests, payload bytes)."""
+    from app.core.binary_codec import BINARY_MEDIA_TYPE, encode_f64
+
+    text = _json({"text": "a" * 1024})
+    numbers = _json({"numbers": [float(i) for i in range(1000)]})
+    binary = (encode_f64(float(i) for i in range(100_000)), {"content-type": BINARY_MEDIA_TYPE})
+    batch = _json({
+        "operations": [
+            {"operation": "add", "params": {"a": i, "b": i}} if i % 2 else
+            {"operation": "process-string", "params": {"text": f"item {i}"}}
+            for i in range(1000)
+        ]
+    })
+    stream = (b"a" * (1 << 20), {"content-type": "text/plain"})
+    return [
+        ("add", "POST", "/api/v1/engine/add", lambda i: _json({"a": i, "b": 1}), 1.0, 0),
+        ("factorial", "POST", "/api/v1/engine/factorial", lambda i: _json({"n": i % 21}), 1.0, 0),
+        ("process-string", "POST", "/api/v1/engine/process-string", lambda i: text, 1.0, 1024),
+        ("sum-array-json", "POST", "/api/v1/engine/sum-array", lambda i: numbers, 0.5, 8000),
+        ("sum-array-binary", "POST", "/api/v1/engine/sum-array", lambda i: binary, 0.25, 800_000),
+        ("batch", "POST", "/api/v1/engine/batch", lambda i: batch, 0.05, 0),
+        ("process-string-stream", "POST", "/api/v1/engine/process-string/stream", lambda i: stream, 0.05, 1 << 20),
+        ("calculations", "GET", "/api/v1/engine/calculations?limit=100", lambda i: (b"", {}), 0.25, 0),
+    ]
+
+
+async def _run_scenario(client: httpx.AsyncClient, method: str, path: str, body: Callable[[int], Body],
+                        requests: int, concurrency: int) -> dict:
+    latencies: List[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client_loop():
+        nonlocal errors
+        for i in counter:
+            content, headers = body(i)
+            started = time.perf_counter()
+            response = await client.request(method, path, content=content or None, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            if response.status_code >= 400:
+                errors += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    stats = summarize(latencies)
+    stats.update({
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "requests_per_sec": len(latencies) / elapsed,
+        "errors": errors,
+    })
+    return stats
+
+
+def run(profile: dict) -> Iterator[dict]:
+    """Run every scenario and yield its measurements."""
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix="modelab-bench-") as workdir:
+        # main creates its SQLite database in the working directory on import
+        os.chdir(workdir)
+        loop = asyncio.new_event_loop()
+        stack = AsyncExitStack()
+        try:
+            import main
+
+            loop.run_until_complete(stack.enter_async_context(main.app.router.lifespan_context(main.app)))
+            client = loop.run_until_complete(stack.enter_async_context(httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=main.app), base_url="http://benchmark", timeout=None
+            )))
+            for name, method, path, body, share, nbytes in _scenarios():
+                requests = max(20, int(profile["http_requests"] * share))
+                # Warm up: first-call imports, executor threads, SQLite pages
+                loop.run_until_complete(_run_scenario(client, method, path, body, max(5, requests // 20), 1))
+                for concurrency in CONCURRENCY_LEVELS:
+                    stats = loop.run_until_complete(
+                        _run_scenario(client, method, path, body, requests, concurrency)
+                    )
+                    yield make_result("http", name, stats, {"concurrency": concurrency}, nbytes=nbytes)
+        finally:
+            loop.run_until_complete(stack.aclose())
+            loop.close()
+            os.chdir(previous_dir)
@@ -0,0 +1,205 @@
+"""
+Timing helpers, benchmark profiles and result files shared by the suites.
+
+Every measurement is a dict:
+
+    {"suite": "wrapper", "name": "sum_array", "params": {"input": "list"},
+     "size": 1000, "bytes": 8000, "stats": {"median": 1.2e-05, ...}}
+
+Times in stats are seconds per call. Results are identified across runs by
+result_id() (suite, name, params and size), which is what compare.py
+matches on.
+"""
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+SERVER_DIR = Path(__file__).resolve().parent.parent
+PROJECT_DIR = SERVER_DIR.parent
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+SCHEMA_VERSION = 1
+
+# Input size limits and timing effort per profile
+PROFILES = {
+    "quick": {
+        "max_elements": 10**5,
+        "max_bytes": 1 << 20,
+        "min_time": 0.01,
+        "repeat": 3,
+        "http_requests": 200,
+    },
+    "default": {
+        "max_elements": 10**7,
+        "max_bytes": 16 << 20,
+        "min_time": 0.05,
+        "repeat": 5,
+        "http_requests": 2000,
+    },
+    "full": {
+        "max_elements": 10**8,
+        "max_bytes": 256 << 20,
+        "min_time": 0.1,
+        "repeat": 7,
+        "http_requests": 10000,
+    },
+}
+
+
+def element_sizes(max_elements: int) -> List[int]:
+    """Array lengths 10, 100, ... up to max_elements."""
+    sizes = []
+    size = 10
+    while size <= max_elements:
+        sizes.append(size)
+        size *= 10
+    return sizes
+
+
+def byte_sizes(max_bytes: int) -> List[int]:
+    """String/buffer sizes from 16 bytes up to max_bytes (at most 256 MiB)."""
+    return [size for size in (16, 1 << 10, 64 << 10, 1 << 20, 16 << 20, 256 << 20) if size <= max_bytes]
+
+
+def summarize(samples: List[float], loops: int = 1) -> dict:
+    """Statistics of per-call durations in seconds."""
+    ordered = sorted(samples)
+    return {
+        "samples": len(ordered),
+        "loops": loops,
+        "min": ordered[0],
+        "median": statistics.median(ordered),
+        "mean": statistics.fmean(ordered),
+        "max": ordered[-1],
+        "stdev": statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+    }
+
+
+def percentile(ordered: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def measure(func: Callable[[], object], min_time: float, repeat: int) -> dict:
+    """
+    Time func like timeit: after a warm-up call, find a loop count whose run
+    lasts at least min_time, then take repeat samples of that many calls.
+    """
+    def run(loops: int) -> float:
+        started = time.perf_counter()
+        for _ in range(loops):
+            func()
+        return time.perf_counter() - started
+
+    run(1)
+    loops = 1
+    while True:
+        elapsed = run(loops)
+        if elapsed >= min_time:
+            break
+        scale = min_time / elapsed if elapsed > 0 else 10.0
+        loops = int(loops * min(max(scale * 1.2, 2.0), 10.0))
+
+    return summarize([run(loops) / loops for _ in range(repeat)], loops)
+
+
+def make_result(
+    suite: str,
+    name: str,
+    stats: dict,
+    params: Optional[dict] = None,
+    size: int = 1,
+    nbytes: int = 0
+) -> dict:
+    return {
+        "suite": suite,
+        "name": name,
+        "params": params or {},
+        "size": size,
+        "bytes": nbytes,
+        "stats": stats,
+    }
+
+
+def result_id(result: dict) -> str:
+    """Stable identifier of a measurement, e.g. wrapper/sum_array[input=list]/n=1000."""
+    params = ",".join(f"{key}={value}" for key, value in sorted(result["params"].items()))
+    name = f"{result['suite']}/{result['name']}"
+    if params:
+        name += f"[{params}]"
+    if result["size"] != 1:
+        name += f"/n={result['size']}"
+    return name
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def format_result(result: dict) -> str:
+    """One human-readable line per measurement."""
+    stats = result["stats"]
+    line = f"{result_id(result):<64} {format_seconds(stats['median']):>10}"
+    # Concurrent requests overlap, so HTTP throughput comes from the request rate
+    calls_per_sec = stats.get("requests_per_sec") or (1 / stats["median"] if stats["median"] > 0 else 0)
+    if result["bytes"]:
+        line += f"  {result['bytes'] * calls_per_sec / 1e6:10.1f} MB/s"
+    if "requests_per_sec" in stats:
+        line += f"  {stats['requests_per_sec']:10.1f} req/s  p99 {format_seconds(stats['p99'])}"
+    return line
+
+
+def _git(*args: str) -> Optional[str]:
+    try:
+        completed = subprocess.run(
+            ["git", *args], cwd=PROJECT_DIR, capture_output=True, text=True, timeout=10
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() if completed.returncode == 0 else None
+
+
+def environment() -> dict:
+    """Commit, interpreter and machine the results were measured on."""
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        "commit": _git("rev-parse", "HEAD"),
+        "dirty": bool(status) if status is not None else None,
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def write_results(path: Path, profile: str, suites: List[str], results: List[dict], extra: Dict[str, object]):
+    document = {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "profile": profile,
+        "suites": suites,
+        "environment": {**environment(), **extra},
+        "results": results,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(document, indent=2) + "\n")
+
+
+def load_results(path: Path) -> dict:
+    document = json.loads(Path(path).read_text())
+    if document.get("schema") != SCHEMA_VERSION:
+        raise ValueError(f"{path}: unsupported result schema {document.get('schema')!r}")
+    return document
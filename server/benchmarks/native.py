@@ -0,0 +1,46 @@
+"""
+Native suite: the engine functions timed in C++ by engine_bench.
+
+engine_bench is only built on request:
+
+    cd engine/build && cmake -DENGINE_BUILD_BENCHMARKS=ON .. && cmake --build .
+"""
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+from benchmarks.harness import PROJECT_DIR
+
+BUILD_DIR = PROJECT_DIR / "engine" / "build"
+
+
+def find_engine_bench() -> Optional[Path]:
+    """Locate the engine_bench executable next to the engine build."""
+    name = "engine_bench.exe" if sys.platform == "win32" else "engine_bench"
+    for path in (BUILD_DIR / "bin" / name, BUILD_DIR / "bin" / "Release" / name):
+        if path.exists():
+            return path
+    return None
+
+
+def run(profile: dict, executable: Optional[Path] = None) -> Iterator[dict]:
+    """Run engine_bench and yield its measurements as they are printed."""
+    executable = executable or find_engine_bench()
+    if executable is None:
+        raise FileNotFoundError(
+            "engine_bench not found; configure the engine with -DENGINE_BUILD_BENCHMARKS=ON and rebuild"
+        )
+    command = [
+        str(executable),
+        "--max-elements", str(profile["max_elements"]),
+        "--max-bytes", str(profile["max_bytes"]),
+        "--min-time", str(profile["min_time"]),
+        "--repeat", str(profile["repeat"]),
+    ]
+    with subprocess.Popen(command, stdout=subprocess.PIPE, text=True) as process:
+        for line in process.stdout:
+            if line.strip():
+                yield json.loads(line)
+    if process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, command)
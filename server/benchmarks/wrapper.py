@@ -0,0 +1,114 @@
+"""
+Wrapper suite: EngineWrapper methods across input sizes.
+
+Each method is measured at two layers:
+
+    wrapper  the EngineWrapper method as the router calls it (argument
+             conversion, output allocation, result decoding)
+    ctypes   the bare library function called through ctypes with
+             arguments converted beforehand
+
+wrapper minus ctypes is the marshalling cost per call; ctypes minus the
+native suite is the cost of the ctypes call itself.
+"""
+import array
+import ctypes
+from typing import Iterator
+from app.engine_wrapper import SUM_METHODS, _as_c_array, get_engine
+from benchmarks.harness import byte_sizes, element_sizes, make_result, measure
+
+try:
+    import numpy as np
+except ImportError:  # NumPy inputs are optional
+    np = None
+
+# Python lists above this length take gigabytes and say nothing new
+LIST_MAX_ELEMENTS = 10**7
+
+
+def run(profile: dict) -> Iterator[dict]:
+    """Yield wrapper and ctypes measurements."""
+    engine = get_engine()
+    lib = engine.lib
+
+    def bench(name, func, params, size=1, nbytes=0):
+        stats = measure(func, profile["min_time"], profile["repeat"])
+        return make_result("wrapper", name, stats, params, size, nbytes)
+
+    yield bench("add", lambda: engine.add(123456, 654321), {"layer": "wrapper"})
+    yield bench("add", lambda: lib.add(123456, 654321), {"layer": "ctypes"})
+    yield bench("multiply", lambda: engine.multiply(1234, 4321), {"layer": "wrapper"})
+    yield bench("multiply", lambda: lib.multiply(1234, 4321), {"layer": "ctypes"})
+    yield bench("factorial", lambda: engine.factorial(20), {"layer": "wrapper"})
+    yield bench("factorial", lambda: lib.factorial(20), {"layer": "ctypes"})
+    yield bench("factorial_big", lambda: engine.factorial_big(1000), {"layer": "wrapper", "n": 1000})
+    digits = ctypes.create_string_buffer(4096)
+    yield bench("factorial_big", lambda: lib.factorial_big(1000, digits, 4096), {"layer": "ctypes", "n": 1000})
+
+    for size in byte_sizes(profile["max_bytes"]):
+        text = "a" * size
+        data = text.encode("ascii")
+        out = bytearray(size)
+        out_array = (ctypes.c_char * size).from_buffer(out)
+        yield bench("process_string", lambda: engine.process_string(text), {"layer": "wrapper"}, size, size)
+        yield bench("process_bytes", lambda: engine.process_bytes(data, out), {"layer": "wrapper"}, size, size)
+        yield bench(
+            "process_bytes", lambda: lib.process_bytes(data, out_array, size), {"layer": "ctypes"}, size, size
+        )
+        del out_array
+
+    for size in element_sizes(profile["max_elements"]):
+        nbytes = size * 8
+        values = array.array("d", bytes(nbytes))
+        inputs = {"array": values}
+        if size <= LIST_MAX_ELEMENTS:
+            inputs["list"] = values.tolist()
+        if np is not None:
+            inputs["ndarray"] = np.frombuffer(values, dtype=np.float64)
+        for kind, numbers in inputs.items():
+            yield bench(
+                "sum_array", lambda: engine.sum_array(numbers, "naive"),
+                {"layer": "wrapper", "input": kind}, size, nbytes
+            )
+        pointer, length, keepalive = _as_c_array(values, ctypes.c_double)
+        yield bench(
+            "sum_array", lambda: lib.sum_array_ex(pointer, length, SUM_METHODS["naive"], 1),
+            {"layer": "ctypes", "input": "array"}, size, nbytes
+        )
+        timestamps = array.array("d", range(size))
+        for method in ("lttb", "minmax"):
+            yield bench(
+                "downsample", lambda: engine.downsample(timestamps, values, 1000, method),
+                {"layer": "wrapper", "method": method, "points": 1000}, size, nbytes * 2
+            )
+        del inputs, pointer, keepalive, timestamps
+
+    for size in element_sizes(min(profile["max_elements"], LIST_MAX_ELEMENTS)):
+        nbytes = size * 4
+        a = array.array("i", [3]) * size
+        b = array.array("i", [4]) * size
+        n = array.array("i", [12]) * size
+        out = array.array("i", bytes(nbytes))
+        factorials = array.array("q", bytes(size * 8))
+        yield bench(
+            "add_arrays", lambda: engine.add_arrays(a, b, out),
+            {"layer": "wrapper", "input": "array"}, size, nbytes
+        )
+        if size <= 10**6:
+            a_list, b_list = a.tolist(), b.tolist()
+            yield bench(
+                "add_arrays", lambda: engine.add_arrays(a_list, b_list),
+                {"layer": "wrapper", "input": "list"}, size, nbytes
+            )
+        a_ptr, _, a_keep = _as_c_array(a, ctypes.c_int)
+        b_ptr, _, b_keep = _as_c_array(b, ctypes.c_int)
+        out_ptr, _, out_keep = _as_c_array(out, ctypes.c_int)
+        yield bench(
+            "add_arrays", lambda: lib.add_arrays(a_ptr, b_ptr, out_ptr, size),
+            {"layer": "ctypes", "input": "array"}, size, nbytes
+        )
+        yield bench(
+            "factorial_many", lambda: engine.factorial_many(n, factorials),
+            {"layer": "wrapper", "input": "array"}, size, nbytes
+        )
+        del a_ptr, b_ptr, out_ptr, a_keep, b_keep, out_keep
@@ -1,20 +1,91 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from sqlalchemy import insert, select, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from app.routers import engine
+from app.core import calculation_stats, metrics
+from app.core.calculation_feed import calculation_feed
 from app.core.config import settings
-from app.core.database import engine as db_engine, Base
+from app.core.executor import engine_executor, ExecutorSaturatedError
+from app.core.history_retention import history_compactor
+from app.core.history_writer import history_writer
+from app.core.process_backend import engine_process_pool
+from app.core.database import engine as db_engine, async_engine, Base
 from app.models import database
 from app.admin import setup_admin
 
+# modelab_metadata key of the one-off SQLite created_at migration
+CREATED_AT_MIGRATION_KEY = "sqlite_created_at_microseconds"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if engine_process_pool is not None:
+        engine_process_pool.start()
+    if async_engine.url.database in (None, "", ":memory:"):
+        # An in-memory database is not shared with the sync engine that created the tables
+        async with async_engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+    # Aggregate the history recorded before engine_calculation_stats existed (first start only)
+    await calculation_stats.backfill()
+    history_writer.start()
+    history_compactor.start()
+    calculation_feed.start()
+    yield
+    # End live streams first so they do not hold the connections open
+    await calculation_feed.stop()
+    # Flush queued history rows, then let in-flight engine calls finish
+    await history_compactor.stop()
+    await history_writer.stop()
+    engine_executor.shutdown(wait=True)
+    if engine_process_pool is not None:
+        engine_process_pool.stop()
+    await async_engine.dispose()
+
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    description="FastAPI Backend Application"
+    description="FastAPI Backend Application",
+    lifespan=lifespan
 )
 
 # Create database tables
 Base.metadata.create_all(bind=db_engine)
 
+# Add indexes introduced after the table was first created
+for index in database.EngineCalculation.__table__.indexes:
+    index.create(bind=db_engine, checkfirst=True)
+
+
+def migrate_sqlite_created_at():
+    """
+    Pad created_at values written by CURRENT_TIMESTAMP to microseconds.
+
+    They lack the fraction SQLAlchemy stores, which breaks exact
+    (created_at, id) keyset comparisons on SQLite. New rows get a
+    microsecond timestamp from the model, so this runs once per database
+    and is recorded in modelab_metadata.
+    """
+    metadata = database.ModelabMetadata.__table__
+    with db_engine.begin() as connection:
+        if connection.scalar(select(metadata.c.key).where(metadata.c.key == CREATED_AT_MIGRATION_KEY)):
+            return
+        updated = connection.execute(text(
+            "UPDATE engine_calculations SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )).rowcount
+        # OR IGNORE: another process starting at the same time may have recorded it already
+        connection.execute(
+            insert(metadata).prefix_with("OR IGNORE").values(key=CREATED_AT_MIGRATION_KEY, value=f"{updated} rows")
+        )
+
+
+if db_engine.dialect.name == "sqlite":
+    migrate_sqlite_created_at()
+
 # Set up SQLAdmin for database preview
 admin = setup_admin(app)
 
@@ -27,6 +98,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (outermost, so the timings include the other middleware)
+if settings.METRICS_ENABLED:
+    app.add_middleware(metrics.MetricsMiddleware)
+
+@app.exception_handler(ExecutorSaturatedError)
+async def executor_saturated_handler(request: Request, exc: ExecutorSaturatedError):
+    """Apply backpressure when a worker pool is full."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": str(exc)},
+        headers={"Retry-After": "1"}
+    )
+
+
+@app.exception_handler(PoolTimeoutError)
+async def database_pool_timeout_handler(request: Request, exc: PoolTimeoutError):
+    """Apply backpressure when no database connection frees up within DATABASE_POOL_TIMEOUT."""
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "The database connection pool is exhausted"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include routers
 app.include_router(engine.router, prefix="/api/v1/engine", tags=["engine"])
 
@@ -44,3 +139,10 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint():
+    """Prometheus scrape endpoint."""
+    if not settings.METRICS_ENABLED:
+        return PlainTextResponse("Metrics are disabled", status_code=status.HTTP_404_NOT_FOUND)
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
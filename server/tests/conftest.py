@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+import pytest
+
+# Make the app package importable when pytest is run from server/ or the repo root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Point the app at a throwaway database before app.core.config is imported
+_database_dir = tempfile.mkdtemp(prefix="modelab-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{_database_dir}/modelab.db"
+
+
+@pytest.fixture(scope="session")
+def client():
+    """Test client for the application, with its lifespan running for the whole session."""
+    from fastapi.testclient import TestClient
+    from main import app
+
+    with TestClient(app) as test_client:
+        yield test_client
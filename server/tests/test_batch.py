@@ -0,0 +1,67 @@
+import json
+from app.core.history_writer import compact_result, history_writer, make_calculation_row
+
+
+def test_batch_limits_total_big_factorial_work(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "BATCH_MAX_BIG_FACTORIAL_N", 100)
+    response = client.post("/api/v1/engine/batch", json={"operations": [
+        {"operation": "factorial", "params": {"n": 60}},
+        {"operation": "factorial", "params": {"n": 50}},
+        {"operation": "factorial", "params": {"n": 40}},
+        {"operation": "factorial", "params": {"n": 5}},
+    ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["success"] for item in results] == [True, False, True, True]
+    assert "100" in results[1]["message"]
+    assert results[3]["result"] == 120
+
+
+def test_large_result_is_compacted_in_history():
+    digits = "7" * 10_000
+    row = make_calculation_row("factorial", '{"n": 3000}', digits, True, "ok")
+    stored = json.loads(row["result"])
+    assert stored["truncated"] is True
+    assert stored["bytes"] == len(digits)
+    assert stored["preview"] == digits[:256]
+    assert compact_result("120") == "120"
+    assert compact_result(None) is None
+
+
+def test_batch_results_keep_input_order(client):
+    operations = [
+        {"operation": "add", "params": {"a": 1, "b": 2}},
+        {"operation": "multiply", "params": {"a": 3, "b": 4}},
+        {"operation": "add", "params": {"a": "x", "b": 2}},
+        {"operation": "factorial", "params": {"n": 5}},
+        {"operation": "process-string", "params": {"text": "abc"}},
+        {"operation": "sum-array", "params": {"numbers": [1.5, 2.5]}},
+        {"operation": "multiply", "params": {"a": -2, "b": 8}},
+    ]
+    response = client.post("/api/v1/engine/batch", json={"operations": operations})
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["index"] for item in body["results"]] == list(range(len(operations)))
+    assert [item["operation"] for item in body["results"]] == [op["operation"] for op in operations]
+    results = [item["result"] for item in body["results"]]
+    assert results[:2] == [3, 12]
+    assert body["results"][2]["success"] is False
+    assert body["results"][2]["message"].startswith("Invalid parameters")
+    assert results[3:] == [120, "ABC", 4.0, -16]
+    assert (body["succeeded"], body["failed"]) == (6, 1)
+
+
+def test_vectorized_batch_matches_single_calls(client):
+    operations = [{"operation": "multiply", "params": {"a": i, "b": i - 50}} for i in range(100)]
+    results = client.post("/api/v1/engine/batch", json={"operations": operations}).json()["results"]
+    assert [item["result"] for item in results] == [i * (i - 50) for i in range(100)]
+
+
+def test_batch_over_operation_limit_is_rejected(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "BATCH_MAX_OPERATIONS", 3)
+    operations = [{"operation": "add", "params": {"a": i, "b": 1}} for i in range(4)]
+    assert client.post("/api/v1/engine/batch", json={"operations": operations}).status_code == 413
@@ -0,0 +1,58 @@
+import struct
+import pytest
+from app.core.binary_codec import (
+    BINARY_MEDIA_TYPE, BinaryPayloadError, HEADER, decode_f64, encode_f64, is_binary_media_type
+)
+
+
+def test_encode_decode_round_trip():
+    values = [0.0, -1.5, 1e300, 3.25]
+    payload = encode_f64(values)
+    assert len(payload) == HEADER.size + 8 * len(values)
+    assert payload[:4] == b"MLF8"
+    assert list(decode_f64(bytearray(payload))) == values
+    assert list(decode_f64(bytearray(encode_f64([])))) == []
+
+
+@pytest.mark.parametrize("payload,error", [
+    (b"MLF8", "shorter"),
+    (b"XXXX" + encode_f64([1.0])[4:], "magic"),
+    (HEADER.pack(b"MLF8", 2, 1, 0, 0), "version"),
+    (HEADER.pack(b"MLF8", 1, 2, 0, 0), "element type"),
+    (encode_f64([1.0, 2.0])[:-1], "element count"),
+])
+def test_malformed_payloads_are_rejected(payload, error):
+    with pytest.raises(BinaryPayloadError, match=error):
+        decode_f64(bytearray(payload))
+
+
+def test_media_type_matching():
+    assert is_binary_media_type(BINARY_MEDIA_TYPE)
+    assert is_binary_media_type(f"application/json, {BINARY_MEDIA_TYPE.upper()}; q=0.9")
+    assert not is_binary_media_type("application/json")
+    assert not is_binary_media_type(None)
+
+
+def test_sum_array_binary_request_and_response(client):
+    numbers = [0.5] * 1000 + [1e16, 1.0, -1e16]
+    response = client.post(
+        "/api/v1/engine/sum-array",
+        params={"method": "kahan"},
+        content=encode_f64(numbers),
+        headers={"Content-Type": BINARY_MEDIA_TYPE, "Accept": BINARY_MEDIA_TYPE}
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"] == BINARY_MEDIA_TYPE
+    assert list(decode_f64(bytearray(response.content))) == [501.0]
+
+    json_response = client.post("/api/v1/engine/sum-array", json={"numbers": numbers, "method": "kahan"})
+    assert json_response.json()["result"] == 501.0
+
+
+def test_sum_array_rejects_malformed_binary_body(client):
+    response = client.post(
+        "/api/v1/engine/sum-array",
+        content=struct.pack("<d", 1.0),
+        headers={"Content-Type": BINARY_MEDIA_TYPE}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,56 @@
+import json
+from app.core.calculation_feed import CalculationFeed, calculation_feed
+from app.core.history_writer import history_writer, insert_with_new_session, make_calculation_row
+
+
+def _rows(operation_type, count, success=True):
+    return [
+        make_calculation_row(operation_type, json.dumps({"i": i}), str(i), success, "ok") for i in range(count)
+    ]
+
+
+def test_subscribers_receive_new_matching_rows(client):
+    async def scenario():
+        # Rows queued by earlier tests would be published too
+        await history_writer.flush()
+        everything = await calculation_feed.subscribe()
+        failures = await calculation_feed.subscribe(success=False)
+        adds = await calculation_feed.subscribe(operation_type="feed-add")
+        try:
+            # The insert wakes the feed task, which publishes the rows of one poll together
+            await insert_with_new_session(_rows("feed-add", 2) + _rows("feed-multiply", 1, success=False))
+            return [(await subscription.get(timeout=1.0)) for subscription in (everything, failures, adds)]
+        finally:
+            for subscription in (everything, failures, adds):
+                calculation_feed.unsubscribe(subscription)
+
+    everything, failures, adds = client.portal.call(scenario)
+    assert [event[1] for event in everything[0]] == ["feed-add", "feed-add", "feed-multiply"]
+    assert [event[1] for event in failures[0]] == ["feed-multiply"]
+    assert [json.loads(event[3])["input_data"] for event in adds[0]] == ['{"i": 0}', '{"i": 1}']
+    assert everything[1] == failures[1] == adds[1] == 0
+
+
+def test_slow_subscriber_gets_a_dropped_count(client):
+    feed = CalculationFeed(poll_interval=60, batch_size=2, max_queue=3, max_subscribers=1)
+
+    async def scenario():
+        feed.start()
+        try:
+            subscription = await feed.subscribe()
+            await insert_with_new_session(_rows("feed-test", 5))
+            await feed.poll()
+            return await subscription.get(timeout=1.0), feed.stats()
+        finally:
+            await feed.stop()
+
+    (events, dropped), stats = client.portal.call(scenario)
+    assert len(events) == 3
+    assert dropped == 2
+    assert (stats["published"], stats["delivered"], stats["dropped"]) == (5, 3, 2)
+
+
+def test_live_endpoint_rejects_subscribers_over_the_limit(client, monkeypatch):
+    monkeypatch.setattr(calculation_feed, "max_subscribers", 0)
+    response = client.get("/api/v1/engine/calculations/live")
+    assert response.status_code == 503
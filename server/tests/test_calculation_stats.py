@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from sqlalchemy import select
+from app.core import calculation_stats
+from app.core.calculation_stats import Bucket, apply_buckets
+from app.core.database import AsyncSessionLocal
+from app.models.database import EngineCalculationStats
+
+HOUR = datetime(2024, 1, 1, 12, tzinfo=timezone.utc)
+
+
+async def _apply_all(batches, operation_type="stats-test"):
+    for buckets in batches:
+        async with AsyncSessionLocal() as db:
+            await apply_buckets(db, EngineCalculationStats, buckets)
+            await db.commit()
+    async with AsyncSessionLocal() as db:
+        return (await db.scalars(
+            select(EngineCalculationStats).where(EngineCalculationStats.operation_type == operation_type)
+        )).all()
+
+
+def test_apply_buckets_merges_into_existing_rows(client):
+    key = ("stats-test", HOUR)
+    with_results = Bucket(calls=2, failures=0, input_bytes=10)
+    with_results.add_result(3.0)
+    with_results.add_result(5.0)
+    failures_only = Bucket(calls=1, failures=1, input_bytes=4)
+    lower = Bucket(calls=1, failures=0, input_bytes=2)
+    lower.add_result(-1.0)
+
+    rows = client.portal.call(_apply_all, [{key: with_results}, {key: failures_only}, {key: lower}])
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row.calls, row.failures, row.input_bytes) == (4, 1, 16)
+    assert (row.result_count, row.result_sum, row.result_min, row.result_max) == (3, 7.0, -1.0, 5.0)
+
+
+def test_apply_buckets_without_upsert_support(client, monkeypatch):
+    monkeypatch.setattr(calculation_stats, "_DIALECT_INSERTS", {})
+    key = ("stats-generic-test", HOUR)
+    first = Bucket(calls=2, failures=1, input_bytes=6)
+    first.add_result(4.0)
+    failures_only = Bucket(calls=1, failures=1, input_bytes=3)
+    second = Bucket(calls=1, failures=0, input_bytes=1)
+    second.add_result(9.0)
+
+    rows = client.portal.call(
+        _apply_all, [{key: first}, {key: failures_only}, {key: second}], "stats-generic-test"
+    )
+
+    assert len(rows) == 1
+    row = rows[0]
+    assert (row.calls, row.failures, row.input_bytes) == (4, 2, 10)
+    assert (row.result_count, row.result_sum, row.result_min, row.result_max) == (2, 13.0, 4.0, 9.0)
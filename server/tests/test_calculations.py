@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+from app.core.history_writer import history_writer
+
+
+def test_created_after_with_utc_offset_selects_the_same_rows(client):
+    started = datetime.now(timezone.utc)
+    response = client.post(
+        "/api/v1/engine/batch",
+        json={"operations": [{"operation": "add", "params": {"a": i, "b": 1}} for i in range(5)]}
+    )
+    assert response.status_code == 200
+    client.portal.call(history_writer.flush)
+
+    def count(created_after: datetime, created_before: datetime) -> int:
+        response = client.get("/api/v1/engine/calculations", params={
+            "operation_type": "add",
+            "created_after": created_after.isoformat(),
+            "created_before": created_before.isoformat(),
+            "format": "ndjson",
+        })
+        assert response.status_code == 200
+        return len(response.text.splitlines())
+
+    ended = datetime.now(timezone.utc) + timedelta(seconds=1)
+    plus_five = timezone(timedelta(hours=5))
+    assert count(started, ended) == 5
+    assert count(started.astimezone(plus_five), ended.astimezone(plus_five)) == 5
+    # The same wall-clock times in +05:00 lie five hours earlier
+    assert count(started.replace(tzinfo=plus_five), ended.replace(tzinfo=plus_five)) == 0
+
+
+def test_series_over_row_limit_keeps_newest_rows(client, monkeypatch):
+    from app.core.config import settings
+
+    # Rows are timestamped to the microsecond, so earlier tests' factorials stay out
+    started = datetime.now(timezone.utc)
+    for n in range(1, 7):
+        assert client.post("/api/v1/engine/factorial", json={"n": n}).status_code == 200
+    client.portal.call(history_writer.flush)
+    params = {"operation_type": "factorial", "created_after": started.isoformat()}
+
+    response = client.get("/api/v1/engine/calculations/series", params=params)
+    assert response.status_code == 200
+    assert response.json()["truncated"] is False
+    assert [point["value"] for point in response.json()["points"]] == [1, 2, 6, 24, 120, 720]
+
+    monkeypatch.setattr(settings, "CALCULATIONS_SERIES_MAX_ROWS", 4)
+    response = client.get("/api/v1/engine/calculations/series", params=params)
+    assert response.status_code == 200
+    series = response.json()
+    assert series["truncated"] is True
+    assert series["rows"] == 4
+    assert [point["value"] for point in series["points"]] == [6, 24, 120, 720]
@@ -0,0 +1,42 @@
+from sqlalchemy import delete, insert, select, text
+import main
+from app.core.database import engine as db_engine
+from app.models.database import EngineCalculation, ModelabMetadata
+
+
+def _created_at(connection, row_id):
+    return connection.scalar(text("SELECT created_at FROM engine_calculations WHERE id = :id"), {"id": row_id})
+
+
+def test_created_at_migration_runs_once(client):
+    metadata = ModelabMetadata.__table__
+    with db_engine.begin() as connection:
+        assert connection.scalar(select(metadata.c.value).where(metadata.c.key == main.CREATED_AT_MIGRATION_KEY))
+        connection.execute(delete(metadata).where(metadata.c.key == main.CREATED_AT_MIGRATION_KEY))
+        row_id = connection.execute(text(
+            "INSERT INTO engine_calculations (operation_type, input_data, success, created_at) "
+            "VALUES ('add', '{}', 1, '2020-01-01 00:00:00')"
+        )).lastrowid
+
+    main.migrate_sqlite_created_at()
+    with db_engine.begin() as connection:
+        assert _created_at(connection, row_id) == "2020-01-01 00:00:00.000000"
+        connection.execute(text(
+            "UPDATE engine_calculations SET created_at = '2020-01-01 00:00:00' WHERE id = :id"
+        ), {"id": row_id})
+
+    # Recorded in modelab_metadata, so the next start leaves the table alone
+    main.migrate_sqlite_created_at()
+    with db_engine.begin() as connection:
+        assert _created_at(connection, row_id) == "2020-01-01 00:00:00"
+        connection.execute(delete(EngineCalculation.__table__).where(EngineCalculation.id == row_id))
+
+
+def test_created_at_default_has_microseconds(client):
+    with db_engine.begin() as connection:
+        row_id = connection.execute(
+            insert(EngineCalculation.__table__).values(operation_type="add", input_data="{}", success=1)
+        ).inserted_primary_key[0]
+        created_at = _created_at(connection, row_id)
+        connection.execute(delete(EngineCalculation.__table__).where(EngineCalculation.id == row_id))
+    assert len(created_at) == 26
@@ -0,0 +1,25 @@
+def test_reload_without_a_new_build_keeps_the_engine(client):
+    before = client.get("/api/v1/engine/reload/status").json()
+    response = client.post("/api/v1/engine/reload")
+    assert response.status_code == 200
+    assert response.json()["reloaded"] is False
+    assert response.json()["version"] == before["version"]
+
+
+def test_forced_reload_swaps_in_a_new_version(client):
+    before = client.get("/api/v1/engine/reload/status").json()
+    response = client.post("/api/v1/engine/reload", params={"force": True})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reloaded"] is True
+    assert body["reloads"] == before["reloads"] + 1
+    assert body["version"] != before["version"]
+    assert body["in_flight"] == 0
+    assert client.post("/api/v1/engine/multiply", json={"a": 6, "b": 7}).json()["result"] == 42
+
+
+def test_reload_can_be_disabled(client, monkeypatch):
+    from app.core.config import settings
+
+    monkeypatch.setattr(settings, "ENGINE_RELOAD_ENABLED", False)
+    assert client.post("/api/v1/engine/reload").status_code == 403
@@ -0,0 +1,91 @@
+import array
+import math
+import pytest
+from app.engine_wrapper import _ThreadLocalBufferPool, get_engine
+
+
+def test_typed_byte_arrays_are_converted_by_value():
+    engine = get_engine()
+    assert engine.sum_array(array.array("b", [1] * 8)) == 8.0
+    assert engine.sum_array(array.array("B", [1] * 7)) == 7.0
+    assert engine.sum_array(memoryview(array.array("b", [2] * 8))) == 16.0
+    result = engine.add_arrays(array.array("b", [1, 2, 3, 4]), array.array("B", [1, 1, 1, 1]))
+    assert list(result) == [2, 3, 4, 5]
+
+
+def test_raw_byte_buffers_are_reinterpreted():
+    engine = get_engine()
+    raw = array.array("d", [1.5, 2.5, 4.0]).tobytes()
+    assert engine.sum_array(raw) == 8.0
+    assert engine.sum_array(bytearray(raw)) == 8.0
+    assert engine.sum_array(memoryview(raw)) == 8.0
+    ints = array.array("i", [5, 6]).tobytes()
+    assert list(engine.add_arrays(ints, bytearray(ints))) == [10, 12]
+
+
+def test_generated_methods_accept_keyword_arguments():
+    engine = get_engine()
+    assert engine.add(a=1, b=2) == 3
+    assert engine.multiply(3, b=4) == 12
+    assert engine.factorial(n=5) == 120
+    with pytest.raises(TypeError):
+        engine.add(1, c=2)
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+@pytest.mark.parametrize("length,threshold", [(2, 2), (10, 3), (1000, 50), (1001, 64), (37, 100)])
+def test_downsample_keeps_endpoints_and_sorted_unique_indices(method, length, threshold):
+    engine = get_engine()
+    x = [float(i) for i in range(length)]
+    y = [math.sin(i / 7.0) * (i % 13) for i in range(length)]
+    indices = list(engine.downsample(x, y, threshold, method=method))
+    assert indices[0] == 0
+    assert indices[-1] == length - 1
+    assert indices == sorted(set(indices))
+    assert len(indices) <= min(threshold, length)
+
+
+@pytest.mark.parametrize("n", [0, 1, 20, 21, 25, 100, 1000, 1500])
+def test_factorial_big_matches_math_factorial(n):
+    assert get_engine().factorial_big(n) == str(math.factorial(n))
+
+
+@pytest.mark.parametrize("method", ["kahan", "pairwise"])
+@pytest.mark.parametrize("threads", [1, 4])
+def test_accurate_sums_match_fsum(method, threads):
+    engine = get_engine()
+    numbers = [0.1] * 1_000_000
+    expected = math.fsum(numbers)
+    naive_error = abs(engine.sum_array(numbers, method="naive", threads=1) - expected)
+    error = abs(engine.sum_array(numbers, method=method, threads=threads) - expected)
+    assert error <= 1e-12 * expected
+    assert error < naive_error
+
+
+@pytest.mark.parametrize("threads", [1, 4])
+def test_kahan_sum_keeps_small_terms_next_to_large_ones(threads):
+    numbers = [1e16, 1.0, -1e16] * 1000 + [0.1] * 10_000
+    assert get_engine().sum_array(numbers, method="kahan", threads=threads) == pytest.approx(math.fsum(numbers), rel=1e-12)
+
+
+@pytest.mark.parametrize("length", [0, 1, 7, 8, 9, 15, 16, 17, 31, 33, 63, 65, 1000])
+@pytest.mark.parametrize("offset", [0, 1, 3, 5])
+def test_swar_uppercase_matches_bytes_upper(length, offset):
+    engine = get_engine()
+    source = bytes(range(256)) * (length // 256 + 1)
+    data = source[offset:offset + length]
+    out = bytearray(length + offset)
+    # Write to an unaligned view as well as read from one
+    assert engine.process_bytes(data, memoryview(out)[offset:]) == len(data)
+    assert bytes(out[offset:]) == data.upper()
+    text = "".join(chr(c) for c in range(32, 127)) * 3
+    assert engine.process_string(text[offset:offset + length]) == text[offset:offset + length].upper()
+
+
+def test_empty_string_keeps_the_pooled_buffer():
+    pool = _ThreadLocalBufferPool(max_bytes=1 << 20)
+    assert len(pool.get(0)[0]) == 0
+    entry = pool.get(100)
+    assert pool.get(0) is entry
+    assert pool.get(128) is entry
+    assert get_engine().process_string("") == ""
@@ -0,0 +1,50 @@
+import asyncio
+import threading
+from app.core.executor import BoundedExecutor
+
+
+def test_cancelled_queued_calls_release_their_slots():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=3)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(executor.run(release.wait))
+        queued = [asyncio.ensure_future(executor.run(lambda: None)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        assert executor.stats()["in_flight"] == 4
+
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        assert executor.stats()["in_flight"] == 1
+
+        release.set()
+        await running
+        assert executor.stats()["in_flight"] == 0
+        # Every slot is free again
+        await asyncio.gather(*(executor.run(lambda: None) for _ in range(executor.capacity)))
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        release.set()
+        executor.shutdown()
+    assert executor.stats()["in_flight"] == 0
+
+
+def test_failed_calls_release_their_slots():
+    executor = BoundedExecutor("test", max_workers=1, max_queue=0)
+
+    def fail():
+        raise ValueError("boom")
+
+    async def scenario():
+        for _ in range(3):
+            try:
+                await executor.run(fail)
+            except ValueError:
+                pass
+
+    asyncio.run(scenario())
+    executor.shutdown()
+    assert executor.stats() == {"name": "test", "max_workers": 1, "max_queue": 0, "in_flight": 0, "rejected": 0}
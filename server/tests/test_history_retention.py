@@ -0,0 +1,21 @@
+from app.core.history_retention import HistoryCompactor, history_compactor
+
+
+def _compactor(**limits) -> HistoryCompactor:
+    options = dict(
+        retention_days=0, max_rows=0, retention_days_by_operation={}, max_rows_by_operation={},
+        input_max_bytes=4096, batch_size=100, interval=3600
+    )
+    options.update(limits)
+    return HistoryCompactor(**options)
+
+
+def test_retention_is_opt_in(client):
+    assert not history_compactor.has_limits
+    assert client.get("/api/v1/engine/history/status").json()["compaction"]["running"] is False
+
+
+def test_any_limit_enables_retention():
+    assert not _compactor().has_limits
+    assert _compactor(retention_days=30).has_limits
+    assert _compactor(max_rows_by_operation={"sum-array": 10}).has_limits
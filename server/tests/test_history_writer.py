@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+from app.core.history_writer import history_writer
+
+
+def _history_count(client, operation_type: str, created_after: datetime) -> int:
+    response = client.get(
+        "/api/v1/engine/calculations",
+        params={"operation_type": operation_type, "created_after": created_after.isoformat(), "format": "ndjson"}
+    )
+    assert response.status_code == 200
+    return len(response.text.splitlines())
+
+
+def test_batch_larger_than_history_buffer_is_persisted(client, monkeypatch):
+    monkeypatch.setattr(history_writer, "max_buffer", 10)
+    before = history_writer.stats()
+    started = datetime.now(timezone.utc)
+
+    response = client.post(
+        "/api/v1/engine/batch",
+        json={"operations": [{"operation": "multiply", "params": {"a": i, "b": 3}} for i in range(25)]}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["succeeded"] == 25
+    after = history_writer.stats()
+    assert after["written_inline"] - before["written_inline"] == 25
+    assert _history_count(client, "multiply", started) == 25
@@ -0,0 +1,20 @@
+import json
+from app.core.history_writer import history_writer
+
+
+def test_streamed_process_string_records_no_result(client):
+    response = client.post(
+        "/api/v1/engine/process-string/stream",
+        content=b"hello streaming world",
+        headers={"Content-Type": "text/plain"}
+    )
+    assert response.status_code == 200
+    assert response.content == b"HELLO STREAMING WORLD"
+    client.portal.call(history_writer.flush)
+
+    calculation = client.get(
+        "/api/v1/engine/calculations", params={"operation_type": "process-string", "limit": 1}
+    ).json()[0]
+    assert json.loads(calculation["input_data"]) == {"bytes": 21, "streamed": True}
+    assert calculation["result"] is None
+    assert calculation["message"] == "Successfully processed 21 bytes"
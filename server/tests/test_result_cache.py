@@ -0,0 +1,47 @@
+from app.core.result_cache import MemoryCacheBackend, SQLiteCacheBackend, _MISSING, _entry_size
+
+
+def test_memory_backend_evicts_least_recently_used_beyond_max_bytes():
+    value = "x" * 1000
+    size = _entry_size("a", value)
+    cache = MemoryCacheBackend(max_entries=100, ttl=60, max_bytes=3 * size)
+
+    for key in ("a", "b", "c"):
+        cache.set(key, value)
+    assert cache.get("a") == value  # "b" is now the least recently used
+    cache.set("d", value)
+
+    assert cache.get("b") is _MISSING
+    assert [cache.get(key) == value for key in ("a", "c", "d")] == [True, True, True]
+    assert cache.bytes == 3 * size
+    assert cache.evictions == 1
+
+
+def test_memory_backend_skips_results_larger_than_max_bytes():
+    cache = MemoryCacheBackend(max_entries=100, ttl=60, max_bytes=10_000)
+    cache.set("small", 42)
+    cache.set("large", "x" * 20_000)
+
+    assert cache.get("large") is _MISSING
+    assert cache.get("small") == 42
+    assert cache.bytes == _entry_size("small", 42)
+    cache.set("small", 43)
+    assert cache.bytes == _entry_size("small", 43)
+    cache.clear()
+    assert cache.bytes == 0
+
+
+def test_shared_backend_purges_expired_and_oldest_entries(tmp_path):
+    cache = SQLiteCacheBackend(str(tmp_path / "cache.db"), ttl=60, max_entries=5, purge_every=4)
+    for index in range(8):
+        cache.set(f"key{index}", index)
+    # Purged after the 4th write (4 entries) and the 8th (8 -> 5)
+    count = cache._connection.execute("SELECT count(*) FROM engine_result_cache").fetchone()[0]
+    assert count == 5
+    assert [cache.get(f"key{index}") for index in range(3)] == [_MISSING] * 3
+    assert cache.get("key7") == 7
+
+    expired = SQLiteCacheBackend(str(tmp_path / "expired.db"), ttl=-1, max_entries=100)
+    expired.set("old", 1)
+    expired.purge_expired()
+    assert expired._connection.execute("SELECT count(*) FROM engine_result_cache").fetchone()[0] == 0
@@ -0,0 +1,95 @@
+import asyncio
+import pytest
+from app.core.singleflight import SingleFlight
+
+
+def _by_args(method, args):
+    return f"{method}:{args}"
+
+
+def test_concurrent_identical_calls_run_once():
+    async def scenario():
+        flight = SingleFlight(_by_args)
+        calls = 0
+
+        async def call():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(flight.run("add", "add", (1, 2), call) for _ in range(5)))
+        other = await flight.run("add", "add", (2, 2), call)
+        return results, other, flight.stats()
+
+    results, other, stats = asyncio.run(scenario())
+    assert results == [1] * 5
+    assert other == 2
+    assert (stats["leaders"], stats["coalesced"], stats["in_flight"]) == (2, 4, 0)
+    assert stats["coalesced_by_operation"] == {"add": 4}
+
+
+def test_errors_are_shared_and_not_kept():
+    async def scenario():
+        flight = SingleFlight(_by_args)
+
+        async def fail():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("engine failed")
+
+        results = await asyncio.gather(
+            *(flight.run("add", "add", (1, 2), fail) for _ in range(3)), return_exceptions=True
+        )
+        # Nothing is cached: the next call runs again
+        retried = await flight.run("add", "add", (1, 2), lambda: asyncio.sleep(0))
+        return results, retried, flight.stats()
+
+    results, retried, stats = asyncio.run(scenario())
+    assert all(isinstance(error, RuntimeError) for error in results)
+    assert retried is None
+    assert stats["leaders"] == 2
+
+
+def test_follower_cancellation_does_not_cancel_the_call():
+    async def scenario():
+        flight = SingleFlight(_by_args)
+        release = asyncio.Event()
+
+        async def call():
+            await release.wait()
+            return "done"
+
+        leader = asyncio.ensure_future(flight.run("add", "add", (), call))
+        follower = asyncio.ensure_future(flight.run("add", "add", (), call))
+        await asyncio.sleep(0)
+        follower.cancel()
+        release.set()
+        return await leader, follower
+
+    result, follower = asyncio.run(scenario())
+    assert result == "done"
+    assert follower.cancelled()
+
+
+def test_only_configured_operations_coalesce():
+    async def scenario():
+        flight = SingleFlight(_by_args, operations=["sum-array"])
+
+        async def call():
+            await asyncio.sleep(0.01)
+            return object()
+
+        first, second = await asyncio.gather(
+            flight.run("add", "add", (1,), call), flight.run("add", "add", (1,), call)
+        )
+        return first is second, flight.stats()
+
+    same, stats = asyncio.run(scenario())
+    assert not same
+    assert stats["leaders"] == 0
+
+
+def test_status_endpoint(client):
+    response = client.get("/api/v1/engine/singleflight/status")
+    assert response.status_code == 200
+    assert response.json()["enabled"] is True